@@ -0,0 +1,424 @@
+import copy
+from functools import lru_cache
+try:
+    from .board import Board, MatrixView
+    from .geometry import geometry, DIRECTIONS, OPPOSITE
+    from .moves import CaptureResult, NO_CAPTURE
+    from .zobrist import zobrist_keys
+except ImportError:
+    from board import Board, MatrixView
+    from geometry import geometry, DIRECTIONS, OPPOSITE
+    from moves import CaptureResult, NO_CAPTURE
+    from zobrist import zobrist_keys
+
+
+@lru_cache(maxsize=None)
+def board_masks(rows, columns):
+    """
+    returns masks used by bitboard move generation for board of given size
+
+    Parameters
+    ----------
+    rows : int
+        number of rows
+    columns : int
+        number of columns
+
+    Returns
+    -------
+    tuple (full, sources, shifts)
+        full - mask with every place of the board
+        sources - for every direction mask of places from which a stone can go in this direction
+        shifts - for every direction number of bits between place and its neighbour
+    """
+    lines = geometry(rows, columns)
+    sources = [0] * len(DIRECTIONS)
+    for r in range(rows):
+        for c in range(columns):
+            for d in lines.directions[r][c]:
+                sources[d] |= 1 << (r*columns + c)
+    shifts = tuple(dr*columns + dc for dr, dc in DIRECTIONS)
+    return (1 << rows*columns) - 1, tuple(sources), shifts
+
+
+@lru_cache(maxsize=None)
+def byte_keys(rows, columns):
+    """
+    returns zobrist keys of masks for board of given size, mask is hashed byte by byte
+
+    Parameters
+    ----------
+    rows : int
+        number of rows
+    columns : int
+        number of columns
+
+    Returns
+    -------
+    tuple
+        byte_keys[stone - 1][i][byte] - xor of keys of stones on places
+        given by bits of the i-th byte of mask
+    """
+    stones = zobrist_keys(rows, columns).stones
+    places = rows * columns
+    tables = []
+    for stone in (1, 2):
+        table = []
+        for i in range((places + 7) // 8):
+            keys = [0] * 256
+            for byte in range(1, 256):
+                low = byte & -byte
+                place = i*8 + low.bit_length() - 1
+                key = stones[place // columns][place % columns][stone] if place < places else 0
+                keys[byte] = keys[byte ^ low] ^ key
+            table.append(tuple(keys))
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+@lru_cache(maxsize=None)
+def move_tables(rows, columns):
+    """
+    returns tables used by bitboard to find moves and captured stones without walking the board
+
+    Parameters
+    ----------
+    rows : int
+        number of rows
+    columns : int
+        number of columns
+
+    Returns
+    -------
+    tuple (pairs, bit_moves, ray_bits)
+        pairs - for every pair of opposite directions (d, back, bits, source, back_source,
+        approach, back_approach), where neighbour in direction d is bits higher,
+        sources are masks from board_masks and approach masks are places
+        from which two steps in the direction stay on the board
+        bit_moves - for every bit tuple of (direction, move) pairs from that place
+        ray_bits - for every move (rays, approach bits, withdrawal bits)
+    """
+    lines = geometry(rows, columns)
+    full, sources, shifts = board_masks(rows, columns)
+    pairs = []
+    for d, bits in enumerate(shifts):
+        if bits > 0:
+            back = OPPOSITE[d]
+            source = sources[d]
+            back_source = sources[back]
+            pairs.append((d, back, bits, source, back_source,
+                          source & (source >> bits), back_source & (back_source << bits)))
+    bit_moves = tuple(lines.direction_moves[r][c] for r in range(rows) for c in range(columns))
+    ray_bits = {}
+    for move, rays in lines.rays.items():
+        ray_bits[move] = (rays,) + tuple(tuple(1 << (r*columns + c) for r, c in ray) for ray in rays)
+    return tuple(pairs), bit_moves, ray_bits
+
+
+class BitBoard(Board):
+    """
+    A class to represent a board stored as two bitboards. Child class of Board class.
+
+    Place (r, c) is bit r*columns + c. Moves and captures are generated with
+    shifts and ANDs of whole masks instead of walking matrix place by place.
+
+    ...
+
+    Attributes
+    ----------
+    white : int
+        mask of places with white stones
+    black : int
+        mask of places with black stones
+    matrix : MatrixView
+        view of the bitboards which behaves like a list of lists
+
+    Methods
+    -------
+    place(r, c):
+        returns 0, 1 or 2 for given place
+    set_place(r, c, value):
+        puts value on given place
+    stones(stone):
+        returns mask of player's stones
+    set_stones(white, black):
+        puts stones given by masks
+    """
+
+    def __init__(self, rows, columns):
+        """
+        Constructs all the necessary attributes for the bitboard object.
+
+        Parameters
+        ----------
+        rows : int
+            number of rows, it has to be odd number and smaller than 10
+        columns : int
+            number of columns, it has to be odd number and smaller than 10
+        """
+        self.white = 0
+        self.black = 0
+        self._full = board_masks(rows, columns)[0]
+        self._pairs, self._bit_moves, self._ray_bits = move_tables(rows, columns)
+        super().__init__(rows, columns)
+
+    @property
+    def matrix(self):
+        return self._view
+
+    @matrix.setter
+    def matrix(self, matrix):
+        white = 0
+        black = 0
+        bit = 1
+        for verse in matrix:
+            for value in verse:
+                if value == 1:
+                    white |= bit
+                elif value == 2:
+                    black |= bit
+                bit <<= 1
+        self.white = white
+        self.black = black
+        self._reset()
+
+    def place(self, r, c):
+        """
+        returns 0, 1 or 2 for given place
+        """
+        bit = 1 << (r*self.columns + c)
+        if self.white & bit:
+            return 1
+        if self.black & bit:
+            return 2
+        return 0
+
+    def set_place(self, r, c, value):
+        """
+        puts value (0, 1 or 2) on given place
+        """
+        bit = 1 << (r*self.columns + c)
+        old = 1 if self.white & bit else 2 if self.black & bit else 0
+        if old == 1:
+            self.white ^= bit
+        elif old == 2:
+            self.black ^= bit
+        if value == 1:
+            self.white |= bit
+        elif value == 2:
+            self.black |= bit
+        self._changed(r, c, old, value)
+
+    def places(self):
+        """
+        returns matrix as list of lists made from masks
+
+        Returns
+        -------
+        list of lists
+        """
+        white, black, columns = self.white, self.black, self.columns
+        return [[1 if white >> bit & 1 else 2 if black >> bit & 1 else 0
+                 for bit in range(r*columns, (r + 1)*columns)] for r in range(self.rows)]
+
+    def stones(self, stone):
+        """
+        returns mask of player's stones
+        """
+        return self.white if stone == 1 else self.black
+
+    def set_stones(self, white, black):
+        """
+        puts stones given by masks on board, like setting matrix
+
+        Parameters
+        ----------
+        white : int
+            mask of places with white stones
+        black : int
+            mask of places with black stones
+
+        Returns
+        -------
+        None
+        """
+        self.white = white
+        self.black = black
+        self._reset()
+
+    def _computed(self):
+        """
+        returns hash and counts computed from masks byte by byte
+        """
+        white_keys, black_keys = byte_keys(self.rows, self.columns)
+        key = 0
+        white = self.white
+        for keys in white_keys:
+            key ^= keys[white & 0xFF]
+            white >>= 8
+        black = self.black
+        for keys in black_keys:
+            key ^= keys[black & 0xFF]
+            black >>= 8
+        white = bin(self.white).count('1')
+        black = bin(self.black).count('1')
+        if self.stone_turn == 2:
+            key ^= self.keys.black_turn
+        key ^= self.keys.chain(self.last_position, self.forbidden_moves)
+        return key, [self.rows*self.columns - white - black, white, black]
+
+    def copy(self):
+        """
+        returns copy of the board which can be changed without changing this board
+
+        Returns
+        -------
+        BitBoard
+        """
+        board = copy.copy(self)
+        board._renderer = None
+        board._view = MatrixView(board)
+        board._cache = {}
+        board.counts = list(self.counts)
+        return board
+
+    def is_winner(self):
+        """
+        returns winner's stone
+
+        Returns
+        -------
+        1 - if there are no black stone on board
+        2 - if there are no white stone
+        None - if there are black and white stones on board
+        """
+        if self.debug:
+            self.check()
+        if not self.white:
+            return 2
+        if not self.black:
+            return 1
+        return None
+
+    def _movable(self, stone):
+        """
+        returns for every direction mask of player's stones which can move in this direction
+        """
+        empty = self._full & ~(self.white | self.black)
+        own = self.white if stone == 1 else self.black
+        movable = [0] * len(DIRECTIONS)
+        for d, back, bits, source, back_source, approach, back_approach in self._pairs:
+            movable[d] = own & source & (empty >> bits)
+            movable[back] = own & back_source & (empty << bits)
+        return movable
+
+    def _moves_from_masks(self, masks):
+        """
+        returns list of moves in the order of Board.possible_moves for masks of movable stones
+        """
+        moves = []
+        bit_moves = self._bit_moves
+        union = 0
+        for mask in masks:
+            union |= mask
+        while union:
+            low = union & -union
+            for d, move in bit_moves[low.bit_length() - 1]:
+                if masks[d] & low:
+                    moves.append(move)
+            union ^= low
+        return moves
+
+    def _possible_moves(self, stone):
+        """
+        returns a list of (capturing and noncapturing) moves(places
+        from and where the stone will move) for every player's stone
+
+        Parameters
+        ----------
+        stone : (1 or 2)
+            player's stone
+
+        Returns
+        -------
+        list of moves
+        """
+        return self._moves_from_masks(self._movable(stone))
+
+    def _capturing_moves(self, stone, opponent_stone):
+        """
+        returns a list of capturing moves for every player's stone
+
+        Parameters
+        ----------
+        stone : (1 or 2)
+            player's stone
+        opponent_stone : (1 or 2)
+            opponent's stone
+
+        Returns
+        -------
+        list of capturing moves
+        """
+        opponent = self.white if opponent_stone == 1 else self.black
+        movable = self._movable(stone)
+        for d, back, bits, source, back_source, approach, back_approach in self._pairs:
+            movable[d] &= (opponent >> 2*bits & approach) | (opponent << bits & back_source)
+            movable[back] &= (opponent << 2*bits & back_approach) | (opponent >> bits & source)
+        return self._moves_from_masks(movable)
+
+    def _captured_stones(self, opponent_stone, move):
+        """
+        returns two list with places of approach
+        captured stones and withdrawal captured stones
+
+        Parameters
+        ----------
+        opponent_stone : (1 or 2)
+            opponent's stone
+        move : (r1, c1, r2, c2)
+            tuple with place from and where stone will go
+
+        Returns
+        -------
+        CaptureResult
+        """
+        ray_bits = self._ray_bits.get(move)
+        if ray_bits is None:
+            return NO_CAPTURE
+        rays, approach_bits, withdrawal_bits = ray_bits
+        opponent = self.white if opponent_stone == 1 else self.black
+        approach = 0
+        for bit in approach_bits:
+            if not opponent & bit:
+                break
+            approach += 1
+        withdrawal = 0
+        for bit in withdrawal_bits:
+            if not opponent & bit:
+                break
+            withdrawal += 1
+        return CaptureResult(rays, approach, withdrawal)
+
+    def empty_places(self, r, c):
+        """
+        returns list of empty places around place from argument
+
+        Parameters
+        ----------
+        r : int
+            board's row
+        c : int
+            board's column
+
+        Returns
+        -------
+        list of empty places around place from argument
+        """
+        occupied = self.white | self.black
+        arr = []
+        for x in range(max(r-1, 0), min(r+2, self.rows)):
+            for y in range(max(c-1, 0), min(c+2, self.columns)):
+                if not occupied & (1 << (x*self.columns + y)) and not (x == r and y == c):
+                    arr.append((x, y))
+        return arr
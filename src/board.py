@@ -1,21 +1,104 @@
+import copy
 import numpy as np
-import pygame
 from config import (
     SQUARESIZE,
     width,
     height,
-    BROWN,
-    BLACK,
-    RED,
-    WHITE,
-    DARK_BROWN,
-    YELLOW,
 )
+try:
+    from .geometry import geometry
+    from .zobrist import zobrist_keys
+    from .renderer import Renderer
+    from . import vectorized as vectorized_moves
+    from .moves import CaptureResult, NO_CAPTURE, Chain
+except ImportError:
+    from geometry import geometry
+    from zobrist import zobrist_keys
+    from renderer import Renderer
+    import vectorized as vectorized_moves
+    from moves import CaptureResult, NO_CAPTURE, Chain
 
 
 screen = None
 
 
+class RowView():
+    """
+    A class to represent one row of board's matrix. It reads places with place
+    and writes them with set_place, so hash, counts and cached moves follow every write.
+    """
+
+    def __init__(self, board, r):
+        self._board = board
+        self._r = r
+
+    def __len__(self):
+        return self._board.columns
+
+    def __getitem__(self, c):
+        if isinstance(c, slice):
+            return list(self)[c]
+        if c < 0:
+            c += self._board.columns
+        return self._board.place(self._r, c)
+
+    def __setitem__(self, c, value):
+        self._board.set_place(self._r, c, value)
+
+    def __iter__(self):
+        return (self._board.place(self._r, c) for c in range(self._board.columns))
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class MatrixView():
+    """
+    A class to represent board's matrix, it behaves like a list of rows.
+    """
+
+    def __init__(self, board):
+        self._board = board
+
+    def __len__(self):
+        return self._board.rows
+
+    def __getitem__(self, r):
+        if r < 0:
+            r += self._board.rows
+        if not 0 <= r < self._board.rows:
+            raise IndexError(r)
+        return RowView(self._board, r)
+
+    def __iter__(self):
+        return (RowView(self._board, r) for r in range(self._board.rows))
+
+    def __contains__(self, row):
+        rows = [list(verse) for verse in self]
+        row = list(row)
+        if row and not isinstance(row[0], int):
+            return rows == [list(verse) for verse in row]
+        return row in rows
+
+    def __eq__(self, other):
+        try:
+            return [list(verse) for verse in self] == [list(verse) for verse in other]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr([list(verse) for verse in self])
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self._board.places(), dtype=dtype or np.int8)
+
+
 class Board:
     """
     A class to represent a board.
@@ -31,8 +114,35 @@ class Board:
         coordinate x of board at screen
     board_position_y : int
         coordinate y of board at screen
-    matrix : list
-        a list of lists represents places on board
+    matrix : MatrixView
+        places on board, it behaves like a list of lists and every write
+        goes through set_place
+    geometry : Geometry
+        neighbours and capture rays of every place, shared by boards of the same size
+    stone_turn : 1 or 2
+        stone of player who moves now
+    last_position : (r, c) or None
+        place of stone which is capturing in capture chain
+    forbidden_moves : tuple
+        places where capturing stone cannot go
+    chain : Chain
+        state of capture chain with O(1) check of forbidden places
+    hash : int
+        zobrist hash of stones, stone_turn and capture chain, updated on every change
+    counts : list
+        numbers of empty places, white stones and black stones, updated on every change
+    version : int
+        number increased on every change of stones, cached moves are valid only for one version
+    caching : bool
+        if True possible moves, capturing moves and captured stones are remembered
+        till stones change
+    cache_hits, cache_misses : int
+        numbers of answers taken from cache and computed
+    vectorized : bool
+        if True capturing moves are found with numpy for all directions at once,
+        it can be changed for class or for one board
+    debug : bool
+        if True counts and hash are checked against matrix after every change
     Methods
     -------
     __init__(rows, columns):
@@ -41,6 +151,18 @@ class Board:
     is_winner():
         return winning stone if exists or None
 
+    count(stone):
+        returns number of player's stones
+
+    check():
+        raises AssertionError if counts or hash do not match matrix
+
+    cache_stats():
+        returns hits, misses and hit rate of cache of moves
+
+    renderer():
+        returns renderer which draws board on screen
+
     draw_board():
         draws board with stones on screen
 
@@ -56,6 +178,33 @@ class Board:
     diagonal_moves():
         returns places from which diagonal moves are possible
 
+    copy():
+        returns copy of the board
+
+    place(r, c):
+        returns 0, 1 or 2 for given place
+
+    set_place(r, c, value):
+        puts value on given place
+
+    move_stone(move):
+        moves stone from one place to another
+
+    remove_stones(stones):
+        removes stones from board
+
+    set_chain(last_position, forbidden_moves):
+        saves state of capture chain
+
+    end_turn():
+        ends capture chain and changes stone_turn
+
+    make_move(move, capture):
+        makes move with chosen capture and returns record to undo it
+
+    unmake_move(record):
+        undoes move made by make_move
+
     possible_moves(stone):
         returns a list of (capturing and noncapturing) moves(places from and where the stone will move)
         for every player's stone
@@ -73,6 +222,10 @@ class Board:
         draws yellow rims of stones that can move
     """
 
+    vectorized = False
+    debug = False
+    caching = True
+
     def __init__(self, rows, columns):
         """
         Constructs all the necessary attributes for the board object.
@@ -90,6 +243,19 @@ class Board:
         self.columns = columns
         self.board_position_x = (width - self.columns*SQUARESIZE)//2
         self.board_position_y = (height - self.rows*SQUARESIZE)//2
+        self.geometry = geometry(rows, columns)
+        self.keys = zobrist_keys(rows, columns)
+        self.stone_turn = 1
+        self.last_position = None
+        self.forbidden_moves = ()
+        self.chain = Chain(columns)
+        self._renderer = None
+        self._view = MatrixView(self)
+        self.version = 0
+        self._cache = {}
+        self._cache_version = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
         board = np.zeros((rows, columns), dtype=np.int8)
         for r in range(rows):
             if r < rows/2 - 1:
@@ -108,6 +274,235 @@ class Board:
                         board[r][c] = 0
         self.matrix = board
 
+    @property
+    def matrix(self):
+        return self._view
+
+    @matrix.setter
+    def matrix(self, matrix):
+        if isinstance(matrix, np.ndarray):
+            matrix = matrix.tolist()
+        else:
+            matrix = [list(verse) for verse in matrix]
+        self._matrix = matrix
+        self._reset()
+
+    def _reset(self):
+        """
+        computes hash and counts of the whole position, it is called when matrix is replaced
+        """
+        self.hash, self.counts = self._computed()
+        self.version += 1
+
+    def _computed(self):
+        """
+        returns hash and counts computed from matrix
+        """
+        stones = self.keys.stones
+        key = 0
+        counts = [0, 0, 0]
+        for r, verse in enumerate(self.places()):
+            for c, value in enumerate(verse):
+                key ^= stones[r][c][value]
+                counts[value] += 1
+        if self.stone_turn == 2:
+            key ^= self.keys.black_turn
+        return key ^ self.keys.chain(self.last_position, self.forbidden_moves), counts
+
+    def _changed(self, r, c, old, value):
+        """
+        updates hash and counts after value on place (r, c) was changed
+        """
+        stones = self.keys.stones[r][c]
+        self.hash ^= stones[old] ^ stones[value]
+        counts = self.counts
+        counts[old] -= 1
+        counts[value] += 1
+        self.version += 1
+        if self.debug:
+            self.check()
+
+    def check(self):
+        """
+        raises AssertionError if counts or hash updated on changes
+        do not match values computed from matrix
+
+        Returns
+        -------
+        None
+        """
+        key, counts = self._computed()
+        if counts != self.counts:
+            raise AssertionError(f'counts {self.counts} do not match matrix {counts}')
+        if key != self.hash:
+            raise AssertionError('hash does not match matrix')
+
+    def _cached(self, key):
+        """
+        returns cached value or None, cache is cleared when version changed
+        """
+        if self._cache_version != self.version:
+            self._cache.clear()
+            self._cache_version = self.version
+            return None
+        value = self._cache.get(key)
+        if value is not None:
+            self.cache_hits += 1
+        return value
+
+    def _remember(self, key, value):
+        """
+        saves value in cache and returns it
+        """
+        self.cache_misses += 1
+        self._cache[key] = value
+        return value
+
+    def cache_stats(self):
+        """
+        returns statistics of cache of moves
+
+        Returns
+        -------
+        dict with hits, misses and hit rate
+        """
+        total = self.cache_hits + self.cache_misses
+        return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / total if total else 0.0}
+
+    def count(self, stone):
+        """
+        returns number of player's stones, 0 returns number of empty places
+        """
+        return self.counts[stone]
+
+    def place(self, r, c):
+        """
+        returns 0, 1 or 2 for given place
+        """
+        return self._matrix[r][c]
+
+    def set_place(self, r, c, value):
+        """
+        puts value (0, 1 or 2) on given place
+        """
+        old = self._matrix[r][c]
+        self._matrix[r][c] = value
+        self._changed(r, c, old, value)
+
+    def move_stone(self, move):
+        """
+        moves stone from place (r1, c1) to place (r2, c2)
+
+        Parameters
+        ----------
+        move : (r1, c1, r2, c2)
+
+        Returns
+        -------
+        None
+        """
+        r1, c1, r2, c2 = move
+        stone = self.place(r1, c1)
+        self.set_place(r1, c1, 0)
+        self.set_place(r2, c2, stone)
+
+    def remove_stones(self, stones):
+        """
+        removes stones from given places
+
+        Parameters
+        ----------
+        stones : list
+            places of stones
+
+        Returns
+        -------
+        None
+        """
+        for r, c in stones:
+            self.set_place(r, c, 0)
+
+    def set_chain(self, last_position, forbidden_moves):
+        """
+        saves state of capture chain
+
+        Parameters
+        ----------
+        last_position : (r, c)
+            place of stone which is capturing
+        forbidden_moves : Chain or list
+            places where the stone cannot go, in list the last place
+            is the next place in direction of the last step
+
+        Returns
+        -------
+        None
+        """
+        if not isinstance(forbidden_moves, Chain):
+            forbidden_moves = Chain.from_places(self.columns, last_position, forbidden_moves)
+        self.hash ^= self.keys.chain(self.last_position, self.forbidden_moves)
+        self.last_position = last_position
+        self.chain = forbidden_moves
+        self.forbidden_moves = tuple(forbidden_moves)
+        self.hash ^= self.keys.chain(self.last_position, self.forbidden_moves)
+
+    def end_turn(self):
+        """
+        ends capture chain and gives turn to the opponent
+
+        Returns
+        -------
+        None
+        """
+        self.set_chain(None, Chain(self.columns))
+        self.stone_turn = 1 if self.stone_turn == 2 else 2
+        self.hash ^= self.keys.black_turn
+
+    def make_move(self, move, capture=None):
+        """
+        moves stone and removes stones captured by approach (capture = 0)
+        or by withdrawal (capture = 1), nothing is captured if capture is None
+
+        Parameters
+        ----------
+        move : (r1, c1, r2, c2)
+        capture : 0, 1 or None
+
+        Returns
+        -------
+        record : (move, captured_stones)
+            everything unmake_move needs to restore the board
+        """
+        captured_stones = ()
+        if capture is not None:
+            opponent_stone = 1 if self.place(move[0], move[1]) == 2 else 2
+            captured_stones = self.captured_stones(opponent_stone, move).stones(capture)
+        self.move_stone(move)
+        self.remove_stones(captured_stones)
+        return (move, captured_stones)
+
+    def unmake_move(self, record):
+        """
+        restores board from before make_move
+
+        Parameters
+        ----------
+        record : (move, captured_stones)
+            value returned by make_move
+
+        Returns
+        -------
+        None
+        """
+        (r1, c1, r2, c2), captured_stones = record
+        stone = self.place(r2, c2)
+        opponent_stone = 1 if stone == 2 else 2
+        for r, c in captured_stones:
+            self.set_place(r, c, opponent_stone)
+        self.set_place(r2, c2, 0)
+        self.set_place(r1, c1, stone)
+
     def is_winner(self):
         """
         returns winner's stone
@@ -118,56 +513,40 @@ class Board:
         2 - if there are no white stone
         None - if there are black and white stones on board
         """
-
-        white = 0
-        black = 0
-        for verse in self.matrix:
-            if 2 in verse:
-                black += 1
-            if 1 in verse:
-                white += 1
-        if white == 0:
+        if self.debug:
+            self.check()
+        if self.counts[1] == 0:
             return 2
-        if black == 0:
+        if self.counts[2] == 0:
             return 1
         return None
 
+    def renderer(self):
+        """
+        returns renderer drawing this board on screen, it is created again
+        when screen was changed
+
+        Returns
+        -------
+        Renderer
+        """
+        if self._renderer is None or self._renderer.surface is not screen:
+            self._renderer = Renderer(self, screen)
+        return self._renderer
+
     def draw_board(self):
         """
-        draws current state of board
+        draws current state of board, only places which changed since
+        last drawing are drawn and updated on screen
 
         Returns
         -------
         None
         """
-        rows = self.rows
-        columns = self.columns
-        pygame.draw.rect(screen, BROWN, (self.board_position_x,
-                                         self.board_position_y, columns*SQUARESIZE, rows*SQUARESIZE))
-        for r in range(rows):
-            for c in range(columns):
-                circle_pos_x = self.board_position_x + (c+0.5)*SQUARESIZE
-                circle_pos_y = self.board_position_y + (r+0.5)*SQUARESIZE
-                if c % 2 == 0 and r % 2 == 0 and r < rows-1:
-                    if c > 0:
-                        pygame.draw.line(screen, DARK_BROWN, (circle_pos_x, circle_pos_y), (
-                            circle_pos_x - 2*SQUARESIZE, circle_pos_y+2*SQUARESIZE), 5)
-                    if c < columns-1:
-                        pygame.draw.line(screen, DARK_BROWN, (circle_pos_x, circle_pos_y), (
-                            circle_pos_x + 2*SQUARESIZE, circle_pos_y+2*SQUARESIZE), 5)
-                if c == 0:
-                    pygame.draw.line(screen, DARK_BROWN, (circle_pos_x, circle_pos_y),
-                                     (circle_pos_x + (columns-1)*SQUARESIZE, circle_pos_y), 5)
-                if r == 0:
-                    pygame.draw.line(screen, DARK_BROWN, (circle_pos_x, circle_pos_y),
-                                     (circle_pos_x, circle_pos_y + (rows-1)*SQUARESIZE), 5)
-                if self.matrix[r][c] == 2:
-                    pygame.draw.circle(
-                        screen, BLACK, (circle_pos_x, circle_pos_y), SQUARESIZE/3)
-                elif self.matrix[r][c] == 1:
-                    pygame.draw.circle(
-                        screen, WHITE, (circle_pos_x, circle_pos_y), SQUARESIZE/3)
-        pygame.display.update()
+        renderer = self.renderer()
+        renderer.set_highlights()
+        renderer.draw()
+        renderer.flush()
 
     def chosen_position(self, posx, posy):
         """
@@ -206,18 +585,14 @@ class Board:
         -------
         None
         """
-        for captured_stone in captured_stones:
-            r = captured_stone[0]
-            c = captured_stone[1]
-            circle_pos_x = self.board_position_x + (c+0.5)*SQUARESIZE
-            circle_pos_y = self.board_position_y + (r+0.5)*SQUARESIZE
-            pygame.draw.circle(
-                screen, RED, (circle_pos_x, circle_pos_y), SQUARESIZE/3)
-            pygame.display.update()
+        renderer = self.renderer()
+        renderer.set_highlights(renderer.chosen, renderer.captured | set(captured_stones))
+        renderer.draw()
+        renderer.flush()
 
     def light_up_chosen_stone(self, stones):
         """
-        draws yellow rims of stones from list stones
+        draws current state of board with yellow rims of stones from list stones
 
         Parameters
         ----------
@@ -227,15 +602,10 @@ class Board:
         -------
         None
         """
-        self.draw_board()
-        for stone in stones:
-            r = stone[0]
-            c = stone[1]
-            circle_pos_x = self.board_position_x + (c+0.5)*SQUARESIZE
-            circle_pos_y = self.board_position_y + (r+0.5)*SQUARESIZE
-            pygame.draw.circle(
-                screen, YELLOW, (circle_pos_x, circle_pos_y), SQUARESIZE*5/13, SQUARESIZE//12)
-        pygame.display.update()
+        renderer = self.renderer()
+        renderer.set_highlights(stones)
+        renderer.draw()
+        renderer.flush()
 
     def diagonal_moves(self):
         """
@@ -245,17 +615,41 @@ class Board:
         -------
         list of places
         """
-        list_of_diagonal_moves = []
-        for c in range(self.columns):
-            for r in range(self.rows):
-                if (r % 2 == 0 and c % 2 == 0) or (r % 2 == 1 and c % 2 == 1):
-                    list_of_diagonal_moves.append((r, c))
-        return list_of_diagonal_moves
+        return list(self.geometry.diagonal_moves)
+
+    def places(self):
+        """
+        returns matrix as list of lists, matrix is converted to lists once
+        when it is set, because reading python lists place by place is much faster.
+        The list must not be changed, places are changed with set_place
+
+        Returns
+        -------
+        list of lists
+        """
+        return self._matrix
+
+    def copy(self):
+        """
+        returns copy of the board which can be changed without changing this board,
+        matrix of the copy is a list of lists
+
+        Returns
+        -------
+        Board
+        """
+        board = copy.copy(self)
+        board._renderer = None
+        board._view = MatrixView(board)
+        board._cache = {}
+        board.matrix = self._matrix
+        return board
 
     def possible_moves(self, stone):
         """
         returns a list of (capturing and noncapturing) moves(places
-        from and where the stone will move) for every player's stone
+        from and where the stone will move) for every player's stone,
+        list is cached and must not be changed
 
         Parameters
         ----------
@@ -266,41 +660,34 @@ class Board:
         -------
         list of moves
         """
+        if not self.caching:
+            return self._possible_moves(stone)
+        key = ('moves', stone)
+        moves = self._cached(key)
+        if moves is None:
+            moves = self._remember(key, self._possible_moves(stone))
+        return moves
+
+    def _possible_moves(self, stone):
+        """
+        computes possible_moves
+        """
         possible_moves = []
-        diagonal_moves = self.diagonal_moves()
+        matrix = self.places()
+        moves = self.geometry.moves
         for r in range(self.rows):
+            verse = matrix[r]
             for c in range(self.columns):
-                if self.matrix[r][c] == stone:
-                    if c > 0:
-                        if self.matrix[r][c-1] == 0:
-                            possible_moves.append((r, c, r, c-1))
-                    if c < self.columns-1:
-                        if self.matrix[r][c+1] == 0:
-                            possible_moves.append((r, c, r, c+1))
-                    if r > 0:
-                        if self.matrix[r-1][c] == 0:
-                            possible_moves.append((r, c, r-1, c))
-                    if r < self.rows-1:
-                        if self.matrix[r+1][c] == 0:
-                            possible_moves.append((r, c, r+1, c))
-                    if (r, c) in diagonal_moves:
-                        if r > 0 and c > 0:
-                            if self.matrix[r-1][c-1] == 0:
-                                possible_moves.append((r, c, r-1, c-1))
-                        if r < self.rows-1 and c > 0:
-                            if self.matrix[r+1][c-1] == 0:
-                                possible_moves.append((r, c, r+1, c-1))
-                        if r < self.rows-1 and c < self.columns-1:
-                            if self.matrix[r+1][c+1] == 0:
-                                possible_moves.append((r, c, r+1, c+1))
-                        if r > 0 and c < self.columns-1:
-                            if self.matrix[r-1][c+1] == 0:
-                                possible_moves.append((r, c, r-1, c+1))
+                if verse[c] == stone:
+                    for move in moves[r][c]:
+                        if matrix[move[2]][move[3]] == 0:
+                            possible_moves.append(move)
         return possible_moves
 
     def capturing_moves(self, stone, opponent_stone):
         """
-        returns a list of capturing moves for every player's stone
+        returns a list of capturing moves for every player's stone,
+        list is cached and must not be changed
 
         Parameters
         ----------
@@ -313,11 +700,28 @@ class Board:
         -------
         list of capturing moves
         """
+        if not self.caching:
+            return self._capturing_moves(stone, opponent_stone)
+        key = ('captures', stone, opponent_stone)
+        moves = self._cached(key)
+        if moves is None:
+            moves = self._remember(key, self._capturing_moves(stone, opponent_stone))
+        return moves
+
+    def _capturing_moves(self, stone, opponent_stone):
+        """
+        computes capturing_moves
+        """
+        if self.vectorized:
+            return vectorized_moves.capturing_moves(self._matrix, stone, opponent_stone)
         capturing_moves = []
+        matrix = self.places()
+        rays = self.geometry.rays
         for move in self.possible_moves(stone):
-            captured_stones = self.captured_stones(opponent_stone, move)
-            if len(captured_stones[0]) > 0 or len(captured_stones[1]) > 0:
-                capturing_moves.append(move)
+            for ray in rays[move]:
+                if ray and matrix[ray[0][0]][ray[0][1]] == opponent_stone:
+                    capturing_moves.append(move)
+                    break
         return capturing_moves
 
     def captured_stones(self, opponent_stone, move):
@@ -334,34 +738,39 @@ class Board:
 
         Returns
         -------
-        tuple with two lists, first with approach
-        captured stones and second with withdrawal captured stones
+        CaptureResult
+            it behaves like tuple with two lists, first with approach
+            captured stones and second with withdrawal captured stones
         """
-        r1, c1, r2, c2 = move
-        r_direction = r1 - r2
-        c_direction = c1 - c2
-        approach_capture = []
-        withdrawal_capture = []
-        if (r1, c1) not in self.diagonal_moves():
-            if r_direction != 0 and c_direction != 0:
-                return ([], [])
-        while r2 >= 0 and r2 <= self.rows-1 and c2 >= 0 and c2 <= self.columns-1:
-            r2 -= r_direction
-            c2 -= c_direction
-            if r2 >= 0 and r2 <= self.rows-1 and c2 >= 0 and c2 <= self.columns-1:
-                if self.matrix[r2][c2] == opponent_stone:
-                    approach_capture.append((r2, c2))
-                else:
-                    break
-        while r1 >= 0 and r1 <= self.rows-1 and c1 >= 0 and c1 <= self.columns-1:
-            r1 += r_direction
-            c1 += c_direction
-            if r1 >= 0 and r1 <= self.rows-1 and c1 >= 0 and c1 <= self.columns-1:
-                if self.matrix[r1][c1] == opponent_stone:
-                    withdrawal_capture.append((r1, c1))
-                else:
-                    break
-        return (approach_capture, withdrawal_capture)
+        if not isinstance(move, tuple):
+            move = tuple(move)
+        if not self.caching:
+            return self._captured_stones(opponent_stone, move)
+        key = (opponent_stone, move)
+        captured = self._cached(key)
+        if captured is None:
+            captured = self._remember(key, self._captured_stones(opponent_stone, move))
+        return captured
+
+    def _captured_stones(self, opponent_stone, move):
+        """
+        computes captured_stones
+        """
+        rays = self.geometry.rays.get(move)
+        if rays is None:
+            return NO_CAPTURE
+        matrix = self.places()
+        approach = 0
+        for r, c in rays[0]:
+            if matrix[r][c] != opponent_stone:
+                break
+            approach += 1
+        withdrawal = 0
+        for r, c in rays[1]:
+            if matrix[r][c] != opponent_stone:
+                break
+            withdrawal += 1
+        return CaptureResult(rays, approach, withdrawal)
 
     def empty_places(self, r, c):
         """
@@ -378,13 +787,8 @@ class Board:
         -------
         list of empty places around place from argument
         """
-        arr = []
-        for x in range(r-1, r+2):
-            for y in range(c-1, c+2):
-                if x >= 0 and x < self.rows and y >= 0 and y < self.columns:
-                    if self.matrix[x][y] == 0 and not(x == r and y == c):
-                        arr.append((x, y))
-        return arr
+        matrix = self.places()
+        return [(x, y) for x, y in self.geometry.around[r][c] if matrix[x][y] == 0]
 
     def light_up_possible_stones(self, stone, opponent_stone):
         """
@@ -0,0 +1,351 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from functools import lru_cache
+from random import Random
+try:
+    from .board import Board
+    from .engine import opponent_of, turn_steps, play_turn, undo_turn
+    from .geometry import DIRECTIONS
+    from .search import AlphaBeta, WIN
+    from .config import DATA_DIR
+except ImportError:
+    from board import Board
+    from engine import opponent_of, turn_steps, play_turn, undo_turn
+    from geometry import DIRECTIONS
+    from search import AlphaBeta, WIN
+    from config import DATA_DIR
+
+
+MAGIC = b'FOB1'
+HEADER = struct.Struct('<4sBBHI')
+ENTRY = struct.Struct('<QHBBI')
+STEP = struct.Struct('<BB')
+MAX_WEIGHT = 0xFFFF
+BOOK_DIR = os.path.join(DATA_DIR, 'books')
+
+
+def encode_turn(steps, columns):
+    """
+    returns bytes of turn, every step is place from which stone goes
+    and direction with capture
+
+    Parameters
+    ----------
+    steps : tuple of (move, capture)
+    columns : int
+
+    Returns
+    -------
+    bytes
+    """
+    data = bytearray()
+    for (r1, c1, r2, c2), capture in steps:
+        direction = DIRECTIONS.index((r2 - r1, c2 - c1))
+        data += STEP.pack(r1*columns + c1, direction*3 + (2 if capture is None else capture))
+    return bytes(data)
+
+
+def decode_turn(data, columns):
+    """
+    returns turn from bytes made by encode_turn
+
+    Parameters
+    ----------
+    data : bytes
+    columns : int
+
+    Returns
+    -------
+    tuple of (move, capture)
+    """
+    steps = []
+    for place, code in STEP.iter_unpack(data):
+        r1, c1 = divmod(place, columns)
+        dr, dc = DIRECTIONS[code // 3]
+        capture = code % 3
+        steps.append(((r1, c1, r1 + dr, c1 + dc), None if capture == 2 else capture))
+    return tuple(steps)
+
+
+def analyse(board, stone, search, width=3, margin=100):
+    """
+    returns the best turns of the player with weights, every turn is searched
+    with full window, so its value is exact
+
+    Parameters
+    ----------
+    board : Board
+        it is changed during search and restored at the end
+    stone : 1 or 2
+    search : AlphaBeta
+        its depth is number of turns searched
+    width : int
+        maximal number of turns
+    margin : int
+        turns worse than the best turn by more than margin are left out
+
+    Returns
+    -------
+    list of (steps, weight), the best turn first
+    """
+    values = []
+    search.nodes = 0
+    for steps in turn_steps(board, stone):
+        records = play_turn(board, steps)
+        try:
+            value = -search.negamax(board, opponent_of(stone), search.depth - 1, -WIN - 1, WIN + 1, 1)
+        finally:
+            undo_turn(board, records)
+        values.append((value, steps))
+    if not values:
+        return []
+    values.sort(key=lambda item: item[0], reverse=True)
+    best = values[0][0]
+    return [(steps, max(1, min(MAX_WEIGHT, margin + 1 - (best - value))))
+            for value, steps in values[:width] if best - value <= margin]
+
+
+def build(rows, columns, turns=8, depth=4, width=3, margin=100, progress=None):
+    """
+    analyses positions reached from the start position by the best turns of both players
+
+    Parameters
+    ----------
+    rows : int
+    columns : int
+    turns : int
+        number of turns covered by book
+    depth : int
+        number of turns searched in every position
+    width : int
+        maximal number of turns kept in every position
+    margin : int
+        turns worse than the best turn by more than margin are not kept
+    progress : callable or None
+        called with number of analysed positions
+
+    Returns
+    -------
+    dict
+        book[hash] - list of (steps, weight)
+    """
+    search = AlphaBeta(depth)
+    book = {}
+    layer = [Board(rows, columns).copy()]
+    for _ in range(turns):
+        next_layer = []
+        for board in layer:
+            if board.hash in book or board.is_winner() is not None:
+                continue
+            book[board.hash] = analyse(board, board.stone_turn, search, width, margin)
+            if progress is not None:
+                progress(len(book))
+            for steps, _ in book[board.hash]:
+                child = board.copy()
+                play_turn(child, steps)
+                next_layer.append(child)
+        layer = next_layer
+    return book
+
+
+def write(path, rows, columns, book):
+    """
+    writes book to binary file: header, entries sorted by hash and turns,
+    directory of file is made if it does not exist
+
+    Parameters
+    ----------
+    path : str
+    rows : int
+    columns : int
+    book : dict
+        book[hash] - list of (steps, weight)
+
+    Returns
+    -------
+    None
+    """
+    entries = bytearray()
+    data = bytearray()
+    count = 0
+    for key in sorted(book):
+        for steps, weight in book[key]:
+            encoded = encode_turn(steps, columns)
+            entries += ENTRY.pack(key, weight, len(steps), 0, len(data) // STEP.size)
+            data += encoded
+            count += 1
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, rows, columns, 0, count))
+        file.write(entries)
+        file.write(data)
+
+
+class OpeningBook():
+    """
+    A class to read opening book file. File is memory mapped and entries
+    are found with binary search, so nothing is loaded when it is opened.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+    rows : int
+    columns : int
+    size : int
+        number of entries
+    rng : Random
+
+    Methods
+    -------
+    turns(board):
+        returns turns of position with weights
+    best_turn(board, stone):
+        returns turn drawn with its weight
+    close():
+        closes file
+    """
+
+    def __init__(self, path, seed=None):
+        """
+        Opens book file.
+
+        Parameters
+        ----------
+        path : str
+        seed : int or None
+            seed of drawing turns
+        """
+        self.path = path
+        self.rng = Random(seed)
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rows, self.columns, _, self.size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not an opening book file')
+        self._data = HEADER.size + ENTRY.size * self.size
+
+    def _key(self, entry):
+        """
+        returns hash of entry with given number
+        """
+        return struct.unpack_from('<Q', self._map, HEADER.size + ENTRY.size * entry)[0]
+
+    def turns(self, board):
+        """
+        returns turns of position saved in book
+
+        Parameters
+        ----------
+        board : Board
+
+        Returns
+        -------
+        list of (steps, weight), empty if position is not in book
+        """
+        if (board.rows, board.columns) != (self.rows, self.columns) or board.last_position is not None:
+            return []
+        key = board.hash
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self.size:
+            entry_key, weight, length, _, offset = ENTRY.unpack_from(self._map, HEADER.size + ENTRY.size * low)
+            if entry_key != key:
+                break
+            start = self._data + offset * STEP.size
+            found.append((decode_turn(self._map[start:start + length * STEP.size], self.columns), weight))
+            low += 1
+        return found
+
+    def best_turn(self, board, stone):
+        """
+        returns turn from book drawn with its weight
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+
+        Returns
+        -------
+        tuple of steps (move, capture) or None if position is not in book
+        """
+        if board.stone_turn != stone:
+            return None
+        found = self.turns(board)
+        if not found:
+            return None
+        return self.rng.choices([steps for steps, _ in found], [weight for _, weight in found])[0]
+
+    def close(self):
+        """
+        closes memory map and file
+        """
+        self._map.close()
+        self._file.close()
+
+
+def path_of(rows, columns, directory=BOOK_DIR):
+    """
+    returns path of opening book file of board size
+    """
+    return os.path.join(directory, f'fanorona_{rows}x{columns}.book')
+
+
+@lru_cache(maxsize=None)
+def load(rows, columns, directory=BOOK_DIR):
+    """
+    returns opened opening book of board size, the same object for every caller
+
+    Returns
+    -------
+    OpeningBook or None if there is no file
+    """
+    path = path_of(rows, columns, directory)
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def main():
+    """
+    builds opening book of board size given in command line
+    """
+    parser = argparse.ArgumentParser(description='Fanorona opening book builder')
+    parser.add_argument('rows', type=int, nargs='?', default=5)
+    parser.add_argument('columns', type=int, nargs='?', default=9)
+    parser.add_argument('--turns', type=int, default=8)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--width', type=int, default=3)
+    parser.add_argument('--margin', type=int, default=100)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+    output = args.output or path_of(args.rows, args.columns)
+    start = time.perf_counter()
+    book = build(args.rows, args.columns, args.turns, args.depth, args.width, args.margin,
+                 lambda positions: print(f'{positions} positions', end='\r'))
+    write(output, args.rows, args.columns, book)
+    print(f'{len(book)} positions, {sum(map(len, book.values()))} turns '
+          f'in {time.perf_counter() - start:.1f} s, written to {output}')
+    opened = OpeningBook(output)
+    board = Board(args.rows, args.columns)
+    start = time.perf_counter()
+    for _ in range(1000):
+        opened.turns(board)
+    print(f'lookup {(time.perf_counter() - start) * 1000:.1f} us')
+    opened.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import os
 SQUARESIZE = 100
 BROWN = (101, 67, 42)
 BLACK = (0, 0, 0)
@@ -8,3 +9,7 @@ YELLOW = (200, 157, 124)
 width = 9*SQUARESIZE
 height = 6*SQUARESIZE
 size = (width, height)
+DATA_DIR = os.environ.get('FANORONA_DATA', os.path.join(os.path.expanduser('~'), '.fanorona'))
+GAMES_FILE = os.path.join(DATA_DIR, 'games.txt')
+MAX_GAMES_SIZE = 16 * 1024 * 1024
+SNAPSHOT_FILE = os.path.join(DATA_DIR, 'snapshot.bin')
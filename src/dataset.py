@@ -0,0 +1,256 @@
+import argparse
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+try:
+    from .board import Board
+    from .record import read_games
+except ImportError:
+    from board import Board
+    from record import read_games
+
+
+def sample_dtype(rows, columns):
+    """
+    returns type of one sample: hash of position, stones, player who moves,
+    mean result for this player (1 win, -1 loss, 0 draw) and number of games
+    in which the position was played
+    """
+    return np.dtype([('hash', '<u8'), ('position', 'i1', (rows, columns)), ('stone', 'i1'),
+                     ('label', '<f4'), ('count', '<u4')])
+
+
+def game_positions(record, board):
+    """
+    yields board before every turn of the game, steps are made with make_move
+    on the same board, so nothing is copied
+
+    Parameters
+    ----------
+    record : GameRecord
+    board : Board
+        it is set to the start position
+
+    Yields
+    ------
+    Board
+    """
+    board.matrix = [list(verse) for verse in Board(record.rows, record.columns).matrix]
+    if board.stone_turn != 1:
+        board.end_turn()
+    for steps in record.turns:
+        yield board
+        for move, capture in steps:
+            board.make_move(move, capture)
+        board.end_turn()
+
+
+class Extractor():
+    """
+    A class to collect unique positions of games with their results.
+    Positions are recognized by hash, result of position played in many games
+    is the mean of their results.
+
+    ...
+
+    Attributes
+    ----------
+    rows : int
+    columns : int
+    games : int
+        number of added games
+    positions : int
+        number of added positions, also repeated ones
+
+    Methods
+    -------
+    add(record):
+        adds positions of finished game
+    samples():
+        returns array of unique positions
+    """
+
+    def __init__(self, rows, columns):
+        """
+        Creates empty extractor of positions of boards of given size.
+
+        Parameters
+        ----------
+        rows : int
+        columns : int
+        """
+        self.rows = rows
+        self.columns = columns
+        self.games = 0
+        self.positions = 0
+        self._board = Board(rows, columns)
+        self._board.caching = False
+        self._index = {}
+        self._hashes = array('Q')
+        self._stones = array('b')
+        self._places = array('b')
+        self._scores = array('d')
+        self._counts = array('I')
+
+    def add(self, record):
+        """
+        adds positions of game, games which were not finished or were played
+        on other board are skipped
+
+        Parameters
+        ----------
+        record : GameRecord
+
+        Returns
+        -------
+        bool
+            True if game was added
+        """
+        if not record.finished or (record.rows, record.columns) != (self.rows, self.columns):
+            return False
+        winner = record.winner
+        index = self._index
+        for board in game_positions(record, self._board):
+            stone = board.stone_turn
+            score = 0.0 if winner is None else (1.0 if winner == stone else -1.0)
+            known = index.get(board.hash)
+            if known is None:
+                index[board.hash] = len(self._hashes)
+                self._hashes.append(board.hash)
+                self._stones.append(stone)
+                for verse in board.places():
+                    self._places.extend(verse)
+                self._scores.append(score)
+                self._counts.append(1)
+            else:
+                self._scores[known] += score
+                self._counts[known] += 1
+            self.positions += 1
+        self.games += 1
+        return True
+
+    def samples(self):
+        """
+        returns unique positions
+
+        Returns
+        -------
+        structured array, see sample_dtype
+        """
+        samples = np.zeros(len(self._hashes), dtype=sample_dtype(self.rows, self.columns))
+        samples['hash'] = np.frombuffer(self._hashes, dtype=np.uint64)
+        samples['position'] = np.frombuffer(self._places, dtype=np.int8).reshape(-1, self.rows, self.columns)
+        samples['stone'] = np.frombuffer(self._stones, dtype=np.int8)
+        counts = np.frombuffer(self._counts, dtype=np.uint32)
+        samples['label'] = np.frombuffer(self._scores, dtype=np.float64) / np.maximum(counts, 1)
+        samples['count'] = counts
+        return samples
+
+
+def extract_shard(job):
+    """
+    extracts unique positions of one file of games and saves them to .npy file,
+    it is run in worker process
+
+    Parameters
+    ----------
+    job : tuple (path, output, rows, columns)
+
+    Returns
+    -------
+    tuple (output, games, positions, unique positions, seconds)
+    """
+    path, output, rows, columns = job
+    start = time.perf_counter()
+    extractor = Extractor(rows, columns)
+    for record in read_games(path):
+        extractor.add(record)
+    samples = extractor.samples()
+    np.save(output, samples)
+    return output, extractor.games, extractor.positions, len(samples), time.perf_counter() - start
+
+
+def merge(samples):
+    """
+    returns one array of unique positions from many arrays, results of
+    repeated positions are averaged with weights of their counts
+
+    Parameters
+    ----------
+    samples : list of structured arrays
+
+    Returns
+    -------
+    structured array
+    """
+    samples = np.concatenate(samples)
+    hashes, first, inverse = np.unique(samples['hash'], return_index=True, return_inverse=True)
+    counts = np.zeros(len(hashes), dtype=np.uint64)
+    scores = np.zeros(len(hashes), dtype=np.float64)
+    np.add.at(counts, inverse, samples['count'])
+    np.add.at(scores, inverse, samples['label'] * samples['count'])
+    merged = samples[first]
+    merged['count'] = counts
+    merged['label'] = scores / counts
+    return merged
+
+
+def run(inputs, output_dir, rows=5, columns=9, workers=None):
+    """
+    extracts positions of every file of games to its own shard, files are
+    processed in worker processes, and merges shards to positions.npy
+
+    Parameters
+    ----------
+    inputs : list of str
+        files of games written by GameWriter
+    output_dir : str
+    rows : int
+    columns : int
+    workers : int or None
+        number of processes, None - number of CPU cores, 0 - work in this process
+
+    Returns
+    -------
+    dict
+        'games', 'positions', 'unique', 'shards', 'seconds' and 'output'
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(path, os.path.join(output_dir, f'shard_{number:04d}.npy'), rows, columns)
+            for number, path in enumerate(inputs)]
+    start = time.perf_counter()
+    if workers == 0:
+        results = [extract_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+            results = list(executor.map(extract_shard, jobs))
+    shards = [output for output, *_ in results]
+    merged = merge([np.load(shard) for shard in shards])
+    output = os.path.join(output_dir, 'positions.npy')
+    np.save(output, merged)
+    return {'games': sum(result[1] for result in results), 'positions': sum(result[2] for result in results),
+            'unique': len(merged), 'shards': shards, 'seconds': time.perf_counter() - start, 'output': output}
+
+
+def main():
+    """
+    extracts positions of files of games given in command line and prints speed
+    """
+    parser = argparse.ArgumentParser(description='Fanorona positions from recorded games')
+    parser.add_argument('inputs', nargs='+', help='files of games, one shard per file')
+    parser.add_argument('--output', default='positions')
+    parser.add_argument('--size', default='5x9')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    rows, columns = (int(number) for number in args.size.split('x'))
+    stats = run(args.inputs, args.output, rows, columns, args.workers)
+    seconds = max(stats['seconds'], 1e-9)
+    print(f"{stats['games']} games, {stats['positions']} positions, {stats['unique']} unique "
+          f"in {stats['seconds']:.1f} s")
+    print(f"{stats['positions'] / seconds:.0f} positions/s, written to {stats['output']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,512 @@
+from random import Random
+try:
+    from .board import Board
+    from .moves import Chain
+except ImportError:
+    from board import Board
+    from moves import Chain
+
+
+def opponent_of(stone):
+    """
+    returns opponent's stone
+    """
+    return 1 if stone == 2 else 2
+
+
+def chain_moves(board, stone, r, c, forbidden_moves):
+    """
+    returns capturing moves of stone from (r, c) which do not go to forbidden places
+
+    Parameters
+    ----------
+    board : Board
+    stone : 1 or 2
+    r : int
+    c : int
+        position of the stone which has just captured
+    forbidden_moves : Chain or list
+        places where stone cannot go
+
+    Returns
+    -------
+    list of moves
+    """
+    return [move for move in board.capturing_moves(stone, opponent_of(stone))
+            if move[0] == r and move[1] == c and (move[2], move[3]) not in forbidden_moves]
+
+
+def turn_steps(board, stone, sizes=None):
+    """
+    returns every full turn of the player: a paika move or a capturing move followed
+    by all next captures, the same way as Player.make_turn plays them.
+    Board is changed with make_move while turns are generated and restored at the end.
+
+    Parameters
+    ----------
+    board : Board
+    stone : 1 or 2
+    sizes : dict or None
+        if it is given, sizes[turn] is set to number of stones captured in the turn
+
+    Returns
+    -------
+    list of turns, every turn is tuple of steps (move, capture) where capture
+    is 0 (approach), 1 (withdrawal) or None (paika move)
+    """
+    capturing_moves = board.capturing_moves(stone, opponent_of(stone))
+    if not capturing_moves:
+        return [((move, None),) for move in board.possible_moves(stone)]
+    all_turns = []
+    chain = Chain(board.columns)
+    for move in capturing_moves:
+        _capture_steps(board, stone, move, (), chain, all_turns, sizes, 0)
+    return all_turns
+
+
+def _capture_steps(board, stone, move, steps, chain, all_turns, sizes=None, size=0):
+    """
+    adds to all_turns turns which start with given capturing move
+    """
+    r = move[2]
+    c = move[3]
+    chain = chain.step(move)
+    captured = board.captured_stones(opponent_of(stone), move)
+    for capture in (0, 1):
+        count = captured.count(capture)
+        if not count:
+            continue
+        record = board.make_move(move, capture)
+        next_steps = steps + ((move, capture),)
+        next_size = size + count
+        next_moves = chain_moves(board, stone, r, c, chain)
+        if not next_moves:
+            all_turns.append(next_steps)
+            if sizes is not None:
+                sizes[next_steps] = next_size
+        for next_move in next_moves:
+            _capture_steps(board, stone, next_move, next_steps, chain, all_turns, sizes, next_size)
+        board.unmake_move(record)
+
+
+def play_turn(board, steps):
+    """
+    makes all steps of turn and gives turn to the opponent
+
+    Parameters
+    ----------
+    board : Board
+    steps : tuple of (move, capture)
+
+    Returns
+    -------
+    list of records needed by undo_turn
+    """
+    records = [board.make_move(move, capture) for move, capture in steps]
+    board.end_turn()
+    return records
+
+
+def undo_turn(board, records):
+    """
+    restores board from before play_turn
+
+    Parameters
+    ----------
+    board : Board
+    records : list
+        value returned by play_turn
+
+    Returns
+    -------
+    None
+    """
+    board.end_turn()
+    for record in reversed(records):
+        board.unmake_move(record)
+
+
+def turns(board, stone):
+    """
+    yields every full turn of the player with the board after it
+
+    Parameters
+    ----------
+    board : Board
+    stone : 1 or 2
+
+    Yields
+    ------
+    (steps, board) :
+        steps - tuple of (move, capture), board - copy of the board after the turn,
+        with turn given to the opponent
+    """
+    for steps in turn_steps(board, stone):
+        child = board.copy()
+        play_turn(child, steps)
+        yield steps, child
+
+
+class Turn():
+    """
+    A class to represent one turn of a player: paika move or capturing move
+    with all next captures of the capture chain.
+
+    ...
+
+    Attributes
+    ----------
+    stone : 1 or 2
+        stone of player who made the turn
+    steps : list
+        steps (move, capture), capture is 0 (approach), 1 (withdrawal) or None (paika move)
+    captured_stones : list
+        places of all stones captured in the turn
+
+    Methods
+    -------
+    __init__(stone):
+        creates empty turn
+    is_paika():
+        returns True if turn was a move without capture
+    """
+
+    def __init__(self, stone):
+        """
+        Creates empty turn of player.
+
+        Parameters
+        ----------
+        stone : 1 or 2
+        """
+        self.stone = stone
+        self.steps = []
+        self.captured_stones = []
+
+    def is_paika(self):
+        """
+        returns True if turn was a move without capture
+        """
+        return len(self.steps) == 1 and self.steps[0][1] is None
+
+    def __repr__(self):
+        return f'Turn({self.stone}, {self.steps})'
+
+
+class GameState():
+    """
+    A class to represent state of the game without drawing anything.
+    Turn of the player is played step by step, capture chain and player who moves
+    are kept by the board.
+
+    ...
+
+    Attributes
+    ----------
+    board : Board
+    turns : list
+        finished turns in order they were played
+    current_turn : Turn
+        turn which is being played now
+    recorder : GameWriter or None
+        every finished turn is written to it
+
+    Methods
+    -------
+    __init__(board, recorder):
+        creates state of the game
+    new(rows, columns, board_class):
+        creates state of the game with new board
+    stone_turn():
+        returns stone of player who moves now
+    legal_moves():
+        returns moves which can be made now
+    capture_options(move):
+        returns stones captured by approach and by withdrawal
+    play(move, capture):
+        makes one step of the turn
+    winner():
+        returns winner's stone or None
+    is_over():
+        returns True if the game is over
+    """
+
+    def __init__(self, board, recorder=None):
+        """
+        Creates state of the game played on given board.
+
+        Parameters
+        ----------
+        board : Board
+        recorder : GameWriter or None
+        """
+        self.board = board
+        self.turns = []
+        self.current_turn = Turn(board.stone_turn)
+        self.recorder = recorder
+
+    @classmethod
+    def new(cls, rows, columns, board_class=Board):
+        """
+        returns state of the game with new board with starting stones
+
+        Parameters
+        ----------
+        rows : int
+        columns : int
+        board_class : Board or its child class
+
+        Returns
+        -------
+        GameState
+        """
+        return cls(board_class(rows, columns))
+
+    def stone_turn(self):
+        """
+        returns stone of player who moves now
+        """
+        return self.board.stone_turn
+
+    def legal_moves(self):
+        """
+        returns moves which can be made now: next captures of the capture chain,
+        capturing moves or, if there are no capturing moves, all possible moves
+
+        Returns
+        -------
+        list of moves
+        """
+        board = self.board
+        stone = board.stone_turn
+        if board.last_position is not None:
+            r, c = board.last_position
+            return chain_moves(board, stone, r, c, board.chain)
+        return board.capturing_moves(stone, opponent_of(stone)) or board.possible_moves(stone)
+
+    def capture_options(self, move):
+        """
+        returns stones which move captures
+
+        Parameters
+        ----------
+        move : (r1, c1, r2, c2)
+
+        Returns
+        -------
+        CaptureResult, it behaves like tuple with list of approach captured stones
+        and list of withdrawal captured stones
+        """
+        return self.board.captured_stones(opponent_of(self.board.stone_turn), move)
+
+    def play(self, move, capture=None):
+        """
+        makes one step of the turn. If capture is None and move captures only
+        by approach or only by withdrawal, this capture is made.
+
+        Parameters
+        ----------
+        move : (r1, c1, r2, c2)
+        capture : 0, 1 or None
+            0 - approach, 1 - withdrawal
+
+        Returns
+        -------
+        bool
+            True if the turn has ended
+        """
+        board = self.board
+        move = tuple(move)
+        if move not in self.legal_moves():
+            raise ValueError(f'illegal move {move}')
+        captured = self.capture_options(move)
+        approach, withdrawal = captured.approach, captured.withdrawal
+        if not approach and not withdrawal:
+            board.make_move(move)
+            self.current_turn.steps.append((move, None))
+            return self._end_turn()
+        if capture is None:
+            if approach and withdrawal:
+                raise ValueError(f'move {move} captures by approach and withdrawal, capture must be chosen')
+            capture = 0 if approach else 1
+        if not captured.count(capture):
+            raise ValueError(f'move {move} does not capture with capture {capture}')
+        record = board.make_move(move, capture)
+        self.current_turn.steps.append((move, capture))
+        self.current_turn.captured_stones.extend(record[1])
+        r, c = move[2], move[3]
+        board.set_chain((r, c), board.chain.step(move))
+        if chain_moves(board, board.stone_turn, r, c, board.chain):
+            return False
+        return self._end_turn()
+
+    def _end_turn(self):
+        """
+        saves current turn, writes it to recorder and gives turn to the opponent
+        """
+        self.turns.append(self.current_turn)
+        if self.recorder is not None:
+            self.recorder.turn(self.current_turn.steps)
+        self.board.end_turn()
+        self.current_turn = Turn(self.board.stone_turn)
+        return True
+
+    def winner(self):
+        """
+        returns winner's stone: player who captured all opponent's stones
+        or whose opponent cannot move
+
+        Returns
+        -------
+        1, 2 or None
+        """
+        winner = self.board.is_winner()
+        if winner is None and not self.legal_moves():
+            winner = opponent_of(self.board.stone_turn)
+        return winner
+
+    def is_over(self):
+        """
+        returns True if the game is over
+        """
+        return self.winner() is not None
+
+
+class Agent():
+    """
+    A class to represent interface of a player of headless game.
+    Child classes make decisions, GameState checks and makes them.
+
+    Methods
+    -------
+    choose_move(state, moves):
+        returns one of legal moves
+    choose_capture(state, move, captured_stones):
+        returns 0 (approach) or 1 (withdrawal)
+    """
+
+    def choose_move(self, state, moves):
+        """
+        returns one of legal moves
+
+        Parameters
+        ----------
+        state : GameState
+        moves : list
+            legal moves
+
+        Returns
+        -------
+        move : (r1, c1, r2, c2)
+        """
+        raise NotImplementedError
+
+    def choose_capture(self, state, move, captured_stones):
+        """
+        returns which stones to capture when move captures by approach and by withdrawal
+
+        Parameters
+        ----------
+        state : GameState
+        move : (r1, c1, r2, c2)
+        captured_stones : tuple
+            list of approach captured stones and list of withdrawal captured stones
+
+        Returns
+        -------
+        0 - approach or 1 - withdrawal
+        """
+        raise NotImplementedError
+
+
+class RandomAgent(Agent):
+    """
+    A class to represent player which makes random decisions. Child class of Agent class.
+
+    Attributes
+    ----------
+    rng : Random
+        random numbers generator, the same seed gives the same game
+    """
+
+    def __init__(self, seed=None):
+        """
+        Creates random player.
+
+        Parameters
+        ----------
+        seed : int or None
+        """
+        self.rng = Random(seed)
+
+    def choose_move(self, state, moves):
+        return self.rng.choice(moves)
+
+    def choose_capture(self, state, move, captured_stones):
+        return self.rng.randrange(2)
+
+
+def decide_step(state, agent):
+    """
+    asks agent for a move and capture if it has to be chosen, nothing is changed,
+    so it can be run on a copy of the state
+
+    Parameters
+    ----------
+    state : GameState
+    agent : Agent
+        player who moves now
+
+    Returns
+    -------
+    tuple (move, capture)
+        capture is None if it does not have to be chosen
+    """
+    move = agent.choose_move(state, state.legal_moves())
+    captured = state.capture_options(move)
+    capture = None
+    if captured.approach and captured.withdrawal:
+        capture = agent.choose_capture(state, move, tuple(captured))
+    return move, capture
+
+
+def play_step(state, agent):
+    """
+    asks agent for a move (and capture if it has to be chosen) and makes it
+
+    Parameters
+    ----------
+    state : GameState
+    agent : Agent
+        player who moves now
+
+    Returns
+    -------
+    bool
+        True if the turn has ended
+    """
+    move, capture = decide_step(state, agent)
+    return state.play(move, capture)
+
+
+def play_game(state, agents, max_turns=None):
+    """
+    plays the game till the end without drawing anything
+
+    Parameters
+    ----------
+    state : GameState
+    agents : dict
+        agents[stone] - player with given stone
+    max_turns : int or None
+        after this number of turns the game ends with a draw
+
+    Returns
+    -------
+    winner's stone or None if it was a draw
+    """
+    while not state.is_over():
+        if max_turns is not None and len(state.turns) >= max_turns:
+            return None
+        play_step(state, agents[state.stone_turn()])
+    return state.winner()
@@ -0,0 +1,148 @@
+from functools import lru_cache
+try:
+    from .moves import Move
+except ImportError:
+    from moves import Move
+
+
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (1, 1), (-1, 1))
+OPPOSITE = (1, 0, 3, 2, 6, 7, 4, 5)
+
+
+class Geometry():
+    """
+    A class to represent lines of a board of given size.
+    It is built once for every size of board and shared by all boards of that size.
+
+    ...
+
+    Attributes
+    ----------
+    rows : int
+        number of rows of board
+    columns : int
+        number of columns of board
+    diagonal_moves : tuple
+        places from which diagonal moves are possible
+    directions : tuple
+        for every place (directions[r][c]) indices of DIRECTIONS in which stone can go
+    steps : tuple
+        for every place (steps[r][c]) places where stone can go, in order of DIRECTIONS
+    moves : tuple
+        for every place (moves[r][c]) Move objects to places from steps[r][c]
+    direction_moves : tuple
+        for every place (direction_moves[r][c]) pairs (index of direction, Move)
+    around : tuple
+        for every place (around[r][c]) all places around it
+    rays : dict
+        for every move (r1, c1, r2, c2) tuple with approach ray (places after r2, c2)
+        and withdrawal ray (places before r1, c1)
+
+    Methods
+    -------
+    __init__(rows, columns):
+        creates geometry
+    ray(r, c, d):
+        returns places after (r, c) in direction d
+    """
+
+    def __init__(self, rows, columns):
+        """
+        Constructs all the necessary attributes for the geometry object.
+
+        Parameters
+        ----------
+        rows : int
+            number of rows
+        columns : int
+            number of columns
+        """
+        self.rows = rows
+        self.columns = columns
+        self.diagonal_moves = tuple((r, c) for c in range(columns) for r in range(rows)
+                                    if (r + c) % 2 == 0)
+        diagonal = frozenset(self.diagonal_moves)
+        directions = []
+        steps = []
+        moves = []
+        around = []
+        rays = {}
+        for r in range(rows):
+            directions.append([])
+            steps.append([])
+            moves.append([])
+            around.append([])
+            for c in range(columns):
+                place_directions = []
+                place_steps = []
+                place_moves = []
+                for d, (dr, dc) in enumerate(DIRECTIONS):
+                    r2 = r + dr
+                    c2 = c + dc
+                    if not (0 <= r2 < rows and 0 <= c2 < columns):
+                        continue
+                    if dr != 0 and dc != 0 and (r, c) not in diagonal:
+                        continue
+                    move = Move(r, c, r2, c2)
+                    place_directions.append(d)
+                    place_steps.append((r2, c2))
+                    place_moves.append(move)
+                    rays[move] = (self.ray(r2, c2, d), self.ray(r, c, OPPOSITE[d]))
+                directions[r].append(tuple(place_directions))
+                steps[r].append(tuple(place_steps))
+                moves[r].append(tuple(place_moves))
+                around[r].append(tuple((x, y) for x in range(r-1, r+2) for y in range(c-1, c+2)
+                                       if 0 <= x < rows and 0 <= y < columns and (x, y) != (r, c)))
+        self.directions = tuple(tuple(verse) for verse in directions)
+        self.steps = tuple(tuple(verse) for verse in steps)
+        self.moves = tuple(tuple(verse) for verse in moves)
+        self.direction_moves = tuple(tuple(tuple(zip(directions[r][c], moves[r][c])) for c in range(columns))
+                                     for r in range(rows))
+        self.around = tuple(tuple(verse) for verse in around)
+        self.rays = rays
+
+    def ray(self, r, c, d):
+        """
+        returns places after (r, c) in direction d till the edge of board
+
+        Parameters
+        ----------
+        r : int
+            row
+        c : int
+            column
+        d : int
+            index of direction in DIRECTIONS
+
+        Returns
+        -------
+        tuple of places
+        """
+        dr, dc = DIRECTIONS[d]
+        places = []
+        r += dr
+        c += dc
+        while 0 <= r < self.rows and 0 <= c < self.columns:
+            places.append((r, c))
+            r += dr
+            c += dc
+        return tuple(places)
+
+
+@lru_cache(maxsize=None)
+def geometry(rows, columns):
+    """
+    returns geometry for board of given size, it is built only once
+
+    Parameters
+    ----------
+    rows : int
+        number of rows
+    columns : int
+        number of columns
+
+    Returns
+    -------
+    Geometry
+    """
+    return Geometry(rows, columns)
@@ -1,7 +1,13 @@
+import os
 import pygame
-import sys
 from players import HumanPlayer, Computer
 from board import Board
+from engine import GameState
+from worker import AIWorker
+import tablebase
+import book
+from record import GameWriter
+from snapshot import Snapshot
 import board as brd
 from config import (
     SQUARESIZE,
@@ -10,54 +16,109 @@ from config import (
     BROWN,
     BLACK,
     YELLOW,
+    GAMES_FILE,
+    MAX_GAMES_SIZE,
+    SNAPSHOT_FILE,
 )
 
 
+FPS = 30
+MOVE_TIME = 3.0
+TITLE, SIZE, STONE, OPPONENT, PLAY, ENDING, RESULT, QUIT = range(8)
+SIZE_OPTIONS = ['3 x 3', '5 x 5', '5 x 9']
+SIZES = [(3, 3), (5, 5), (5, 9)]
+STONE_OPTIONS = ['WHITE', 'BLACK']
+OPPONENT_OPTIONS = ['Another Player', 'Computer - Easy', 'Computer - Hard', 'Computer - Expert']
+
+
 class Game():
     """
-    A class to represent game.
+    A class to represent game. Game is a state machine: one event loop gives
+    events to the current screen (title, menus, board, result) and the loop
+    sleeps while nobody has to do anything.
 
     ...
 
     Attributes
     ----------
     myfont, myfont2, myfont_title : font
+    mode : int
+        current screen: TITLE, SIZE, STONE, OPPONENT, PLAY, ENDING, RESULT or QUIT
+    clock : Clock
+        limits number of frames per second
+    size_of_board : (rows, columns)
     stone, opponent_stone : 1 or 2
+    opponent_option : int
+        chosen option of opponent menu
     player1 player2 : Player
     board : Board
+    state : GameState
+        rules of the game, the game only draws it and asks players for decisions
     stone_turn : 1 or 2
+    worker : AIWorker or None
+        worker choosing move of computer in background
+    capture_move : move or None
+        move of human player who has to choose capture
+    ready_at : int
+        time in ms when computer's move or result can be shown
+    recorder : GameWriter or None
+        writes turns of played games to file
+    snapshot_file : str or None
+        file where the game is saved after every step
 
     Methods
     -------
-    __init__(stone):
-        creates game
+    __init__(recorder, snapshot_file):
+        creates game and shows its title
     print_question(question, options):
         draws on screen questions and buttons
-    ask_for_size_of_board():
-        returns size o chosen board
+    chosen_option(options, pos):
+        returns index of clicked button
     print_text(text):
         draws on screen big text
-    ask_for_opponent(stone):
-        creates opponent
-    ask_for_stone():
-        returns players' stones
     print_result(player1, winning_stone):
         draws on screen result of game
     show_turn(player, f_player_stone):
         shows which turn is now
-    play():
-        make turns till there is no winner
+    handle(event):
+        gives event to the current screen
+    click(pos):
+        reacts on mouse click
+    current_player():
+        returns player who moves now
+    start_game():
+        creates board and players
+    resume(snapshot):
+        continues saved game
+    checkpoint():
+        saves game to snapshot file
+    next_step():
+        asks player who moves now for a move
+    opponent(option):
+        creates computer opponent
+    click_board(pos):
+        gives click on board to human player
+    make_step(move, capture):
+        makes move and asks for the next one
+    update():
+        makes computer's move when it is ready
+    is_busy():
+        returns True if something happens without player's click
+    run():
+        event loop of the game
     """
 
-    def __init__(self):
+    def __init__(self, recorder=None, snapshot_file=None):
         """
-        creates player, board and constructs all the necessary attributes for the game object.
+        creates fonts and constructs all the necessary attributes for the game object,
+        shows title of the game
 
         Parameters
         ----------
-        question : str
-
-        options : list of strings:
+        recorder : GameWriter or None
+            played games are written to it
+        snapshot_file : str or None
+            game is saved to it after every step, None - game is not saved
 
         Returns
         -------
@@ -66,14 +127,23 @@ class Game():
         self.myfont = pygame.font.SysFont('Comic Sans MS', 60)
         self.myfont2 = pygame.font.SysFont('Comic Sans MS', 30)
         self.myfont_title = pygame.font.SysFont('Comic Sans MS', 120)
-        self.print_text("FANORONA")
-        size_of_board = self.ask_for_size_of_board()
-        self.stone, self.opponent_stone = self.ask_for_stone()
-        self.player2 = self.ask_for_opponent(self.opponent_stone)
-        self.player1 = HumanPlayer(self.stone)
-        self.board = Board(size_of_board[0], size_of_board[1])
-        self.board.draw_board()
+        self.clock = pygame.time.Clock()
+        self.mode = TITLE
+        self.size_of_board = None
+        self.stone = None
+        self.opponent_stone = None
+        self.opponent_option = 0
+        self.player1 = None
+        self.player2 = None
+        self.board = None
+        self.state = None
         self.stone_turn = 1
+        self.worker = None
+        self.capture_move = None
+        self.ready_at = 0
+        self.recorder = recorder
+        self.snapshot_file = snapshot_file
+        self.print_text("FANORONA")
 
     def print_question(self, question, options):
         """
@@ -89,6 +159,7 @@ class Game():
         -------
         None
         """
+        screen.fill(BLACK)
         question = self.myfont.render(question, True, YELLOW)
         question_rect = question.get_rect(center=(width/2, height/5))
         screen.blit(question, question_rect)
@@ -99,42 +170,28 @@ class Game():
             screen.blit(button, button_rect)
         pygame.display.update()
 
-    def ask_for_size_of_board(self):
+    def chosen_option(self, options, pos):
         """
-        asks about size of board and takes answer
+        returns index of button drawn by print_question which was clicked
+
+        Parameters
+        ----------
+        options : list of strings
+        pos : (x, y)
+            coordinates of mouse click
 
         Returns
         -------
-        size :
-        (3, 3) if first option
-        (5, 5) if second option
-        (5, 9) if last option
+        int or None if no button was clicked
         """
-        options = ['3 x 3', '5 x 5', '5 x 9']
         size_of_button = pygame.font.Font.size(self.myfont, max(options))
-        self.print_question('CHOOSE SIZE OF THE BOARD', options)
-        size = None
-        while not size:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    posx = event.pos[0]
-                    posy = event.pos[1]
-                    if posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 and posy <= height/3 + size_of_button[1]/2:
-                        size = (3, 3)
-                    elif posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 + SQUARESIZE \
-                            and posy <= height/3 + size_of_button[1]/2 + SQUARESIZE:
-                        size = (5, 5)
-                    elif posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 + 2*SQUARESIZE \
-                            and posy <= height/3 + size_of_button[1]/2 + 2*SQUARESIZE:
-                        size = (5, 9)
-        screen.fill(BLACK)
-        pygame.display.update()
-        return size
+        posx, posy = pos
+        for enum in range(len(options)):
+            x = enum*SQUARESIZE
+            if posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
+                    and posy >= height/3 - size_of_button[1]/2 + x and posy <= height/3 + size_of_button[1]/2 + x:
+                return enum
+        return None
 
     def print_text(self, text):
         """
@@ -148,96 +205,11 @@ class Game():
         -------
         None
         """
+        screen.fill(BLACK)
         question = self.myfont_title.render(text, True, BROWN)
         question_rect = question.get_rect(center=(width/2, height/2))
         screen.blit(question, question_rect)
         pygame.display.update()
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    screen.fill(BLACK)
-                    pygame.display.update()
-                    return
-                if event.type == pygame.QUIT:
-                    sys.exit()
-
-    def ask_for_opponent(self, stone):
-        """
-        asks about kind of opponent
-
-        Parameters
-        ----------
-        stone : 1 or 2
-            opponent_stone
-
-        Returns
-        -------
-        opponent :
-        Player if first option
-        Computer(Easy) if second option
-        Computer(Hard) if last option
-        """
-        options = ['Another Player', 'Computer - Easy', 'Computer - Hard']
-        size_of_button = pygame.font.Font.size(self.myfont, max(options))
-        self.print_question('CHOOSE YOUR OPPONENT', options)
-        opponent = None
-        pygame.display.update()
-        while not opponent:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    posx = event.pos[0]
-                    posy = event.pos[1]
-                    if posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 and posy <= height/3 + size_of_button[1]/2:
-                        opponent = HumanPlayer(stone)
-                    elif posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 + SQUARESIZE\
-                            and posy <= height/3 + size_of_button[1]/2 + SQUARESIZE:
-                        opponent = Computer(stone, 'Easy')
-                    elif posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 + 2*SQUARESIZE\
-                            and posy <= height/3 + size_of_button[1]/2 + 2*SQUARESIZE:
-                        opponent = Computer(stone, 'Hard')
-        screen.fill(BLACK)
-        pygame.display.update()
-        return opponent
-
-    def ask_for_stone(self):
-        """
-        asks about stone
-
-        Returns
-        -------
-        stone, opponent_stone :
-        1, 2 if first option
-        2, 1 if second option
-        """
-        options = ['WHITE', 'BLACK']
-        size_of_button = pygame.font.Font.size(self.myfont, max(options))
-        self.print_question('CHOOSE YOUR STONE', options)
-        stone = None
-        while not stone:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    posx = event.pos[0]
-                    posy = event.pos[1]
-                    if posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 and posy <= height/3 + size_of_button[1]/2:
-                        stone = 1
-                        opponent_stone = 2
-
-                    elif posx >= (width - size_of_button[0])/2 and posx <= (width + size_of_button[0])/2 \
-                            and posy >= height/3 - size_of_button[1]/2 + SQUARESIZE \
-                            and posy <= height/3 + size_of_button[1]/2 + SQUARESIZE:
-                        stone = 2
-                        opponent_stone = 1
-        screen.fill(BLACK)
-        pygame.display.update()
-        return stone, opponent_stone
 
     def print_result(self, player1, winning_stone):
         """
@@ -254,15 +226,12 @@ class Game():
         -------
         None
         """
-        screen.fill(BLACK)
-        pygame.display.update()
         if winning_stone == player1.stone():
             self.print_text("YOU WON!!!")
         else:
             self.print_text("YOU LOSE...")
-        return
 
-    def show_turn(self, player, f_player_stone):
+    def show_turn(self, player, f_player_stone, info=''):
         """
         draws on screen which turn is now and what color of stone is playing now
 
@@ -274,6 +243,9 @@ class Game():
         f_player_stone : 1 or 2
             first player's stone
 
+        info : str
+            text added at the end, for example progress of computer's search
+
         Returns
         -------
         None
@@ -281,34 +253,296 @@ class Game():
         stone = 'WHITE' if player.stone() == 1 else 'BLACK'
         text = 'Your Turn' if player.stone() == f_player_stone else "Opponent's turn"
         text += f', stone : {stone}'
+        if info:
+            text += f' ({info})'
         turn = self.myfont2.render(text, True, YELLOW)
         rect = turn.get_rect(center=(width/2, height - SQUARESIZE/4))
-        pygame.draw.rect(screen, BLACK, (0, height -
-                         SQUARESIZE/2, width, SQUARESIZE))
+        area = pygame.Rect(0, height - SQUARESIZE/2, width, SQUARESIZE)
+        pygame.draw.rect(screen, BLACK, area)
         screen.blit(turn, rect)
+        pygame.display.update(area)
+
+    def handle(self, event):
+        """
+        gives event to the current screen
+
+        Parameters
+        ----------
+        event : Event
+
+        Returns
+        -------
+        None
+        """
+        if event.type == pygame.QUIT:
+            if self.worker is not None:
+                self.worker.cancel()
+            self.mode = QUIT
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.click(event.pos)
+
+    def click(self, pos):
+        """
+        reacts on mouse click on the current screen
+
+        Parameters
+        ----------
+        pos : (x, y)
+            coordinates of mouse click
+
+        Returns
+        -------
+        None
+        """
+        if self.mode == TITLE:
+            self.mode = SIZE
+            self.print_question('CHOOSE SIZE OF THE BOARD', SIZE_OPTIONS)
+        elif self.mode == SIZE:
+            option = self.chosen_option(SIZE_OPTIONS, pos)
+            if option is not None:
+                self.size_of_board = SIZES[option]
+                self.mode = STONE
+                self.print_question('CHOOSE YOUR STONE', STONE_OPTIONS)
+        elif self.mode == STONE:
+            option = self.chosen_option(STONE_OPTIONS, pos)
+            if option is not None:
+                self.stone, self.opponent_stone = (1, 2) if option == 0 else (2, 1)
+                self.mode = OPPONENT
+                self.print_question('CHOOSE YOUR OPPONENT', OPPONENT_OPTIONS)
+        elif self.mode == OPPONENT:
+            option = self.chosen_option(OPPONENT_OPTIONS, pos)
+            if option is not None:
+                self.opponent_option = option
+                self.player2 = HumanPlayer(self.opponent_stone) if option == 0 else self.opponent(option)
+                self.start_game()
+        elif self.mode == PLAY:
+            self.click_board(pos)
+        elif self.mode == RESULT:
+            self.mode = QUIT
+
+    def current_player(self):
+        """
+        returns player who moves now
+        """
+        return self.player1 if self.player1.stone() == self.stone_turn else self.player2
+
+    def opponent(self, option):
+        """
+        returns computer opponent chosen in menu, expert searches as deep as
+        it can in MOVE_TIME seconds, openings are played from opening book
+        and endgames from tablebase if there are files for the board size
+
+        Parameters
+        ----------
+        option : 1, 2 or 3
+            Easy, Hard or Expert
+
+        Returns
+        -------
+        Computer
+        """
+        level = ('Easy', 'Hard', 'Expert')[option - 1]
+        solved = tablebase.load(*self.size_of_board)
+        openings = book.load(*self.size_of_board)
+        if level == 'Expert':
+            return Computer(self.opponent_stone, level, depth=4, max_nodes=None, max_time=None,
+                            tablebase=solved, book=openings)
+        return Computer(self.opponent_stone, level, tablebase=solved, book=openings)
+
+    def start_game(self):
+        """
+        creates player, board and state of the game and asks for the first move
+
+        Returns
+        -------
+        None
+        """
+        self.player1 = HumanPlayer(self.stone)
+        self.board = Board(self.size_of_board[0], self.size_of_board[1])
+        self.state = GameState(self.board, self.recorder)
+        if self.recorder is not None:
+            self.recorder.start(*self.size_of_board)
+        self.stone_turn = 1
+        self.mode = PLAY
+        screen.fill(BLACK)
         pygame.display.update()
+        self.board.draw_board()
+        self.next_step()
+
+    def resume(self, snapshot):
+        """
+        continues game saved in snapshot, also in the middle of capture chain,
+        turns played before are not recorded again
+
+        Parameters
+        ----------
+        snapshot : Snapshot
+
+        Returns
+        -------
+        None
+        """
+        self.board = snapshot.board
+        self.size_of_board = (self.board.rows, self.board.columns)
+        self.stone, self.opponent_stone = (1, 2) if snapshot.stone == 1 else (2, 1)
+        self.opponent_option = snapshot.opponent
+        self.player1 = HumanPlayer(self.stone)
+        self.player2 = HumanPlayer(self.opponent_stone) if snapshot.opponent == 0 else self.opponent(snapshot.opponent)
+        self.state = GameState(self.board)
+        self.stone_turn = self.board.stone_turn
+        self.mode = PLAY
+        screen.fill(BLACK)
+        pygame.display.update()
+        self.board.draw_board()
+        self.next_step()
+
+    def checkpoint(self):
+        """
+        saves game to snapshot file, it takes microseconds, so it is done after every step
+
+        Returns
+        -------
+        None
+        """
+        if self.snapshot_file is not None:
+            Snapshot(self.board, self.stone, self.opponent_option).save(self.snapshot_file)
+
+    def next_step(self):
+        """
+        shows whose turn it is and asks this player for a move: computer starts
+        thinking in background worker, human player's stones are lit up
+
+        Returns
+        -------
+        None
+        """
+        player = self.current_player()
+        self.show_turn(player, self.stone)
+        self.capture_move = None
+        if isinstance(player, Computer):
+            delay = 1000 if self.board.last_position is None else 1800
+            self.ready_at = pygame.time.get_ticks() + delay
+            self.worker = AIWorker(player, MOVE_TIME)
+            self.worker.start(self.state)
+        else:
+            self.worker = None
+            player.start_move(self.state, self.state.legal_moves())
 
-    def play(self):
+    def click_board(self, pos):
         """
-        while there is no winner makes turns, print result of game
+        gives click on board to human player who moves now
+
+        Parameters
+        ----------
+        pos : (x, y)
 
         Returns
         -------
         None
         """
-        while not self.board.is_winner():
-            current_player = self.player1 if self.player1.stone(
-            ) == self.stone_turn else self.player2
-            self.show_turn(current_player, self.stone)
-            current_player.make_turn(self.board)
-            self.stone_turn = 1 if self.stone_turn == 2 else 2
-        pygame.time.delay(1000)
-        self.print_result(self.player1, self.board.is_winner())
+        player = self.current_player()
+        if self.worker is not None or isinstance(player, Computer):
+            return
+        place = self.board.chosen_position(pos[0], pos[1])
+        if place is None:
+            return
+        r, c = place
+        if self.capture_move is not None:
+            captured_stones = self.state.capture_options(self.capture_move)
+            capture = player.click_capture(captured_stones, r, c)
+            if capture is not None:
+                self.make_step(self.capture_move, capture)
+            return
+        move = player.click_move(self.state, r, c)
+        if move is None:
+            return
+        approach, withdrawal = self.state.capture_options(move)
+        if approach and withdrawal:
+            self.capture_move = move
+            player.start_capture(self.board, (approach, withdrawal))
+        else:
+            self.make_step(move, None)
+
+    def make_step(self, move, capture):
+        """
+        makes move, draws board and asks for the next move or ends the game
+
+        Parameters
+        ----------
+        move : (r1, c1, r2, c2)
+        capture : 0, 1 or None
+
+        Returns
+        -------
+        None
+        """
+        self.state.play(move, capture)
+        self.board.draw_board()
+        self.stone_turn = self.state.stone_turn()
+        if self.state.is_over():
+            self.worker = None
+            if self.state.recorder is not None:
+                self.state.recorder.end(self.state.winner())
+            if self.snapshot_file is not None and os.path.exists(self.snapshot_file):
+                os.remove(self.snapshot_file)
+            self.mode = ENDING
+            self.ready_at = pygame.time.get_ticks() + 1000
+        else:
+            self.checkpoint()
+            self.next_step()
+
+    def update(self):
+        """
+        polls worker and makes computer's move when it is chosen and shown
+        long enough, shows progress of search meanwhile.
+        Shows result when the game has ended
+
+        Returns
+        -------
+        None
+        """
+        now = pygame.time.get_ticks()
+        if self.mode == PLAY and self.worker is not None:
+            decision = self.worker.poll()
+            if decision is not None and now >= self.ready_at:
+                self.worker = None
+                self.make_step(*decision)
+            elif decision is None and self.worker.progress()[0]:
+                nodes, seconds = self.worker.progress()
+                self.show_turn(self.current_player(), self.stone, f'{nodes} positions, {seconds:.1f} s')
+        elif self.mode == ENDING and now >= self.ready_at:
+            self.mode = RESULT
+            self.print_result(self.player1, self.state.winner())
+
+    def is_busy(self):
+        """
+        returns True if the game waits for computer or timer, not for player's click
+        """
+        return self.mode == ENDING or (self.mode == PLAY and self.worker is not None)
+
+    def run(self):
+        """
+        event loop of the game: it sleeps till next event when it waits for
+        player's click, otherwise it runs at most FPS times per second
+
+        Returns
+        -------
+        None
+        """
+        while self.mode != QUIT:
+            if not self.is_busy():
+                self.handle(pygame.event.wait())
+            for event in pygame.event.get():
+                self.handle(event)
+            self.update()
+            self.clock.tick(FPS)
 
 
 def main():
     """
-    makes window and starts game
+    makes window and starts game or continues game saved before power cut,
+    games are written to GAMES_FILE and saved to SNAPSHOT_FILE from config,
+    None turns it off
 
     Returns
     -------
@@ -319,11 +553,18 @@ def main():
     size = (width, height)
     screen = pygame.display.set_mode(size)
     brd.screen = screen
-    game = Game()
-    game.play()
-    for event in pygame.event.get():
-        if event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.QUIT:
-            sys.exit()
+    for path in (GAMES_FILE, SNAPSHOT_FILE):
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    recorder = GameWriter(GAMES_FILE, MAX_GAMES_SIZE) if GAMES_FILE is not None else None
+    game = Game(recorder, SNAPSHOT_FILE)
+    saved = Snapshot.load(SNAPSHOT_FILE, Board) if SNAPSHOT_FILE is not None else None
+    if saved is not None and (saved.board.rows, saved.board.columns) in SIZES:
+        game.resume(saved)
+    game.run()
+    if recorder is not None:
+        recorder.close()
+    pygame.quit()
 
 
 if __name__ == "__main__":
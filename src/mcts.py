@@ -0,0 +1,406 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from random import Random
+try:
+    from .engine import opponent_of, chain_moves, turn_steps, play_turn, undo_turn
+    from .moves import Chain
+except ImportError:
+    from engine import opponent_of, chain_moves, turn_steps, play_turn, undo_turn
+    from moves import Chain
+
+
+def random_playout(board, stone, rng, max_turns=80):
+    """
+    plays random turns till the end of the game and returns winner,
+    board is changed with make_move and restored at the end, so no board is copied.
+    Turns are played the same way as Player.make_turn: a random capturing move
+    (or paika move if there is none) and random next captures of the chain.
+
+    Parameters
+    ----------
+    board : Board
+    stone : 1 or 2
+        player who moves now
+    rng : Random
+    max_turns : int
+        after this number of turns the game is a draw
+
+    Returns
+    -------
+    1, 2 or None if it was a draw
+    """
+    records = []
+    winner = board.is_winner()
+    turns = 0
+    while winner is None and turns < max_turns:
+        opponent_stone = opponent_of(stone)
+        moves = board.capturing_moves(stone, opponent_stone)
+        if not moves:
+            moves = board.possible_moves(stone)
+            if not moves:
+                winner = opponent_stone
+                break
+            records.append(board.make_move(rng.choice(moves)))
+        else:
+            move = rng.choice(moves)
+            chain = Chain(board.columns)
+            while move is not None:
+                captured = board.captured_stones(opponent_stone, move)
+                if captured.approach and captured.withdrawal:
+                    capture = rng.randrange(2)
+                else:
+                    capture = 0 if captured.approach else 1
+                records.append(board.make_move(move, capture))
+                chain = chain.step(move)
+                next_moves = chain_moves(board, stone, move[2], move[3], chain)
+                move = rng.choice(next_moves) if next_moves else None
+            winner = board.is_winner()
+        stone = opponent_stone
+        turns += 1
+    for record in reversed(records):
+        board.unmake_move(record)
+    return winner
+
+
+class Node():
+    """
+    A class to represent position in tree of Monte Carlo search.
+
+    ...
+
+    Attributes
+    ----------
+    parent : Node or None
+    steps : tuple or None
+        turn which leads from parent to this position
+    stone : 1 or 2
+        player who moves in this position
+    hash : int
+        hash of board in this position
+    children : list
+    untried : list or None
+        turns which do not have children yet, None before they are generated
+    visits : int
+    wins : float
+        wins of player who made the turn leading to this position, draw is half of win
+    """
+
+    def __init__(self, parent, steps, stone, hash):
+        self.parent = parent
+        self.steps = steps
+        self.stone = stone
+        self.hash = hash
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0.0
+
+    def select(self, exploration):
+        """
+        returns child with the biggest upper confidence bound (UCT)
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+    def find(self, hash, depth=2):
+        """
+        returns descendant at most depth turns deep with given hash or None
+        """
+        if self.hash == hash:
+            return self
+        if depth == 0:
+            return None
+        for child in self.children:
+            node = child.find(hash, depth - 1)
+            if node is not None:
+                return node
+        return None
+
+
+class MCTS():
+    """
+    A class to represent Monte Carlo tree search over full turns with UCT selection
+    and random playouts. Tree is kept between searches and reused if the new
+    position is in it. With more workers the tree is searched in this process
+    and independent trees in worker processes, visits and wins of their root
+    turns are added to the tree (root parallelization). Processes are started
+    once and kept till close.
+
+    ...
+
+    Attributes
+    ----------
+    playouts : int or None
+        number of playouts per search
+    max_time : float or None
+        maximal time of search in seconds
+    exploration : float
+        UCT exploration constant
+    max_turns : int
+        length of playout after which it is a draw
+    workers : int
+        number of searching processes including this one, 1 - no worker processes
+    rng : Random
+    root : Node or None
+        tree of last search
+    nodes : int
+        number of playouts of last search
+    stop_event : Event or None
+        search ends when it is set
+
+    Methods
+    -------
+    __init__(playouts, max_time, exploration, max_turns, workers, seed):
+        creates search
+    best_turn(board, stone):
+        returns the most visited turn
+    statistics(board, stone):
+        returns visits and wins of every turn
+    search(board, root):
+        makes playouts from the root
+    iterate(board, root):
+        makes one playout and updates tree
+    close():
+        stops worker processes
+    """
+
+    def __init__(self, playouts=2000, max_time=None, exploration=1.4, max_turns=80, workers=1, seed=None):
+        """
+        Constructs all the necessary attributes for the search object.
+
+        Parameters
+        ----------
+        playouts : int or None
+        max_time : float or None
+        exploration : float
+        max_turns : int
+        workers : int
+        seed : int or None
+        """
+        self.playouts = playouts
+        self.max_time = max_time
+        self.exploration = exploration
+        self.max_turns = max_turns
+        self.workers = workers
+        self.seed = seed
+        self.rng = Random(seed)
+        self.root = None
+        self.nodes = 0
+        self.stop_event = None
+        self._executor = None
+        self._stop = None
+
+    def best_turn(self, board, stone):
+        """
+        returns the most visited turn of the player
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+
+        Returns
+        -------
+        tuple of steps (move, capture) or None if player cannot move
+        """
+        statistics = self.statistics(board, stone)
+        if not statistics:
+            return None
+        return max(statistics, key=lambda steps: statistics[steps][0])
+
+    def statistics(self, board, stone):
+        """
+        returns visits and wins of every turn of the player
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+
+        Returns
+        -------
+        dict
+            statistics[steps] = (visits, wins)
+        """
+        board = board.copy()
+        if board.stone_turn != stone:
+            board.end_turn()
+        root = self.root.find(board.hash) if self.root is not None else None
+        if root is None or root.stone != stone:
+            root = Node(None, None, stone, board.hash)
+        root.parent = None
+        self.root = root
+        if self.workers > 1:
+            self._parallel_search(board, root)
+        else:
+            self.search(board, root)
+        if not root.children:
+            all_turns = turn_steps(board, stone)
+            return {steps: (0, 0.0) for steps in all_turns}
+        return {child.steps: (child.visits, child.wins) for child in root.children}
+
+    def _parallel_search(self, board, root):
+        """
+        searches the tree in this process while worker processes search
+        independent trees, then adds their root statistics to the tree.
+        Workers end at the same deadline and when stop_event is set. Jobs are
+        pickled in background thread while this process searches, so every job
+        gets its own copy of the board
+        """
+        if self._executor is None:
+            self._stop = multiprocessing.Event()
+            self._executor = ProcessPoolExecutor(self.workers - 1, initializer=_start_worker,
+                                                 initargs=(self._stop,))
+        self._stop.clear()
+        playouts = self.playouts and -(-self.playouts // self.workers)
+        seed = self.rng.randrange(1 << 30)
+        futures = [self._executor.submit(_worker_statistics, (board.copy(), root.stone, playouts, self.max_time,
+                                                              self.exploration, self.max_turns, seed + worker))
+                   for worker in range(self.workers - 1)]
+        total = self.playouts
+        self.playouts = playouts
+        try:
+            self.search(board, root)
+        finally:
+            self.playouts = total
+        nodes = self.nodes
+        while wait(futures, timeout=0.05).not_done:
+            if self.stop_event is not None and self.stop_event.is_set():
+                self._stop.set()
+        for future in futures:
+            statistics, worker_nodes = future.result()
+            nodes += worker_nodes
+            self._merge(board, root, statistics)
+        self.nodes = nodes
+
+    def _merge(self, board, root, statistics):
+        """
+        adds visits and wins of root turns searched in worker process to the tree,
+        turns which are not in the tree yet get their nodes
+        """
+        children = {child.steps: child for child in root.children}
+        for steps, (visits, wins) in statistics.items():
+            if not visits:
+                continue
+            child = children.get(steps)
+            if child is None:
+                if root.untried is None:
+                    root.untried = turn_steps(board, root.stone)
+                    self.rng.shuffle(root.untried)
+                if steps not in root.untried:
+                    continue
+                root.untried.remove(steps)
+                records = play_turn(board, steps)
+                child = Node(root, steps, opponent_of(root.stone), board.hash)
+                undo_turn(board, records)
+                root.children.append(child)
+                children[steps] = child
+            child.visits += visits
+            child.wins += wins
+            root.visits += visits
+            root.wins += visits - wins
+
+    def close(self):
+        """
+        stops worker processes, they are started again by the next search
+        """
+        if self._executor is not None:
+            self._stop.set()
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._stop = None
+
+    def search(self, board, root):
+        """
+        makes playouts from the root till budget is used up
+
+        Parameters
+        ----------
+        board : Board
+            position of the root, it is restored after every playout
+        root : Node
+
+        Returns
+        -------
+        None
+        """
+        self.nodes = 0
+        deadline = None if self.max_time is None else time.perf_counter() + self.max_time
+        while self.playouts is None or self.nodes < self.playouts:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if self.stop_event is not None and self.stop_event.is_set():
+                break
+            if not self.iterate(board, root):
+                break
+            self.nodes += 1
+
+    def iterate(self, board, root):
+        """
+        selects leaf with UCT, adds its child, plays random playout from it
+        and adds result to all nodes on the path
+
+        Parameters
+        ----------
+        board : Board
+        root : Node
+
+        Returns
+        -------
+        bool
+            False if the root has no turns
+        """
+        node = root
+        records = []
+        while node.untried == [] and node.children:
+            node = node.select(self.exploration)
+            records.append(play_turn(board, node.steps))
+        if node.untried is None:
+            node.untried = turn_steps(board, node.stone)
+            self.rng.shuffle(node.untried)
+            if not node.untried and node is root:
+                return False
+        if node.untried:
+            steps = node.untried.pop()
+            records.append(play_turn(board, steps))
+            child = Node(node, steps, opponent_of(node.stone), board.hash)
+            node.children.append(child)
+            node = child
+        if node.untried == [] and not node.children:
+            winner = opponent_of(node.stone)
+        else:
+            winner = random_playout(board, node.stone, self.rng, self.max_turns)
+        for turn_records in reversed(records):
+            undo_turn(board, turn_records)
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner != node.stone:
+                node.wins += 1
+            node = node.parent
+        return True
+
+
+_stop = None
+
+
+def _start_worker(stop):
+    """
+    saves event which ends searches of worker process
+    """
+    global _stop
+    _stop = stop
+
+
+def _worker_statistics(job):
+    """
+    searches one tree in worker process and returns its root statistics
+    """
+    board, stone, playouts, max_time, exploration, max_turns, seed = job
+    search = MCTS(playouts, max_time, exploration, max_turns, 1, seed)
+    search.stop_event = _stop
+    return search.statistics(board, stone), search.nodes
@@ -0,0 +1,225 @@
+class Move(tuple):
+    """
+    A class to represent move (r1, c1, r2, c2), immutable tuple without instance
+    dictionary. Every move of a board size is created once by Geometry and
+    the same objects are returned by move generation, so generating moves does
+    not allocate them. Move is equal to a plain tuple with the same places.
+
+    ...
+
+    Attributes
+    ----------
+    r1, c1 : int
+        place from which stone goes
+    r2, c2 : int
+        place where stone goes
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, r1, c1, r2, c2):
+        return tuple.__new__(cls, (r1, c1, r2, c2))
+
+    @property
+    def r1(self):
+        return self[0]
+
+    @property
+    def c1(self):
+        return self[1]
+
+    @property
+    def r2(self):
+        return self[2]
+
+    @property
+    def c2(self):
+        return self[3]
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+
+class CaptureResult():
+    """
+    A class to represent stones captured by move. Captured stones are always
+    the first stones of approach ray and of withdrawal ray of the move, so only
+    rays shared by all boards of the same size and two numbers are kept.
+    For old callers it behaves like tuple with list of approach captured stones
+    and list of withdrawal captured stones.
+
+    ...
+
+    Attributes
+    ----------
+    rays : tuple
+        approach ray and withdrawal ray of the move from Geometry
+    approach : int
+        number of stones captured by approach
+    withdrawal : int
+        number of stones captured by withdrawal
+
+    Methods
+    -------
+    count(capture):
+        returns number of stones captured by approach (0) or withdrawal (1)
+    stones(capture):
+        returns places captured by approach (0) or withdrawal (1)
+    """
+
+    __slots__ = ('rays', 'approach', 'withdrawal')
+
+    def __init__(self, rays, approach, withdrawal):
+        self.rays = rays
+        self.approach = approach
+        self.withdrawal = withdrawal
+
+    def count(self, capture):
+        """
+        returns number of stones captured by approach (0) or withdrawal (1)
+        """
+        return self.withdrawal if capture else self.approach
+
+    def stones(self, capture):
+        """
+        returns tuple of places captured by approach (0) or withdrawal (1)
+        """
+        return self.rays[capture][:self.count(capture)]
+
+    def __getitem__(self, capture):
+        capture = (0, 1)[capture]
+        return list(self.stones(capture))
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        yield self[0]
+        yield self[1]
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+NO_CAPTURE = CaptureResult(((), ()), 0, 0)
+
+
+class Chain():
+    """
+    A class to represent state of capture chain: place of capturing stone,
+    places it has visited and direction of its last step. Visited places are
+    bits of one int, so checking whether stone can go to a place is O(1)
+    and next state is made without copying lists. For old callers it behaves
+    like collection of forbidden places: visited places and the next place
+    in the last direction.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        number of columns of the board
+    position : (r, c) or None
+        place of stone which is capturing
+    visited : int
+        bit r*columns + c is set if stone has been on place (r, c)
+    direction : (dr, dc) or None
+        direction of the last step
+
+    Methods
+    -------
+    from_places(columns, position, forbidden_moves):
+        returns chain with given forbidden places
+    step(move):
+        returns chain after capturing move
+    forbids(r, c):
+        returns True if stone cannot go to (r, c)
+    """
+
+    __slots__ = ('columns', 'position', 'visited', 'direction')
+
+    def __init__(self, columns, position=None, visited=0, direction=None):
+        self.columns = columns
+        self.position = position
+        self.visited = visited
+        self.direction = direction
+
+    @classmethod
+    def from_places(cls, columns, position, forbidden_moves):
+        """
+        returns chain from list of forbidden places in which the last place
+        is the next place in the last direction, the same as Player.make_turn makes it
+
+        Parameters
+        ----------
+        columns : int
+        position : (r, c) or None
+        forbidden_moves : list
+
+        Returns
+        -------
+        Chain
+        """
+        forbidden_moves = list(forbidden_moves)
+        direction = None
+        if position is not None and forbidden_moves:
+            r, c = forbidden_moves.pop()
+            direction = (r - position[0], c - position[1])
+        visited = 0
+        for r, c in forbidden_moves:
+            visited |= 1 << (r*columns + c)
+        return cls(columns, position, visited, direction)
+
+    def step(self, move):
+        """
+        returns chain after capturing move, this chain is not changed
+
+        Parameters
+        ----------
+        move : (r1, c1, r2, c2)
+
+        Returns
+        -------
+        Chain
+        """
+        r1, c1, r2, c2 = move
+        return Chain(self.columns, (r2, c2), self.visited | 1 << (r1*self.columns + c1), (r2 - r1, c2 - c1))
+
+    def forbids(self, r, c):
+        """
+        returns True if stone cannot go to (r, c): it has been there
+        or it would go in the same direction again
+        """
+        if self.direction is not None and (r - self.position[0], c - self.position[1]) == self.direction:
+            return True
+        if r < 0 or not 0 <= c < self.columns:
+            return False
+        return bool(self.visited >> (r*self.columns + c) & 1)
+
+    def __contains__(self, place):
+        return self.forbids(place[0], place[1])
+
+    def __iter__(self):
+        visited = self.visited
+        index = 0
+        while visited:
+            if visited & 1:
+                yield divmod(index, self.columns)
+            visited >>= 1
+            index += 1
+        if self.direction is not None:
+            yield (self.position[0] + self.direction[0], self.position[1] + self.direction[1])
+
+    def __len__(self):
+        return bin(self.visited).count('1') + (self.direction is not None)
+
+    def __repr__(self):
+        return f'Chain({self.position}, {tuple(self)})'
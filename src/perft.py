@@ -0,0 +1,117 @@
+import argparse
+import time
+try:
+    from .board import Board
+    from .bitboard import BitBoard
+    from .engine import turn_steps, play_turn, undo_turn
+except ImportError:
+    from board import Board
+    from bitboard import BitBoard
+    from engine import turn_steps, play_turn, undo_turn
+
+
+BACKENDS = {'board': Board, 'bitboard': BitBoard}
+
+
+def perft(board, depth):
+    """
+    returns number of positions reached after depth full turns from board,
+    player who moves is board.stone_turn. Finished games are not counted.
+
+    Parameters
+    ----------
+    board : Board
+        it is changed during counting and restored at the end
+    depth : int
+        number of turns
+
+    Returns
+    -------
+    int
+    """
+    if depth == 0:
+        return 1
+    all_turns = turn_steps(board, board.stone_turn)
+    if depth == 1:
+        return len(all_turns)
+    nodes = 0
+    for steps in all_turns:
+        records = play_turn(board, steps)
+        nodes += perft(board, depth - 1)
+        undo_turn(board, records)
+    return nodes
+
+
+def divide(board, depth):
+    """
+    returns number of positions after every first turn
+
+    Parameters
+    ----------
+    board : Board
+    depth : int
+        number of turns, at least 1
+
+    Returns
+    -------
+    dict
+        divide[steps] - number of positions after turn
+    """
+    counts = {}
+    for steps in turn_steps(board, board.stone_turn):
+        records = play_turn(board, steps)
+        counts[steps] = perft(board, depth - 1)
+        undo_turn(board, records)
+    return counts
+
+
+def start_board(rows, columns, backend='board'):
+    """
+    returns new board of chosen backend with starting stones
+    """
+    return BACKENDS[backend](rows, columns)
+
+
+def run(rows, columns, depth, backend='board'):
+    """
+    counts positions for every depth up to given one
+
+    Returns
+    -------
+    list of tuples (depth, nodes, seconds, nodes per second)
+    """
+    results = []
+    for current_depth in range(1, depth + 1):
+        board = start_board(rows, columns, backend)
+        start = time.perf_counter()
+        nodes = perft(board, current_depth)
+        seconds = time.perf_counter() - start
+        results.append((current_depth, nodes, seconds, nodes / seconds if seconds else 0.0))
+    return results
+
+
+def main():
+    """
+    prints perft counts and speed for board and depth given in command line
+    """
+    parser = argparse.ArgumentParser(description='Fanorona move generation counts')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('columns', type=int)
+    parser.add_argument('depth', type=int)
+    parser.add_argument('--backend', default='board', choices=sorted(BACKENDS))
+    parser.add_argument('--divide', action='store_true')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='find capturing moves of Board with numpy')
+    args = parser.parse_args()
+    Board.vectorized = args.vectorized
+    if args.divide:
+        board = start_board(args.rows, args.columns, args.backend)
+        for steps, nodes in divide(board, args.depth).items():
+            print(steps, nodes)
+        return
+    for depth, nodes, seconds, speed in run(args.rows, args.columns, args.depth, args.backend):
+        print(f'depth {depth}: {nodes} nodes, {seconds:.3f} s, {speed:.0f} nodes/s')
+
+
+if __name__ == '__main__':
+    main()
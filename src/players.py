@@ -1,11 +1,22 @@
 import pygame
 import sys
 from random import choice
-
-
-class Player():
+try:
+    from .engine import Agent
+    from .search import AlphaBeta
+    from .mcts import MCTS
+    from .moves import Chain
+except ImportError:
+    from engine import Agent
+    from search import AlphaBeta
+    from mcts import MCTS
+    from moves import Chain
+
+
+class Player(Agent):
     """
     A class to represent a player. Parent class of HumanPlayer and Computer classes.
+    As an Agent it gives decisions to headless GameState.
 
     ...
 
@@ -17,6 +28,8 @@ class Player():
     opponent_stone: int
         1 - white
         2 - black
+    recorder : GameWriter or None
+        every turn made by make_turn is written to it
 
     Methods
     -------
@@ -34,6 +47,8 @@ class Player():
         returns True if there is possible next turn
     make_turn(board):
         makes turns until there are no capturing moves
+    choose_capture(state, move, captured_stones):
+        returns which stones to capture
     """
 
     def __init__(self, stone):
@@ -47,6 +62,8 @@ class Player():
         """
         self._stone = stone
         self._opponent_stone = 1 if self._stone == 2 else 2
+        self.recorder = None
+        self._steps = []
 
     def stone(self):
         """
@@ -83,10 +100,8 @@ class Player():
         -------
         None
         """
-        r1, c1, r, c = move
-        chosen_stone = (r1, c1)
-        board.matrix[chosen_stone[0]][chosen_stone[1]] = 0
-        board.matrix[r][c] = self.stone()
+        board.move_stone(move)
+        self._steps.append((tuple(move), None))
         return
 
     def capturing_move(self, board, move):
@@ -107,27 +122,24 @@ class Player():
         move : (r, c, r1, r2)
 
         """
-        stone = self.stone()
         opponent_stone = self.opponent_stone()
         r1, c1, r, c = move
-        chosen_stone = (r1, c1)
-        board.matrix[chosen_stone[0]][chosen_stone[1]] = 0
-        board.matrix[r][c] = stone
+        board.move_stone(move)
         captured_stones = board.captured_stones(
             opponent_stone, move)
         if len(captured_stones[0]) != 0 and len(captured_stones[1]) != 0:
             self.choose_which_to_capture(board, captured_stones)
+            r2, c2 = captured_stones[0][0]
+            self._steps.append((tuple(move), 0 if board.matrix[r2][c2] == 0 else 1))
             return (r, c, r1, c1)
 
         elif len(captured_stones[0]) != 0:
-            for captured_stone in captured_stones[0]:
-                board.matrix[captured_stone[0]
-                             ][captured_stone[1]] = 0
+            board.remove_stones(captured_stones[0])
+            self._steps.append((tuple(move), 0))
             return (r, c, r1, c1)
         elif len(captured_stones[1]) != 0:
-            for captured_stone in captured_stones[1]:
-                board.matrix[captured_stone[0]
-                             ][captured_stone[1]] = 0
+            board.remove_stones(captured_stones[1])
+            self._steps.append((tuple(move), 1))
             return (r, c, r1, c1)
 
     def is_next_turn(self, board, r, c, forbidden_moves):
@@ -141,8 +153,8 @@ class Player():
             stone's row
         c : int
             stone's column
-        forbidden_moves : list
-            list of places where stone cannot go
+        forbidden_moves : Chain or list
+            places where stone cannot go
         Returns
         -------
         bool
@@ -151,19 +163,16 @@ class Player():
 
         captured_stones = []
         for move in board.capturing_moves(self.stone(), self.opponent_stone()):
-            is_move_available = True
-            for forbidden_move in forbidden_moves:
-                if move[2] == forbidden_move[0] and move[3] == forbidden_move[1]:
-                    is_move_available = False
-            if is_move_available and move[0] == r and move[1] == c:
-                captured_stones = captured_stones + board.captured_stones(self.opponent_stone(), move)[0]\
-                    + board.captured_stones(self.opponent_stone(), move)[1]
+            if move[0] == r and move[1] == c and (move[2], move[3]) not in forbidden_moves:
+                captured = board.captured_stones(self.opponent_stone(), move)
+                captured_stones.extend(captured.stones(0))
+                captured_stones.extend(captured.stones(1))
         return captured_stones
 
     def make_turn(self, board):
         """
-        makes first move, adds forbidden moves to list and checks if next move is possible,
-        it makes next turns until it is impossible
+        makes first move, adds it to capture chain and checks if next move is possible,
+        it makes next turns until it is impossible. The turn is written to recorder.
 
         Parameters
         ----------
@@ -174,28 +183,44 @@ class Player():
         None
         """
 
+        self._steps = []
         next_turn_moves = self.first_move(board)
-        forbidden_moves = []
+        chain = Chain(board.columns)
         board.draw_board()
         while next_turn_moves:
-            r = next_turn_moves[0]
-            c = next_turn_moves[1]
-            forbidden_moves.append(
-                (next_turn_moves[2], next_turn_moves[3]))
-            diff_r = r - next_turn_moves[2]
-            diff_c = c - next_turn_moves[3]
-            forbidden_moves.append((r + diff_r, c + diff_c))
+            r, c, r1, c1 = next_turn_moves
+            chain = chain.step((r1, c1, r, c))
+            board.set_chain((r, c), chain)
             captured_stones = self.is_next_turn(
-                board, r, c, forbidden_moves)
+                board, r, c, chain)
             if bool(len(captured_stones)):
                 board.light_up_chosen_stone([(r, c)])
                 board.light_up_stones_to_capture(captured_stones)
                 next_turn_moves = self.next_turn(
-                    board, (r, c), forbidden_moves)
-                forbidden_moves.pop()
+                    board, (r, c), chain)
                 board.draw_board()
             else:
-                return
+                break
+        board.end_turn()
+        if self.recorder is not None and self._steps:
+            self.recorder.turn(self._steps)
+
+    def choose_capture(self, state, move, captured_stones):
+        """
+        returns which stones to capture when move captures by approach and by withdrawal
+
+        Parameters
+        ----------
+        state : GameState
+        move : (r1, c1, r2, c2)
+        captured_stones : tuple
+            lists of approaching and withdrawal captured stones
+
+        Returns
+        -------
+        0 - approach or 1 - withdrawal
+        """
+        return self.which_to_capture(state.board, captured_stones)
 
 
 class HumanPlayer(Player):
@@ -210,6 +235,20 @@ class HumanPlayer(Player):
         returns position of the stone if clicked on it
     choose_which_to_capture(board, captured_stones):
         captures chosen stones
+    which_to_capture(board, captured_stones):
+        returns capture chosen by click
+    start_capture(board, captured_stones):
+        lights up stones which can be captured
+    click_capture(captured_stones, r, c):
+        returns capture chosen by click on place (r, c) or None
+    choose_move(state, moves):
+        returns move chosen by clicks
+    start_move(state, moves):
+        lights up stones which can move
+    click_move(state, r, c):
+        returns move chosen by click on place (r, c) or None
+    light_up_moves(board, chosen_stone, moves):
+        lights up chosen stone and stones it can capture
     first_move(board):
         start of turn, makes paika move or capturing move dependent of the next click
     next_turn( board, chosen_stone, forbidden_moves):
@@ -227,6 +266,8 @@ class HumanPlayer(Player):
             1 or 2
         """
         super().__init__(stone)
+        self._moves = []
+        self._chosen_stone = None
 
     def choose_stone(self, board):
         """
@@ -243,12 +284,12 @@ class HumanPlayer(Player):
         """
         chosen_position = None
         while not chosen_position:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    chosen_position = board.chosen_position(
-                        event.pos[0], event.pos[1])
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                sys.exit()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                chosen_position = board.chosen_position(
+                    event.pos[0], event.pos[1])
         return chosen_position
 
     def choose_which_to_capture(self, board, captured_stones):
@@ -267,19 +308,160 @@ class HumanPlayer(Player):
         -------
         None
 
+        """
+        board.remove_stones(captured_stones[self.which_to_capture(board, captured_stones)])
+
+    def which_to_capture(self, board, captured_stones):
+        """
+        lights up stones which can be captured and waits till player clicks one of them
+
+        Parameters
+        ----------
+        board : Board
+        captured_stones : list
+            tuple with lists of approaching and withdrawal captured stones
+
+        Returns
+        -------
+        0 - approach or 1 - withdrawal
+        """
+        self.start_capture(board, captured_stones)
+        capture = None
+        while capture is None:
+            r, c = self.choose_stone(board)
+            capture = self.click_capture(captured_stones, r, c)
+        return capture
+
+    def start_capture(self, board, captured_stones):
+        """
+        lights up stones which can be captured, next clicks are given to click_capture
+
+        Parameters
+        ----------
+        board : Board
+        captured_stones : list
+            tuple with lists of approaching and withdrawal captured stones
+
+        Returns
+        -------
+        None
         """
         board.draw_board()
         board.light_up_stones_to_capture(captured_stones[0])
         board.light_up_stones_to_capture(captured_stones[1])
-        r, c = self.choose_stone(board)
-        while (r, c) not in captured_stones[0]+captured_stones[1]:
-            r, c = self.choose_stone(board)
+
+    def click_capture(self, captured_stones, r, c):
+        """
+        returns capture chosen by click on place (r, c)
+
+        Parameters
+        ----------
+        captured_stones : list
+            tuple with lists of approaching and withdrawal captured stones
+        r, c : int
+            clicked place
+
+        Returns
+        -------
+        0 - approach, 1 - withdrawal or None if clicked stone cannot be captured
+        """
         if (r, c) in captured_stones[0]:
-            index = 0
+            return 0
+        if (r, c) in captured_stones[1]:
+            return 1
+        return None
+
+    def choose_move(self, state, moves):
+        """
+        lights up stones which can move and waits till player clicks
+        one of them and then a place where it can go
+
+        Parameters
+        ----------
+        state : GameState
+        moves : list
+            legal moves
+
+        Returns
+        -------
+        move : (r1, c1, r2, c2)
+        """
+        self.start_move(state, moves)
+        move = None
+        while move is None:
+            r, c = self.choose_stone(state.board)
+            move = self.click_move(state, r, c)
+        return move
+
+    def start_move(self, state, moves):
+        """
+        lights up stones which can move or, in capture chain, the capturing stone,
+        next clicks are given to click_move
+
+        Parameters
+        ----------
+        state : GameState
+        moves : list
+            legal moves
+
+        Returns
+        -------
+        None
+        """
+        board = state.board
+        self._moves = moves
+        self._chosen_stone = board.last_position
+        if self._chosen_stone is None:
+            board.light_up_chosen_stone(list(dict.fromkeys((move[0], move[1]) for move in moves)))
         else:
-            index = 1
-        for captured_stone in captured_stones[index]:
-            board.matrix[captured_stone[0]][captured_stone[1]] = 0
+            self.light_up_moves(board, self._chosen_stone, moves)
+
+    def click_move(self, state, r, c):
+        """
+        chooses stone or place where chosen stone goes
+
+        Parameters
+        ----------
+        state : GameState
+        r, c : int
+            clicked place
+
+        Returns
+        -------
+        move : (r1, c1, r2, c2) or None if move is not chosen yet
+        """
+        board = state.board
+        moves = self._moves
+        chosen_stone = self._chosen_stone
+        if board.last_position is None and any(move[0] == r and move[1] == c for move in moves):
+            self._chosen_stone = (r, c)
+            self.light_up_moves(board, self._chosen_stone, moves)
+        elif chosen_stone and (chosen_stone[0], chosen_stone[1], r, c) in moves:
+            return (chosen_stone[0], chosen_stone[1], r, c)
+        return None
+
+    def light_up_moves(self, board, chosen_stone, moves):
+        """
+        lights up chosen stone and stones it can capture
+
+        Parameters
+        ----------
+        board : Board
+        chosen_stone : (r, c)
+        moves : list
+            legal moves
+
+        Returns
+        -------
+        None
+        """
+        board.light_up_chosen_stone([chosen_stone])
+        captured_stones = []
+        for move in moves:
+            if move[0] == chosen_stone[0] and move[1] == chosen_stone[1]:
+                approach, withdrawal = board.captured_stones(self.opponent_stone(), move)
+                captured_stones = captured_stones + approach + withdrawal
+        board.light_up_stones_to_capture(captured_stones)
 
     def first_move(self, board):
         """
@@ -329,8 +511,8 @@ class HumanPlayer(Player):
         ----------
         board : Board
         chosen stone : (r, c)
-        forbidden_moves : list
-            a list of places that where stone cannot move
+        forbidden_moves : Chain or list
+            places where stone cannot move
 
         Returns
         -------
@@ -352,11 +534,17 @@ class Computer(Player):
     Attributes
     ----------
     level : str
-        "Easy" or "Hard"
+        "Easy", "Hard", "Expert" or "MCTS"
+    search : AlphaBeta, MCTS or None
+        search engine used by "Expert" or "MCTS" level
+    tablebase : Tablebase or None
+        solved endgames, in covered positions the perfect turn is played without search
+    book : OpeningBook or None
+        analysed openings, turns from book are played without search
 
     Methods
     -------
-    __init__(stone, level):
+    __init__(stone, level, depth, max_nodes, max_time, evaluation, playouts, workers):
         creates player
     level():
         returns computer's level
@@ -364,8 +552,16 @@ class Computer(Player):
         draws or choose the best move and makes capturing move
     choose_which_to_capture(board, captured_stones):
         captures chosen stones
+    which_to_capture(board, captured_stones):
+        returns which stones to capture
+    choose_move(state, moves):
+        draws or choose the best move
     first_move(board):
         draws or choose the best move and makes possible move
+    planned_turn(board):
+        returns turn from opening book, tablebase or search
+    planned_move(board):
+        makes next move of the turn found by search
     best_drawing(board):
         returns best move
     best_next_drawing(board, r, c):
@@ -373,7 +569,8 @@ class Computer(Player):
 
     """
 
-    def __init__(self, stone, level):
+    def __init__(self, stone, level, depth=3, max_nodes=20000, max_time=2.0, evaluation=None,
+                 playouts=2000, workers=1, tablebase=None, book=None):
         """
         Creates computer player with its level
 
@@ -382,10 +579,35 @@ class Computer(Player):
         stone : int
             1 or 2
         level : str
-            "Easy" or "Hard"
+            "Easy", "Hard", "Expert" or "MCTS"
+        depth : int
+            number of turns searched by "Expert" level
+        max_nodes : int or None
+            maximal number of positions searched by "Expert" level per turn
+        max_time : float or None
+            maximal time in seconds of "Expert" or "MCTS" level search per turn
+        evaluation : Evaluation or None
+            evaluation used by "Expert" level search
+        playouts : int or None
+            number of random games played by "MCTS" level per turn
+        workers : int
+            number of processes of "MCTS" level
+        tablebase : Tablebase or None
+            solved endgames probed before "Hard", "Expert" or "MCTS" level thinks
+        book : OpeningBook or None
+            opening book read before "Hard", "Expert" or "MCTS" level thinks
         """
         super().__init__(stone)
         self._level = level
+        self.search = None
+        self.tablebase = tablebase if level != 'Easy' else None
+        self.book = book if level != 'Easy' else None
+        self._planned_steps = []
+        self._planned_capture = None
+        if level == 'Expert':
+            self.search = AlphaBeta(depth, evaluation, max_nodes, max_time)
+        elif level == 'MCTS':
+            self.search = MCTS(playouts, max_time, workers=workers)
 
     def level(self):
         """
@@ -407,8 +629,8 @@ class Computer(Player):
         ----------
         board : Board
         chosen stone : (r, c)
-        forbidden_moves : list
-            a list of places that where stone cannot move
+        forbidden_moves : Chain or list
+            places where stone cannot move
 
         Returns
         -------
@@ -418,6 +640,8 @@ class Computer(Player):
         pygame.time.delay(1800)
         stone = self.stone()
         opponent_stone = self.opponent_stone()
+        if self._planned_steps:
+            return self.planned_move(board)
         if self.level() == 'Easy':
             drawing_move = choice(board.capturing_moves(stone, opponent_stone))
         else:
@@ -450,6 +674,25 @@ class Computer(Player):
         None
 
         """
+        board.remove_stones(captured_stones[self.which_to_capture(board, captured_stones)])
+
+    def which_to_capture(self, board, captured_stones):
+        """
+        returns capture planned by search, random capture if level is easy
+        or capture of more stones if level is hard
+
+        Parameters
+        ----------
+        board : Board
+        captured_stones : list
+            tuple with lists of approaching and withdrawal captured stones
+
+        Returns
+        -------
+        0 - approach or 1 - withdrawal
+        """
+        if self._planned_capture is not None:
+            return self._planned_capture
         if self.level() == 'Easy' or len(captured_stones[0]) == len(captured_stones[1]):
             (r, c) = choice(captured_stones[0] + captured_stones[1])
         else:
@@ -457,11 +700,44 @@ class Computer(Player):
                 captured_stones[1]) else 1
             (r, c) = choice(captured_stones[index])
         if (r, c) in captured_stones[0]:
-            index = 0
+            return 0
+        return 1
+
+    def choose_move(self, state, moves):
+        """
+        returns move planned by search if level is expert, random move if level is easy
+        or the best move if level is hard
+
+        Parameters
+        ----------
+        state : GameState
+        moves : list
+            legal moves
+
+        Returns
+        -------
+        move : (r1, c1, r2, c2)
+        """
+        board = state.board
+        self._planned_capture = None
+        if self.search or self.tablebase or self.book:
+            if board.last_position is None:
+                self._planned_steps = self.planned_turn(board)
+            if self._planned_steps:
+                move, self._planned_capture = self._planned_steps.pop(0)
+                if move in moves:
+                    return move
+                self._planned_steps = []
+                self._planned_capture = None
+        is_capture = any(state.capture_options(moves[0]))
+        if self.level() == 'Easy' or not is_capture:
+            return choice(moves)
+        if board.last_position is None:
+            move = self.best_drawing(board)
         else:
-            index = 1
-        for captured_stone in captured_stones[index]:
-            board.matrix[captured_stone[0]][captured_stone[1]] = 0
+            r, c = board.last_position
+            move = self.best_next_drawing(board, r, c, board.chain)
+        return move if move in moves else choice(moves)
 
     def first_move(self, board):
         """
@@ -480,6 +756,10 @@ class Computer(Player):
         pygame.time.delay(1000)
         stone = self.stone()
         opponent_stone = self.opponent_stone()
+        if self.search or self.tablebase or self.book:
+            self._planned_steps = self.planned_turn(board)
+            if self._planned_steps:
+                return self.planned_move(board)
         if len(board.capturing_moves(stone, opponent_stone)) == 0:
             drawing_move = choice(board.possible_moves(stone))
             self.paika_move(board, drawing_move)
@@ -491,6 +771,52 @@ class Computer(Player):
                 drawing_move = self.best_drawing(board)
             return self.capturing_move(board, drawing_move)
 
+    def planned_turn(self, board):
+        """
+        returns steps of turn: turn from opening book, perfect turn if position
+        is in tablebase, otherwise turn found by search
+
+        Parameters
+        ----------
+        board : Board
+
+        Returns
+        -------
+        list of steps (move, capture), empty if nothing was found
+        """
+        steps = None
+        if self.book is not None:
+            steps = self.book.best_turn(board, self.stone())
+        if steps is None and self.tablebase is not None:
+            steps = self.tablebase.best_turn(board, self.stone())
+        if steps is None and self.search:
+            steps = self.search.best_turn(board, self.stone())
+        return list(steps or [])
+
+    def planned_move(self, board):
+        """
+        makes next move of the turn found by search
+
+        Parameters
+        ----------
+        board : Board
+
+        Returns
+        -------
+        move : (r, c, r1, r2)
+        None
+            if it was paika move
+        """
+        move, capture = self._planned_steps.pop(0)
+        if capture is None:
+            self.paika_move(board, move)
+            return
+        self._planned_capture = capture
+        try:
+            return self.capturing_move(board, move)
+        finally:
+            self._planned_capture = None
+
     def best_drawing(self, board):
         """
         from capturing moves it returns move that lead to next move
@@ -510,16 +836,15 @@ class Computer(Player):
         next_moves = []
         best_capture = []
         for move in capturing_moves:
-            best_capture.append(
-                len(board.captured_stones(opponent_stone, move)[0]))
-            best_capture.append(
-                len(board.captured_stones(opponent_stone, move)[1]))
+            captured = board.captured_stones(opponent_stone, move)
+            best_capture.append(captured.approach)
+            best_capture.append(captured.withdrawal)
             for empty in board.empty_places(move[2], move[3]):
                 empty_r = empty[0]
                 empty_c = empty[1]
                 future_move = (move[2], move[3], empty_r, empty_c)
-                if len(board.captured_stones(opponent_stone, future_move)[0]) != 0 or\
-                        len(board.captured_stones(opponent_stone, future_move)[1]) != 0:
+                future = board.captured_stones(opponent_stone, future_move)
+                if future.approach or future.withdrawal:
 
                     next_moves.append(move)
         if len(next_moves) > 0:
@@ -529,7 +854,7 @@ class Computer(Player):
         index = choice(indices)
         return capturing_moves[index//2]
 
-    def best_next_drawing(self, board, r, c, forbidden_moves):
+    def best_next_drawing(self, board, r, c, forbidden_moves=()):
         """
         from capturing moves it returns move that lead to next move
         if it is impossible it returns move that captures the most stones
@@ -540,7 +865,8 @@ class Computer(Player):
         r : int,
         c : int,
             position of last moven stone
-        forbidden_moves : list of tuples
+        forbidden_moves : Chain or list of tuples
+            places where stone cannot go, nothing is forbidden by default
 
         Returns
         -------
@@ -553,17 +879,16 @@ class Computer(Player):
         capturing_moves_for_stone = []
         for move in board.capturing_moves(stone, opponent_stone):
             if move[0] == r and move[1] == c:
-                best_capture.append(
-                    len(board.captured_stones(opponent_stone, move)[0]))
-                best_capture.append(
-                    len(board.captured_stones(opponent_stone, move)[1]))
+                captured = board.captured_stones(opponent_stone, move)
+                best_capture.append(captured.approach)
+                best_capture.append(captured.withdrawal)
                 for empty in board.empty_places(move[2], move[3]):
                     empty_r = empty[0]
                     empty_c = empty[1]
                     if (empty_r, empty_c) not in forbidden_moves:
                         future_move = (move[2], move[3], empty_r, empty_c)
-                        if len(board.captured_stones(opponent_stone, future_move)[0]) != 0 or\
-                                len(board.captured_stones(opponent_stone, future_move)[1]) != 0:
+                        future = board.captured_stones(opponent_stone, future_move)
+                        if future.approach or future.withdrawal:
                             next_moves.append(move)
                 capturing_moves_for_stone.append(move)
         if len(next_moves) > 0:
@@ -0,0 +1,313 @@
+import os
+try:
+    from .board import Board
+    from .engine import play_turn
+except ImportError:
+    from board import Board
+    from engine import play_turn
+
+
+COLUMNS = 'abcdefghi'
+APPROACH = 'A'
+WITHDRAWAL = 'W'
+RESULTS = {1: '1-0', 2: '0-1', None: '1/2'}
+WINNERS = {text: winner for winner, text in RESULTS.items()}
+
+
+def place_name(r, c):
+    """
+    returns name of place: letter of column and number of row counted from 1
+    """
+    return f'{COLUMNS[c]}{r + 1}'
+
+
+PLACES = {place_name(r, c): (r, c) for r in range(9) for c in range(len(COLUMNS))}
+
+
+def parse_place(text):
+    """
+    returns place (r, c) from its name
+    """
+    return PLACES[text]
+
+
+def format_turn(steps):
+    """
+    returns notation of turn: place from which stone goes and every place
+    where it goes, captures are marked with A (approach) or W (withdrawal).
+    For example "c3d3" is paika move and "c3d3Ae4W" is capture chain.
+
+    Parameters
+    ----------
+    steps : tuple of (move, capture)
+
+    Returns
+    -------
+    str
+    """
+    r1, c1 = steps[0][0][:2]
+    text = [place_name(r1, c1)]
+    for (r1, c1, r2, c2), capture in steps:
+        text.append(place_name(r2, c2))
+        if capture is not None:
+            text.append(WITHDRAWAL if capture else APPROACH)
+    return ''.join(text)
+
+
+def parse_turn(text):
+    """
+    returns turn from its notation
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    tuple of (move, capture)
+    """
+    r1, c1 = parse_place(text[:2])
+    steps = []
+    index = 2
+    while index < len(text):
+        r2, c2 = parse_place(text[index:index + 2])
+        index += 2
+        capture = None
+        if index < len(text) and text[index] in (APPROACH, WITHDRAWAL):
+            capture = 1 if text[index] == WITHDRAWAL else 0
+            index += 1
+        steps.append(((r1, c1, r2, c2), capture))
+        r1, c1 = r2, c2
+    return tuple(steps)
+
+
+class GameRecord():
+    """
+    A class to represent recorded game.
+
+    ...
+
+    Attributes
+    ----------
+    rows : int
+    columns : int
+    turns : list
+        turns in order they were played, every turn is tuple of (move, capture)
+    winner : 1, 2 or None
+        None if it was a draw or the game was not finished
+    finished : bool
+        False if record ends before result
+
+    Methods
+    -------
+    parse(line):
+        returns game from its line
+    format():
+        returns line of game
+    """
+
+    def __init__(self, rows, columns, turns=None, winner=None, finished=True):
+        self.rows = rows
+        self.columns = columns
+        self.turns = turns if turns is not None else []
+        self.winner = winner
+        self.finished = finished
+
+    @classmethod
+    def parse(cls, line):
+        """
+        returns game from line "5x9 c3d3A ... 1-0", line without result
+        is game which was not finished
+
+        Parameters
+        ----------
+        line : str
+
+        Returns
+        -------
+        GameRecord
+        """
+        tokens = line.split()
+        rows, columns = (int(number) for number in tokens[0].split('x'))
+        finished = len(tokens) > 1 and tokens[-1] in WINNERS
+        winner = WINNERS[tokens[-1]] if finished else None
+        moves = tokens[1:-1] if finished else tokens[1:]
+        return cls(rows, columns, [parse_turn(text) for text in moves], winner, finished)
+
+    def format(self):
+        """
+        returns line of game without new line
+        """
+        tokens = [f'{self.rows}x{self.columns}'] + [format_turn(steps) for steps in self.turns]
+        if self.finished:
+            tokens.append(RESULTS[self.winner])
+        return ' '.join(tokens)
+
+    def __repr__(self):
+        return f'GameRecord({self.format()!r})'
+
+
+class GameWriter():
+    """
+    A class to write games to file while they are played. Every game is one
+    line, every turn is appended to it when it ends, so games are never kept
+    in memory and the file is only appended. File given by path can have
+    maximal size, when it is exceeded it is moved to path.1 and started again.
+
+    ...
+
+    Attributes
+    ----------
+    file : file object
+    games : int
+        number of finished games written by this writer
+    max_size : int or None
+        maximal size of file in bytes, None - no limit
+
+    Methods
+    -------
+    start(rows, columns):
+        starts line of new game
+    turn(steps):
+        appends turn to the game
+    end(winner):
+        appends result and ends line of the game
+    write(record):
+        writes whole game
+    close():
+        ends unfinished game and closes file
+    """
+
+    def __init__(self, file, max_size=None):
+        """
+        Opens writer.
+
+        Parameters
+        ----------
+        file : str or file object
+            path of file opened for appending or file opened for writing text
+        max_size : int or None
+            maximal size of file given by path in bytes, None - no limit
+        """
+        self._owned = isinstance(file, str)
+        self._path = file if self._owned else None
+        self.file = open(file, 'a') if self._owned else file
+        self.max_size = max_size
+        self.games = 0
+        self._playing = False
+
+    def start(self, rows, columns):
+        """
+        starts new game on board of given size, unfinished game is ended without result
+        """
+        if self._playing:
+            self.file.write('\n')
+        self.file.write(f'{rows}x{columns}')
+        self._playing = True
+
+    def turn(self, steps):
+        """
+        appends finished turn of current game
+
+        Parameters
+        ----------
+        steps : list or tuple of (move, capture)
+
+        Returns
+        -------
+        None
+        """
+        self.file.write(' ' + format_turn(steps))
+
+    def end(self, winner):
+        """
+        appends result of current game and ends its line
+
+        Parameters
+        ----------
+        winner : 1, 2 or None
+            None if it was a draw
+
+        Returns
+        -------
+        None
+        """
+        self.file.write(f' {RESULTS[winner]}\n')
+        self.file.flush()
+        self._playing = False
+        self.games += 1
+        if self._owned and self.max_size is not None and self.file.tell() > self.max_size:
+            self.file.close()
+            os.replace(self._path, self._path + '.1')
+            self.file = open(self._path, 'a')
+
+    def write(self, record):
+        """
+        writes whole finished game
+
+        Parameters
+        ----------
+        record : GameRecord
+
+        Returns
+        -------
+        None
+        """
+        self.start(record.rows, record.columns)
+        for steps in record.turns:
+            self.turn(steps)
+        self.end(record.winner)
+
+    def close(self):
+        """
+        ends line of unfinished game and closes file opened by writer
+        """
+        if self._playing:
+            self.file.write('\n')
+            self._playing = False
+        if self._owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+def read_games(file):
+    """
+    yields games one by one, only one line is read at a time
+
+    Parameters
+    ----------
+    file : str or file object
+        path of file or file opened for reading text
+
+    Yields
+    ------
+    GameRecord
+    """
+    if isinstance(file, str):
+        with open(file) as opened:
+            yield from read_games(opened)
+        return
+    for line in file:
+        if line.strip():
+            yield GameRecord.parse(line)
+
+
+def replay(record, board_class=Board):
+    """
+    yields board after every turn of the game, the same board is changed
+    by every turn, so nothing is copied
+
+    Parameters
+    ----------
+    record : GameRecord
+    board_class : Board or its child class
+
+    Yields
+    ------
+    (steps, board)
+    """
+    board = board_class(record.rows, record.columns).copy()
+    for steps in record.turns:
+        play_turn(board, steps)
+        yield steps, board
@@ -0,0 +1,380 @@
+import argparse
+import time
+import pygame
+import config
+
+
+def settings():
+    """
+    returns values from config used by sprites, sprites have to be drawn
+    again when they change
+    """
+    return (config.SQUARESIZE, config.BROWN, config.BLACK, config.RED,
+            config.WHITE, config.DARK_BROWN, config.YELLOW)
+
+
+class SpriteCache():
+    """
+    A class to keep pictures of stones, rims and board drawn once and blitted later.
+    Sprites of stones and rims are surfaces of one place with per-pixel alpha.
+
+    ...
+
+    Attributes
+    ----------
+    sprites : dict
+        sprites[(SQUARESIZE, colour, style)] - surface
+    settings : tuple
+        values from config used by sprites in cache
+    hits : int
+    misses : int
+
+    Methods
+    -------
+    sprite(colour, style):
+        returns sprite, draws it if it is not in cache
+    stone(stone):
+        returns sprite of white or black stone
+    captured():
+        returns sprite of red stone
+    rim():
+        returns sprite of yellow rim
+    board(rows, columns):
+        returns surface with board and its lines
+    check():
+        clears cache if values in config changed
+    """
+
+    def __init__(self):
+        self.sprites = {}
+        self.settings = None
+        self.hits = 0
+        self.misses = 0
+
+    def check(self):
+        """
+        clears cache if values in config changed since sprites were drawn
+
+        Returns
+        -------
+        bool
+            True if cache was cleared
+        """
+        current = settings()
+        if current == self.settings:
+            return False
+        self.sprites.clear()
+        self.settings = current
+        return True
+
+    def sprite(self, colour, style):
+        """
+        returns sprite, it is drawn only the first time
+
+        Parameters
+        ----------
+        colour : tuple
+        style : 'stone', 'rim' or ('board', rows, columns)
+
+        Returns
+        -------
+        Surface
+        """
+        self.check()
+        key = (config.SQUARESIZE, colour, style)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        sprite = _draw_sprite(colour, style)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha() if style in ('stone', 'rim') else sprite.convert()
+        self.sprites[key] = sprite
+        return sprite
+
+    def stone(self, stone):
+        """
+        returns sprite of stone, 1 - white, 2 - black
+        """
+        return self.sprite(config.WHITE if stone == 1 else config.BLACK, 'stone')
+
+    def captured(self):
+        """
+        returns sprite of stone which can be captured
+        """
+        return self.sprite(config.RED, 'stone')
+
+    def rim(self):
+        """
+        returns sprite of rim of chosen stone
+        """
+        return self.sprite(config.YELLOW, 'rim')
+
+    def board(self, rows, columns):
+        """
+        returns surface with board and its lines, without stones
+        """
+        return self.sprite(config.BROWN, ('board', rows, columns))
+
+
+def _draw_sprite(colour, style):
+    """
+    draws new sprite
+    """
+    size = config.SQUARESIZE
+    if style == 'stone':
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, colour, (size/2, size/2), size/3)
+        return sprite
+    if style == 'rim':
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, colour, (size/2, size/2), size*5/13, size//12)
+        return sprite
+    _, rows, columns = style
+    background = pygame.Surface((columns*size, rows*size))
+    background.fill(colour)
+    for r in range(rows):
+        for c in range(columns):
+            circle_pos_x = (c+0.5)*size
+            circle_pos_y = (r+0.5)*size
+            if c % 2 == 0 and r % 2 == 0 and r < rows-1:
+                if c > 0:
+                    pygame.draw.line(background, config.DARK_BROWN, (circle_pos_x, circle_pos_y), (
+                        circle_pos_x - 2*size, circle_pos_y+2*size), 5)
+                if c < columns-1:
+                    pygame.draw.line(background, config.DARK_BROWN, (circle_pos_x, circle_pos_y), (
+                        circle_pos_x + 2*size, circle_pos_y+2*size), 5)
+            if c == 0:
+                pygame.draw.line(background, config.DARK_BROWN, (circle_pos_x, circle_pos_y),
+                                 (circle_pos_x + (columns-1)*size, circle_pos_y), 5)
+            if r == 0:
+                pygame.draw.line(background, config.DARK_BROWN, (circle_pos_x, circle_pos_y),
+                                 (circle_pos_x, circle_pos_y + (rows-1)*size), 5)
+    return background
+
+
+sprites = SpriteCache()
+
+
+class Renderer():
+    """
+    A class to draw a board on a surface. Board with its lines is drawn once
+    on a cached surface, later only places which changed are drawn again and
+    screen is updated once with rectangles of these places.
+
+    ...
+
+    Attributes
+    ----------
+    board : Board
+    surface : Surface
+        screen or any other surface where board is drawn
+    sprites : SpriteCache
+        pictures of board, stones and rims
+    chosen : set
+        places with yellow rims
+    captured : set
+        places with red stones
+    dirty : list
+        rectangles drawn since last flush
+
+    Methods
+    -------
+    __init__(board, surface, sprites):
+        creates renderer
+    place_rect(r, c):
+        returns rectangle of place on surface
+    set_highlights(chosen, captured):
+        changes places with rims and red stones
+    draw():
+        draws places which changed
+    flush():
+        updates changed rectangles of screen
+    invalidate():
+        makes next draw draw the whole board
+    """
+
+    def __init__(self, board, surface, sprite_cache=None):
+        """
+        Creates renderer for board drawn on surface.
+
+        Parameters
+        ----------
+        board : Board
+        surface : Surface
+        sprite_cache : SpriteCache or None
+            cache shared by all renderers is used if it is not given
+        """
+        self.board = board
+        self.surface = surface
+        self.sprites = sprite_cache or sprites
+        self.chosen = set()
+        self.captured = set()
+        self.dirty = []
+        self._shown = {}
+        self._full = True
+        self._settings = None
+
+    def place_rect(self, r, c):
+        """
+        returns rectangle of place (r, c) on surface
+        """
+        size = config.SQUARESIZE
+        return pygame.Rect(self.board.board_position_x + c*size,
+                           self.board.board_position_y + r*size, size, size)
+
+    def set_highlights(self, chosen=(), captured=()):
+        """
+        changes places with yellow rims and places with red stones
+
+        Parameters
+        ----------
+        chosen : list
+            places with rims
+        captured : list
+            places with red stones
+
+        Returns
+        -------
+        None
+        """
+        self.chosen = set(chosen)
+        self.captured = set(captured)
+
+    def invalidate(self):
+        """
+        makes next draw draw the whole board, it is needed when something
+        else was drawn on the board
+        """
+        self._full = True
+
+    def _look(self, r, c):
+        """
+        returns what should be drawn on place (r, c)
+        """
+        return (self.board.place(r, c), (r, c) in self.chosen, (r, c) in self.captured)
+
+    def _draw_place(self, r, c, look, background):
+        """
+        draws background and stone of one place
+        """
+        stone, chosen, captured = look
+        rect = self.place_rect(r, c)
+        size = config.SQUARESIZE
+        self.surface.blit(background, rect, pygame.Rect(c*size, r*size, size, size))
+        if captured:
+            self.surface.blit(self.sprites.captured(), rect)
+        elif stone:
+            self.surface.blit(self.sprites.stone(stone), rect)
+        if chosen:
+            self.surface.blit(self.sprites.rim(), rect)
+
+    def draw(self):
+        """
+        draws places which look different than last time, whole board is drawn
+        the first time and after values in config changed
+
+        Returns
+        -------
+        list of rectangles which were drawn
+        """
+        board = self.board
+        self.sprites.check()
+        if self._settings != self.sprites.settings:
+            self._settings = self.sprites.settings
+            self._full = True
+        background = self.sprites.board(board.rows, board.columns)
+        drawn = []
+        full = self._full
+        if full:
+            self.surface.blit(background, (board.board_position_x, board.board_position_y))
+            self._shown = {}
+            drawn.append(pygame.Rect((board.board_position_x, board.board_position_y), background.get_size()))
+        for r in range(board.rows):
+            for c in range(board.columns):
+                look = self._look(r, c)
+                if self._shown.get((r, c)) != look:
+                    self._shown[(r, c)] = look
+                    if full and look == (0, False, False):
+                        continue
+                    self._draw_place(r, c, look, background)
+                    if not full:
+                        drawn.append(self.place_rect(r, c))
+        self._full = False
+        self.dirty.extend(drawn)
+        return drawn
+
+    def flush(self):
+        """
+        updates rectangles of screen drawn since last flush, if the surface is not
+        the screen nothing is updated
+
+        Returns
+        -------
+        list of updated rectangles
+        """
+        dirty = self.dirty
+        self.dirty = []
+        if dirty and pygame.display.get_init() and pygame.display.get_surface() is self.surface:
+            pygame.display.update(dirty)
+        return dirty
+
+
+def benchmark(rows=5, columns=9, frames=200):
+    """
+    draws board with stones on off-screen surface again and again
+
+    Parameters
+    ----------
+    rows, columns : int
+    frames : int
+        number of drawings of every kind
+
+    Returns
+    -------
+    dict
+        frames per second of full drawing, drawing after one move and drawing without changes
+    """
+    try:
+        from .board import Board
+    except ImportError:
+        from board import Board
+    board = Board(rows, columns).copy()
+    surface = pygame.Surface((config.width, config.height))
+    renderer = Renderer(board, surface, SpriteCache())
+    results = {}
+    start = time.perf_counter()
+    for _ in range(frames):
+        renderer.invalidate()
+        renderer.draw()
+    results['full'] = frames / (time.perf_counter() - start)
+    move = (rows//2, columns//2 - 1, rows//2, columns//2)
+    back = (move[2], move[3], move[0], move[1])
+    start = time.perf_counter()
+    for frame in range(frames):
+        board.move_stone(move if frame % 2 == 0 else back)
+        renderer.draw()
+    results['move'] = frames / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(frames):
+        renderer.draw()
+    results['unchanged'] = frames / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    """
+    prints speed of drawing on off-screen surface
+    """
+    parser = argparse.ArgumentParser(description='Fanorona drawing speed')
+    parser.add_argument('rows', type=int, nargs='?', default=5)
+    parser.add_argument('columns', type=int, nargs='?', default=9)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+    for kind, speed in benchmark(args.rows, args.columns, args.frames).items():
+        print(f'{kind}: {speed:.0f} frames/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,531 @@
+import argparse
+import time
+import numpy as np
+try:
+    from .engine import opponent_of, turn_steps, play_turn, undo_turn
+    from .transposition import TranspositionTable, EXACT, LOWER, UPPER
+    from .vectorized import features
+except ImportError:
+    from engine import opponent_of, turn_steps, play_turn, undo_turn
+    from transposition import TranspositionTable, EXACT, LOWER, UPPER
+    from vectorized import features
+
+
+WIN = 1000000
+MAX_PLY = 1000
+CAPTURE_SCORE = 1 << 40
+KILLER_SCORE = 1 << 30
+
+
+def count_stones(board, stone):
+    """
+    returns number of player's stones on board
+    """
+    return board.count(stone)
+
+
+class Evaluation():
+    """
+    A class to represent evaluation of position, weighted sum of differences
+    between player and opponent.
+
+    ...
+
+    Attributes
+    ----------
+    material : int
+        weight of number of stones
+    mobility : int
+        weight of number of possible moves
+    threats : int
+        weight of number of capturing moves
+
+    Methods
+    -------
+    __init__(material, mobility, threats):
+        creates evaluation
+    __call__(board, stone):
+        returns value of position for player
+    batch(positions, stone):
+        returns values of many positions at once
+    """
+
+    def __init__(self, material=100, mobility=1, threats=10):
+        """
+        Constructs evaluation with its weights.
+
+        Parameters
+        ----------
+        material : int
+        mobility : int
+        threats : int
+        """
+        self.material = material
+        self.mobility = mobility
+        self.threats = threats
+
+    def __call__(self, board, stone):
+        """
+        returns value of position for player, positive if player is better
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+
+        Returns
+        -------
+        int
+        """
+        opponent_stone = opponent_of(stone)
+        value = self.material * (count_stones(board, stone) - count_stones(board, opponent_stone))
+        if self.mobility:
+            value += self.mobility * (len(board.possible_moves(stone))
+                                      - len(board.possible_moves(opponent_stone)))
+        if self.threats:
+            value += self.threats * (len(board.capturing_moves(stone, opponent_stone))
+                                     - len(board.capturing_moves(opponent_stone, stone)))
+        return value
+
+    def batch(self, positions, stone):
+        """
+        returns values of many positions for player, the same as calling
+        evaluation for every position, but counted with numpy at once
+
+        Parameters
+        ----------
+        positions : array (N, rows, columns)
+        stone : 1 or 2
+
+        Returns
+        -------
+        array (N,) of int
+        """
+        counted = features(positions)
+        player = stone - 1
+        opponent = 1 - player
+        value = np.zeros(len(counted['winner']), dtype=np.int64)
+        for weight, name in ((self.material, 'material'), (self.mobility, 'mobility'), (self.threats, 'threats')):
+            if weight:
+                value += weight * (counted[name][..., player] - counted[name][..., opponent])
+        return value
+
+
+class SearchTimeout(Exception):
+    """
+    raised inside search when node or time budget is used up
+    """
+
+
+def _to_table(value, ply):
+    """
+    returns value saved in transposition table, wins are counted from the position, not from the root
+    """
+    if value > WIN - MAX_PLY:
+        return value + ply
+    if value < MAX_PLY - WIN:
+        return value - ply
+    return value
+
+
+def _from_table(value, ply):
+    """
+    returns value read from transposition table counted from the root
+    """
+    if value > WIN - MAX_PLY:
+        return value - ply
+    if value < MAX_PLY - WIN:
+        return value + ply
+    return value
+
+
+def _best_first(all_turns, best):
+    """
+    returns list of turns with given turn at the beginning
+    """
+    if best is not None and best in all_turns:
+        all_turns.insert(0, all_turns.pop(all_turns.index(best)))
+    return all_turns
+
+
+class AlphaBeta():
+    """
+    A class to represent negamax search with alpha-beta pruning over full turns.
+    Search is iterative deepening: depth 1, 2, ... up to depth, so when budget
+    is used up the best turn of the last finished depth is ready.
+    Turns are searched in order: turn from transposition table or principal
+    variation, turns capturing more stones, killer turns, turns with big history.
+
+    ...
+
+    Attributes
+    ----------
+    depth : int
+        maximal number of turns searched
+    evaluation : Evaluation
+        evaluation of positions at the end of search
+    max_nodes : int or None
+        maximal number of visited positions per search
+    max_time : float or None
+        maximal time of search in seconds
+    ordering : bool
+        if False turns are searched in order of generation, only turn from
+        transposition table is first
+    table : TranspositionTable
+        saved results of searched positions, kept between searches
+    nodes : int
+        number of positions visited in last search
+    stop_event : Event or None
+        search ends as if budget was used up when it is set
+    iterations : list
+        (depth, nodes, seconds, value, turn) for every finished depth of last search
+    pv : list
+        principal variation of last finished depth, list of turns
+    killers : dict
+        killers[ply] - last turns which caused cutoff at this ply
+    history : dict
+        history[(stone, turn)] - how often turn caused cutoff, weighted by depth
+
+    Methods
+    -------
+    __init__(depth, evaluation, max_nodes, max_time, table_size, ordering):
+        creates search
+    best_turn(board, stone):
+        returns the best turn for player
+    search_root(board, stone, depth, all_turns):
+        returns value and the best turn of one depth
+    negamax(board, stone, depth, alpha, beta, ply):
+        returns value of position for player
+    order(all_turns, sizes, stone, ply, best):
+        sorts turns, the most promising first
+    principal_variation(board, stone):
+        returns the best turns of both players read from transposition table
+    effective_branching_factor():
+        returns ratio of nodes of last two depths
+    report():
+        returns text with nodes of every depth
+    """
+
+    def __init__(self, depth=3, evaluation=None, max_nodes=None, max_time=None, table_size=1 << 16,
+                 ordering=True):
+        """
+        Constructs all the necessary attributes for the search object.
+
+        Parameters
+        ----------
+        depth : int
+        evaluation : Evaluation
+        max_nodes : int or None
+        max_time : float or None
+        table_size : int
+            number of slots of transposition table
+        ordering : bool
+        """
+        self.depth = depth
+        self.evaluation = evaluation or Evaluation()
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.ordering = ordering
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+        self.stop_event = None
+        self.iterations = []
+        self.pv = []
+        self.killers = {}
+        self.history = {}
+        self._searched = None
+        self._deadline = None
+
+    def _visit(self):
+        """
+        counts visited position and raises SearchTimeout if budget is used up
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+    def best_turn(self, board, stone):
+        """
+        returns the best turn for player found by iterative deepening,
+        if budget is used up it returns the best turn found so far
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+
+        Returns
+        -------
+        tuple of steps (move, capture) or None if player cannot move
+        """
+        self.nodes = 0
+        self.iterations = []
+        self.pv = []
+        self.killers = {}
+        self.history = {key: value // 2 for key, value in self.history.items() if value > 1}
+        start = time.perf_counter()
+        self._deadline = None if self.max_time is None else start + self.max_time
+        board = board.copy()
+        if board.stone_turn != stone:
+            board.end_turn()
+        sizes = {}
+        all_turns = turn_steps(board, stone, sizes)
+        if not all_turns:
+            return None
+        entry = self.table.probe(board.hash)
+        self.order(all_turns, sizes, stone, 0, entry and entry[4])
+        best_steps = all_turns[0]
+        if len(all_turns) == 1:
+            return best_steps
+        for depth in range(1, self.depth + 1):
+            nodes = self.nodes
+            self._searched = None
+            try:
+                value, best_steps = self.search_root(board, stone, depth, all_turns)
+            except SearchTimeout:
+                if self._searched is not None:
+                    best_steps = self._searched
+                break
+            self.iterations.append((depth, self.nodes - nodes, time.perf_counter() - start, value, best_steps))
+            self.pv = self.principal_variation(board, stone)
+            _best_first(all_turns, best_steps)
+            if abs(value) > WIN - MAX_PLY:
+                break
+        return best_steps
+
+    def search_root(self, board, stone, depth, all_turns):
+        """
+        searches every turn of the player with given depth
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+        depth : int
+        all_turns : list
+            turns of the player, the first one is searched first
+
+        Returns
+        -------
+        tuple (value, best turn)
+        """
+        alpha = -WIN - 1
+        best_steps = all_turns[0]
+        for steps in all_turns:
+            records = play_turn(board, steps)
+            try:
+                value = -self.negamax(board, opponent_of(stone), depth - 1, -WIN - 1, -alpha, 1)
+            finally:
+                undo_turn(board, records)
+            if value > alpha:
+                alpha = value
+                best_steps = steps
+                self._searched = steps
+        self.table.store(board.hash, depth, _to_table(alpha, 0), EXACT, best_steps)
+        return alpha, best_steps
+
+    def order(self, all_turns, sizes, stone, ply, best):
+        """
+        sorts turns: given turn first, then turns capturing more stones,
+        killer turns of this ply and turns with bigger history
+
+        Parameters
+        ----------
+        all_turns : list
+        sizes : dict
+            number of captured stones of every capturing turn
+        stone : 1 or 2
+        ply : int
+        best : turn or None
+            turn from transposition table or principal variation
+
+        Returns
+        -------
+        list of turns, it is sorted in place
+        """
+        if not self.ordering:
+            return _best_first(all_turns, best)
+        killers = self.killers.get(ply, ())
+        history = self.history
+
+        def score(steps):
+            value = sizes.get(steps, 0) * CAPTURE_SCORE + history.get((stone, steps), 0)
+            if steps in killers:
+                value += KILLER_SCORE
+            return value
+        all_turns.sort(key=score, reverse=True)
+        return _best_first(all_turns, best)
+
+    def _cutoff(self, steps, stone, depth, ply):
+        """
+        saves turn which caused cutoff as killer and in history
+        """
+        killers = self.killers.setdefault(ply, [])
+        if steps not in killers:
+            killers.insert(0, steps)
+            del killers[2:]
+        key = (stone, steps)
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def negamax(self, board, stone, depth, alpha, beta, ply):
+        """
+        returns value of position for player who moves now
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+            player who moves now
+        depth : int
+            number of turns left to search
+        alpha, beta : int
+            window of values
+        ply : int
+            number of turns from the root, faster wins are better
+
+        Returns
+        -------
+        int
+        """
+        self._visit()
+        winner = board.is_winner()
+        if winner is not None:
+            return WIN - ply if winner == stone else ply - WIN
+        if depth <= 0:
+            return self.evaluation(board, stone)
+        key = board.hash
+        best = None
+        entry = self.table.probe(key)
+        if entry is not None:
+            best = entry[4]
+            if entry[1] >= depth:
+                value = _from_table(entry[2], ply)
+                if entry[3] == EXACT:
+                    return value
+                if entry[3] == LOWER and value >= beta:
+                    return value
+                if entry[3] == UPPER and value <= alpha:
+                    return value
+        if best is None and ply < len(self.pv):
+            best = self.pv[ply]
+        alpha_start = alpha
+        best_value = None
+        sizes = {}
+        all_turns = turn_steps(board, stone, sizes)
+        for steps in self.order(all_turns, sizes, stone, ply, best):
+            records = play_turn(board, steps)
+            try:
+                value = -self.negamax(board, opponent_of(stone), depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                undo_turn(board, records)
+            if best_value is None or value > best_value:
+                best_value = value
+                best = steps
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    if self.ordering:
+                        self._cutoff(steps, stone, depth, ply)
+                    break
+        if best_value is None:
+            return ply - WIN
+        if best_value <= alpha_start:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, depth, _to_table(best_value, ply), flag, best)
+        return best_value
+
+    def principal_variation(self, board, stone):
+        """
+        returns the best turns of both players, read from transposition table
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+            player who moves now
+
+        Returns
+        -------
+        list of turns
+        """
+        pv = []
+        records = []
+        seen = set()
+        while board.hash not in seen and len(pv) < MAX_PLY:
+            seen.add(board.hash)
+            entry = self.table.probe(board.hash)
+            if entry is None or entry[4] is None:
+                break
+            steps = entry[4]
+            if steps not in turn_steps(board, stone):
+                break
+            pv.append(steps)
+            records.append(play_turn(board, steps))
+            stone = opponent_of(stone)
+        for turn_records in reversed(records):
+            undo_turn(board, turn_records)
+        return pv
+
+    def effective_branching_factor(self):
+        """
+        returns ratio of numbers of nodes of the last two finished depths
+        or None if less than two depths were finished
+        """
+        if len(self.iterations) < 2 or not self.iterations[-2][1]:
+            return None
+        return self.iterations[-1][1] / self.iterations[-2][1]
+
+    def report(self):
+        """
+        returns text with nodes, time and value of every finished depth of last search
+        """
+        lines = []
+        previous = None
+        for depth, nodes, seconds, value, steps in self.iterations:
+            factor = f'{nodes / previous:.2f}' if previous else '-'
+            lines.append(f'depth {depth}: {nodes} nodes, branching {factor}, {seconds:.3f} s, value {value}')
+            previous = nodes
+        return '\n'.join(lines)
+
+
+def main():
+    """
+    searches starting position given in command line with and without move ordering
+    and prints nodes of every depth
+    """
+    try:
+        from .board import Board
+    except ImportError:
+        from board import Board
+    parser = argparse.ArgumentParser(description='Fanorona search statistics')
+    parser.add_argument('rows', type=int, nargs='?', default=5)
+    parser.add_argument('columns', type=int, nargs='?', default=9)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--turns', type=int, default=0,
+                        help='number of turns played by search before statistics are printed')
+    args = parser.parse_args()
+    board = Board(args.rows, args.columns).copy()
+    stone = 1
+    for _ in range(args.turns):
+        steps = AlphaBeta(2).best_turn(board, stone)
+        if steps is None:
+            break
+        play_turn(board, steps)
+        stone = opponent_of(stone)
+    for ordering in (False, True):
+        search = AlphaBeta(args.depth, ordering=ordering)
+        search.best_turn(board, stone)
+        print(f'ordering {ordering}: {search.nodes} nodes')
+        print(search.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import os
+import struct
+from functools import lru_cache
+try:
+    from .bitboard import BitBoard
+    from .geometry import DIRECTIONS
+    from .moves import Chain
+except ImportError:
+    from bitboard import BitBoard
+    from geometry import DIRECTIONS
+    from moves import Chain
+
+
+MAGIC = b'FSN1'
+HEADER = struct.Struct('<4sBBBBBBBB')
+NONE = 0xFF
+OPPONENTS = 4
+
+
+@lru_cache(maxsize=None)
+def _template(board_class, rows, columns):
+    """
+    returns board which is copied by loads, so board of every size is constructed only once
+    """
+    return board_class(rows, columns)
+
+
+class Snapshot():
+    """
+    A class to represent saved game: board with capture chain and players.
+
+    ...
+
+    Attributes
+    ----------
+    board : Board
+    stone : 1 or 2
+        stone of human player
+    opponent : int
+        0 - another player, 1 - computer easy, 2 - hard, 3 - expert,
+        the same as option of opponent menu
+
+    Methods
+    -------
+    dumps():
+        returns bytes of snapshot
+    loads(data, board_class):
+        returns snapshot from bytes
+    save(path):
+        writes snapshot to file
+    load(path, board_class):
+        returns snapshot from file or None
+    """
+
+    def __init__(self, board, stone=1, opponent=0):
+        self.board = board
+        self.stone = stone
+        self.opponent = opponent
+
+    def dumps(self):
+        """
+        returns bytes of snapshot: header with size, player who moves, place and direction
+        of capturing stone and players, then masks of white stones, black stones and
+        places visited by capturing stone, every mask has (rows*columns + 7) // 8 bytes
+
+        Returns
+        -------
+        bytes
+        """
+        board = self.board
+        columns = board.columns
+        width = (board.rows * columns + 7) // 8
+        if isinstance(board, BitBoard):
+            white, black = board.white, board.black
+        else:
+            white = black = 0
+            bit = 1
+            for verse in board.places():
+                for value in verse:
+                    if value == 1:
+                        white |= bit
+                    elif value == 2:
+                        black |= bit
+                    bit <<= 1
+        chain = board.chain
+        place = direction = NONE
+        if board.last_position is not None:
+            place = board.last_position[0]*columns + board.last_position[1]
+            if chain.direction is not None:
+                direction = DIRECTIONS.index(chain.direction)
+        return b''.join((
+            HEADER.pack(MAGIC, board.rows, columns, board.stone_turn, place, direction,
+                        self.stone, self.opponent, 0),
+            white.to_bytes(width, 'little'),
+            black.to_bytes(width, 'little'),
+            chain.visited.to_bytes(width, 'little')))
+
+    @classmethod
+    def loads(cls, data, board_class=BitBoard):
+        """
+        returns snapshot from bytes made by dumps, masks are read straight
+        from data without copying it
+
+        Parameters
+        ----------
+        data : bytes-like object
+        board_class : Board or its child class
+
+        Returns
+        -------
+        Snapshot
+
+        Raises
+        ------
+        ValueError
+            if data is not a snapshot or any of its values is out of range
+        """
+        data = memoryview(data)
+        if len(data) < HEADER.size:
+            raise ValueError('snapshot is too short')
+        magic, rows, columns, stone_turn, place, direction, stone, opponent, _ = HEADER.unpack_from(data)
+        width = (rows * columns + 7) // 8
+        if magic != MAGIC or len(data) != HEADER.size + 3 * width:
+            raise ValueError('data is not a snapshot')
+        if not (rows % 2 == columns % 2 == 1 and 3 <= rows <= 9 and 3 <= columns <= 9):
+            raise ValueError(f'wrong size of board {rows}x{columns}')
+        if stone_turn not in (1, 2) or stone not in (1, 2) or not 0 <= opponent < OPPONENTS:
+            raise ValueError('wrong players in snapshot')
+        if place != NONE and place >= rows * columns:
+            raise ValueError('wrong place of capturing stone in snapshot')
+        if direction != NONE and (place == NONE or direction >= len(DIRECTIONS)):
+            raise ValueError('wrong direction of capturing stone in snapshot')
+        masks = [int.from_bytes(data[start:start + width], 'little')
+                 for start in range(HEADER.size, HEADER.size + 3 * width, width)]
+        white, black, visited = masks
+        if white & black or (white | black | visited) >> (rows * columns):
+            raise ValueError('wrong stones in snapshot')
+        board = _template(board_class, rows, columns).copy()
+        if isinstance(board, BitBoard):
+            board.set_stones(white, black)
+        else:
+            board.matrix = [[1 if white >> (r*columns + c) & 1 else 2 if black >> (r*columns + c) & 1 else 0
+                             for c in range(columns)] for r in range(rows)]
+        if stone_turn != board.stone_turn:
+            board.end_turn()
+        if place != NONE:
+            position = divmod(place, columns)
+            board.set_chain(position, Chain(columns, position, visited,
+                                            None if direction == NONE else DIRECTIONS[direction]))
+        return cls(board, stone, opponent)
+
+    def save(self, path):
+        """
+        writes snapshot to file, file is replaced at once, so after power
+        cut there is old or new snapshot, never a broken one
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        None
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(self.dumps())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, board_class=BitBoard):
+        """
+        returns snapshot from file
+
+        Parameters
+        ----------
+        path : str
+        board_class : Board or its child class
+
+        Returns
+        -------
+        Snapshot or None if there is no file or it is not a snapshot
+        """
+        try:
+            with open(path, 'rb') as file:
+                return cls.loads(file.read(), board_class)
+        except (OSError, ValueError):
+            return None
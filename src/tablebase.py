@@ -0,0 +1,410 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+import numpy as np
+try:
+    from .board import Board
+    from .engine import turn_steps, play_turn, undo_turn
+    from .config import DATA_DIR
+except ImportError:
+    from board import Board
+    from engine import turn_steps, play_turn, undo_turn
+    from config import DATA_DIR
+
+
+MAGIC = b'FTB1'
+HEADER = struct.Struct('<4sBBBBI')
+DRAW = 0
+TABLEBASE_DIR = os.path.join(DATA_DIR, 'tablebases')
+
+
+class Indexer():
+    """
+    A class to represent perfect index of positions with at most max_stones
+    stones and at least one stone of every player. Every position with player
+    who moves has its own number from 0 to size - 1 and every number is used.
+    Positions are grouped by number of white and black stones, in group places
+    of white stones and then places of black stones on the remaining places
+    are numbered as combinations.
+
+    ...
+
+    Attributes
+    ----------
+    rows : int
+    columns : int
+    max_stones : int
+    places : int
+        number of places on board
+    offsets : dict
+        offsets[(white, black)] - number of the first position with this material
+    size : int
+        number of positions
+
+    Methods
+    -------
+    index(matrix, stone):
+        returns number of position or None if it is not covered
+    positions(white, black):
+        yields every placement of stones with given material
+    """
+
+    def __init__(self, rows, columns, max_stones):
+        """
+        Constructs index of positions of board.
+
+        Parameters
+        ----------
+        rows : int
+        columns : int
+        max_stones : int
+        """
+        self.rows = rows
+        self.columns = columns
+        self.max_stones = max_stones
+        self.places = rows * columns
+        self.offsets = {}
+        size = 0
+        for white, black in self.materials():
+            self.offsets[(white, black)] = size
+            size += 2 * comb(self.places, white) * comb(self.places - white, black)
+        self.size = size
+
+    def materials(self):
+        """
+        returns covered numbers of white and black stones
+        """
+        stones = min(self.max_stones, self.places)
+        return [(white, black) for white in range(1, stones) for black in range(1, stones - white + 1)]
+
+    def index(self, matrix, stone):
+        """
+        returns number of position
+
+        Parameters
+        ----------
+        matrix : list of lists
+        stone : 1 or 2
+            player who moves
+
+        Returns
+        -------
+        int or None if position is not covered
+        """
+        white_rank = black_rank = 0
+        white = black = 0
+        place = 0
+        for verse in matrix:
+            for value in verse:
+                if value == 1:
+                    white += 1
+                    white_rank += comb(place, white)
+                elif value == 2:
+                    black += 1
+                    black_rank += comb(place - white, black)
+                place += 1
+        offset = self.offsets.get((white, black))
+        if offset is None:
+            return None
+        rank = white_rank * comb(self.places - white, black) + black_rank
+        return offset + 2 * rank + stone - 1
+
+    def positions(self, white, black):
+        """
+        yields every matrix with given number of white and black stones
+
+        Parameters
+        ----------
+        white : int
+        black : int
+
+        Yields
+        ------
+        list of lists
+        """
+        columns = self.columns
+        for whites in combinations(range(self.places), white):
+            free = [place for place in range(self.places) if place not in whites]
+            for blacks in combinations(free, black):
+                places = [0] * self.places
+                for place in whites:
+                    places[place] = 1
+                for place in blacks:
+                    places[place] = 2
+                yield [places[r*columns:(r + 1)*columns] for r in range(self.rows)]
+
+
+def solve(rows, columns, max_stones, progress=None):
+    """
+    solves every position covered by Indexer with retrograde analysis:
+    positions where player cannot move are lost, positions where player captures
+    all opponent's stones are won, then results go back to predecessors till
+    nothing changes. Positions which are not solved are draws.
+
+    Parameters
+    ----------
+    rows : int
+    columns : int
+    max_stones : int
+    progress : callable or None
+        called with number of positions whose turns are generated
+
+    Returns
+    -------
+    array of uint16
+        value of every position: 0 - draw, otherwise value - 1 is number of turns
+        till the end of game with perfect play, player who moves wins if it is odd
+    """
+    indexer = Indexer(rows, columns, max_stones)
+    size = indexer.size
+    values = np.zeros(size, dtype=np.uint16)
+    remaining = np.zeros(size, dtype=np.int32)
+    sources = []
+    targets = []
+    queue = deque()
+    board = Board(rows, columns)
+    generated = 0
+    for white, black in indexer.materials():
+        for matrix in indexer.positions(white, black):
+            board.matrix = matrix
+            for stone in (1, 2):
+                if board.stone_turn != stone:
+                    board.end_turn()
+                index = indexer.index(matrix, stone)
+                children = set()
+                wins = False
+                for steps in turn_steps(board, stone):
+                    records = play_turn(board, steps)
+                    if board.is_winner() == stone:
+                        wins = True
+                    else:
+                        children.add(indexer.index(board.places(), board.stone_turn))
+                    undo_turn(board, records)
+                if wins:
+                    values[index] = 2
+                    queue.append(index)
+                elif not children:
+                    values[index] = 1
+                    queue.append(index)
+                else:
+                    remaining[index] = len(children)
+                    sources.extend(children)
+                    targets.extend([index] * len(children))
+            generated += 2
+            if progress is not None:
+                progress(generated)
+    sources = np.array(sources, dtype=np.int64)
+    targets = np.array(targets, dtype=np.int64)
+    order = np.argsort(sources, kind='stable')
+    predecessors = targets[order]
+    starts = np.searchsorted(sources[order], np.arange(size + 1))
+    while queue:
+        index = queue.popleft()
+        value = int(values[index])
+        lost = value % 2 == 1
+        for predecessor in predecessors[starts[index]:starts[index + 1]].tolist():
+            if values[predecessor] != DRAW:
+                continue
+            if lost:
+                values[predecessor] = value + 1
+                queue.append(predecessor)
+            else:
+                remaining[predecessor] -= 1
+                if remaining[predecessor] == 0:
+                    values[predecessor] = value + 1
+                    queue.append(predecessor)
+    return values
+
+
+def write(path, rows, columns, max_stones, values):
+    """
+    writes header and values of positions to binary file,
+    directory of file is made if it does not exist
+
+    Parameters
+    ----------
+    path : str
+    rows : int
+    columns : int
+    max_stones : int
+    values : array of uint16
+
+    Returns
+    -------
+    None
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, rows, columns, max_stones, 0, len(values)))
+        file.write(values.astype('<u2').tobytes())
+
+
+class Tablebase():
+    """
+    A class to read tablebase file. File is memory mapped, so only probed
+    positions are read from disk and opening is instant.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+    indexer : Indexer
+
+    Methods
+    -------
+    probe(board):
+        returns result and number of turns till the end of game
+    best_turn(board, stone):
+        returns turn with the best result
+    close():
+        closes file
+    """
+
+    def __init__(self, path):
+        """
+        Opens tablebase file.
+
+        Parameters
+        ----------
+        path : str
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, columns, max_stones, _, size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a tablebase file')
+        self.indexer = Indexer(rows, columns, max_stones)
+        if size != self.indexer.size or len(self._map) != HEADER.size + 2 * size:
+            self.close()
+            raise ValueError(f'{path} is damaged')
+
+    def value(self, matrix, stone):
+        """
+        returns stored value of position or None if it is not covered
+        """
+        index = self.indexer.index(matrix, stone)
+        if index is None:
+            return None
+        return struct.unpack_from('<H', self._map, HEADER.size + 2 * index)[0]
+
+    def probe(self, board):
+        """
+        returns result of position for player who moves
+
+        Parameters
+        ----------
+        board : Board
+
+        Returns
+        -------
+        tuple (result, turns) or None if position is not covered
+            result - 1 win, -1 loss, 0 draw, turns - number of turns till
+            the end of game with perfect play, None for draw
+        """
+        if (board.rows, board.columns) != (self.indexer.rows, self.indexer.columns) \
+                or board.last_position is not None:
+            return None
+        value = self.value(board.places(), board.stone_turn)
+        if value is None:
+            return None
+        if value == DRAW:
+            return 0, None
+        turns = value - 1
+        return (1 if turns % 2 else -1), turns
+
+    def best_turn(self, board, stone):
+        """
+        returns turn which wins the fastest, draws or loses the slowest
+
+        Parameters
+        ----------
+        board : Board
+        stone : 1 or 2
+
+        Returns
+        -------
+        tuple of steps (move, capture) or None if position is not covered
+        """
+        board = board.copy()
+        if board.stone_turn != stone:
+            board.end_turn()
+        if self.probe(board) is None:
+            return None
+        best = None
+        best_score = None
+        for steps in turn_steps(board, stone):
+            records = play_turn(board, steps)
+            if board.is_winner() == stone:
+                score = (2, 0)
+            else:
+                result, turns = self.probe(board)
+                score = (-result, -turns if result == -1 else turns) if result else (0, 0)
+            undo_turn(board, records)
+            if best_score is None or score > best_score:
+                best, best_score = steps, score
+        return best
+
+    def close(self):
+        """
+        closes memory map and file
+        """
+        self._map.close()
+        self._file.close()
+
+
+def path_of(rows, columns, directory=TABLEBASE_DIR):
+    """
+    returns path of tablebase file of board size
+    """
+    return os.path.join(directory, f'fanorona_{rows}x{columns}.tb')
+
+
+@lru_cache(maxsize=None)
+def load(rows, columns, directory=TABLEBASE_DIR):
+    """
+    returns opened tablebase of board size, the same object for every caller
+
+    Returns
+    -------
+    Tablebase or None if there is no file
+    """
+    path = path_of(rows, columns, directory)
+    if not os.path.exists(path):
+        return None
+    return Tablebase(path)
+
+
+def main():
+    """
+    generates tablebase of board size given in command line
+    """
+    parser = argparse.ArgumentParser(description='Fanorona endgame tablebase generator')
+    parser.add_argument('rows', type=int, nargs='?', default=3)
+    parser.add_argument('columns', type=int, nargs='?', default=3)
+    parser.add_argument('--stones', type=int, default=None,
+                        help='maximal number of stones, all positions by default')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+    stones = args.stones or args.rows * args.columns
+    output = args.output or path_of(args.rows, args.columns)
+    start = time.perf_counter()
+    values = solve(args.rows, args.columns, stones)
+    write(output, args.rows, args.columns, stones, values)
+    turns = values.astype(np.int64) - 1
+    print(f'{len(values)} positions in {time.perf_counter() - start:.1f} s')
+    print(f'wins {int(((values > 0) & (turns % 2 == 1)).sum())}, '
+          f'losses {int(((values > 0) & (turns % 2 == 0)).sum())}, draws {int((values == 0).sum())}')
+    print(f'longest game {int(turns.max())} turns, written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+try:
+    from .board import Board
+    from .bitboard import BitBoard
+    from .engine import GameState, RandomAgent, play_game
+    from .players import Computer
+    from .record import GameRecord, GameWriter
+except ImportError:
+    from board import Board
+    from bitboard import BitBoard
+    from engine import GameState, RandomAgent, play_game
+    from players import Computer
+    from record import GameRecord, GameWriter
+
+
+SIZES = {'3x3': (3, 3), '5x5': (5, 5), '5x9': (5, 9)}
+
+
+def make_agent(name, stone, seed):
+    """
+    creates player from its name
+
+    Parameters
+    ----------
+    name : str
+        'Random', 'Easy', 'Hard', 'Expert' or 'MCTS', 'Expert:N' is Expert with depth N,
+        'MCTS:N' is MCTS with N playouts
+    stone : 1 or 2
+    seed : int
+        seed of random player
+
+    Returns
+    -------
+    Agent
+    """
+    level, _, depth = name.partition(':')
+    if level == 'Random':
+        return RandomAgent(seed)
+    if level == 'Expert':
+        return Computer(stone, level, depth=int(depth or 2), max_time=None)
+    if level == 'MCTS':
+        return Computer(stone, level, max_time=None, playouts=int(depth or 500))
+    return Computer(stone, level)
+
+
+def play_match(game):
+    """
+    plays one game, it is run in worker process
+
+    Parameters
+    ----------
+    game : tuple (size, white, black, seed, max_turns, bitboard)
+        size - '3x3', '5x5' or '5x9', white and black - names of players
+
+    Returns
+    -------
+    tuple (size, white, black, winner, turns, steps)
+        winner is 1, 2 or None if the game was a draw
+    """
+    return recorded_match(game)[0]
+
+
+def recorded_match(game):
+    """
+    plays one game like play_match and returns its result with record of the game
+
+    Parameters
+    ----------
+    game : tuple (size, white, black, seed, max_turns, bitboard)
+
+    Returns
+    -------
+    tuple (result, record)
+        result - the same as returned by play_match, record - GameRecord
+    """
+    size, white, black, seed, max_turns, bitboard = game
+    random.seed(seed)
+    rows, columns = SIZES[size]
+    state = GameState.new(rows, columns, BitBoard if bitboard else Board)
+    agents = {1: make_agent(white, 1, seed), 2: make_agent(black, 2, seed + 1)}
+    winner = play_game(state, agents, max_turns)
+    steps = sum(len(turn.steps) for turn in state.turns)
+    record = GameRecord(rows, columns, [tuple(turn.steps) for turn in state.turns], winner)
+    return (size, white, black, winner, len(state.turns), steps), record
+
+
+def schedule(agents, sizes, games, seed=0, max_turns=300, bitboard=True):
+    """
+    returns list of games: every pair of players plays given number of games
+    on every board with every colour
+
+    Parameters
+    ----------
+    agents : list of str
+    sizes : list of str
+    games : int
+        number of games of every pair with every colour on every board
+    seed : int
+        seed of the first game, next games have next seeds
+    max_turns : int
+        after this number of turns game is a draw
+    bitboard : bool
+        if True games are played on BitBoard
+
+    Returns
+    -------
+    list of games for play_match
+    """
+    matches = []
+    for size in sizes:
+        for white, black in permutations(agents, 2):
+            for _ in range(games):
+                matches.append((size, white, black, seed + 2*len(matches), max_turns, bitboard))
+    return matches
+
+
+class TournamentResult():
+    """
+    A class to represent results of tournament.
+
+    ...
+
+    Attributes
+    ----------
+    results : list
+        tuples returned by play_match
+    seconds : float
+        time of the tournament
+
+    Methods
+    -------
+    table():
+        returns wins, draws and losses of every player against every other player
+    elo():
+        returns Elo rating of every player
+    games_per_second():
+        returns number of games played in one second
+    report():
+        returns text with tables and ratings
+    """
+
+    def __init__(self, results, seconds):
+        self.results = results
+        self.seconds = seconds
+
+    def table(self, size=None):
+        """
+        returns wins, draws and losses of players
+
+        Parameters
+        ----------
+        size : str or None
+            only games on this board are counted if it is given
+
+        Returns
+        -------
+        dict
+            table[(player, opponent)] = [wins, draws, losses]
+        """
+        table = {}
+        for game_size, white, black, winner, turns, steps in self.results:
+            if size is not None and game_size != size:
+                continue
+            for player, opponent, stone in ((white, black, 1), (black, white, 2)):
+                row = table.setdefault((player, opponent), [0, 0, 0])
+                if winner is None:
+                    row[1] += 1
+                elif winner == stone:
+                    row[0] += 1
+                else:
+                    row[2] += 1
+        return table
+
+    def elo(self, iterations=500):
+        """
+        returns Elo ratings which best explain scores of the games,
+        average rating is 1500. Every pair gets one draw more, so that
+        player who won every game has finite rating.
+
+        Parameters
+        ----------
+        iterations : int
+
+        Returns
+        -------
+        dict
+            rating of every player
+        """
+        table = self.table()
+        players = sorted({player for player, opponent in table})
+        ratings = {player: 0.0 for player in players}
+        for _ in range(iterations):
+            for player in players:
+                score = 0.0
+                expected = 0.0
+                games = 0
+                for (first, opponent), (wins, draws, losses) in table.items():
+                    if first != player:
+                        continue
+                    count = wins + draws + losses + 1
+                    score += wins + (draws + 1) / 2
+                    expected += count / (1 + 10 ** ((ratings[opponent] - ratings[player]) / 400))
+                    games += count
+                if games:
+                    ratings[player] += 400 * (score - expected) / games
+            mean = sum(ratings.values()) / len(ratings)
+            ratings = {player: rating - mean for player, rating in ratings.items()}
+        return {player: round(1500 + rating) for player, rating in ratings.items()}
+
+    def games_per_second(self):
+        """
+        returns number of games played in one second
+        """
+        return len(self.results) / self.seconds if self.seconds else 0.0
+
+    def report(self):
+        """
+        returns text with results of every board, Elo ratings and speed
+        """
+        lines = []
+        for size in sorted({result[0] for result in self.results}):
+            lines.append(f'board {size}')
+            for (player, opponent), (wins, draws, losses) in sorted(self.table(size).items()):
+                lines.append(f'  {player:>10} vs {opponent:<10} W {wins:4} D {draws:4} L {losses:4}')
+        lines.append('Elo')
+        for player, rating in sorted(self.elo().items(), key=lambda item: -item[1]):
+            lines.append(f'  {player:>10} {rating}')
+        steps = sum(result[5] for result in self.results)
+        lines.append(f'{len(self.results)} games in {self.seconds:.1f} s, '
+                     f'{self.games_per_second():.1f} games/s, {steps / max(self.seconds, 1e-9):.0f} moves/s')
+        return '\n'.join(lines)
+
+
+def run_tournament(agents, sizes=('5x9',), games=10, workers=None, seed=0, max_turns=300, bitboard=True,
+                   record=None):
+    """
+    plays all games of tournament in worker processes
+
+    Parameters
+    ----------
+    agents : list of str
+        names of players, see make_agent
+    sizes : list of str
+        boards: '3x3', '5x5', '5x9'
+    games : int
+        number of games of every pair with every colour on every board
+    workers : int or None
+        number of processes, None - number of CPU cores, 0 - play in this process
+    seed : int
+    max_turns : int
+    bitboard : bool
+    record : str or None
+        path of file to which games are appended as they finish
+
+    Returns
+    -------
+    TournamentResult
+    """
+    matches = schedule(agents, sizes, games, seed, max_turns, bitboard)
+    start = time.perf_counter()
+    if record is None:
+        results = list(_played(play_match, matches, workers))
+        return TournamentResult(results, time.perf_counter() - start)
+    results = []
+    writer = GameWriter(record)
+    try:
+        for result, game in _played(recorded_match, matches, workers):
+            results.append(result)
+            writer.write(game)
+    finally:
+        writer.close()
+    return TournamentResult(results, time.perf_counter() - start)
+
+
+def _played(function, matches, workers):
+    """
+    yields results of function for matches in their order, matches are played
+    in worker processes, or in this process if workers is 0
+    """
+    if workers == 0:
+        yield from map(function, matches)
+        return
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(matches) // (workers * 4))
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(function, matches, chunksize=chunksize)
+
+
+def main():
+    """
+    runs tournament with players and boards given in command line and prints results
+    """
+    parser = argparse.ArgumentParser(description='Fanorona tournament between computer players')
+    parser.add_argument('--agents', nargs='+', default=['Random', 'Easy', 'Hard'])
+    parser.add_argument('--sizes', nargs='+', default=['5x9'], choices=sorted(SIZES))
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=300)
+    parser.add_argument('--record', default=None, help='file to which games are appended')
+    args = parser.parse_args()
+    result = run_tournament(args.agents, args.sizes, args.games, args.workers, args.seed, args.max_turns,
+                            record=args.record)
+    print(result.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class TranspositionTable():
+    """
+    A class to represent fixed-size table of searched positions.
+    Position's hash chooses the slot, deeper searches replace shallower ones.
+
+    ...
+
+    Attributes
+    ----------
+    size : int
+        number of slots, power of two
+    hits : int
+        number of probes which found the position
+    misses : int
+        number of probes which did not find the position
+    collisions : int
+        number of probes which found other position in the slot
+    stores : int
+        number of stored positions
+    rejected : int
+        number of positions not stored because the slot had deeper search
+
+    Methods
+    -------
+    __init__(size):
+        creates empty table
+    probe(key):
+        returns entry (key, depth, value, flag, best) or None
+    store(key, depth, value, flag, best):
+        saves search result if it is not shallower than saved one
+    clear():
+        removes all entries
+    stats():
+        returns dictionary with counters
+    """
+
+    def __init__(self, size=1 << 16):
+        """
+        Constructs empty table.
+
+        Parameters
+        ----------
+        size : int
+            number of slots, rounded up to power of two
+        """
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self._mask = self.size - 1
+        self._slots = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.rejected = 0
+
+    def probe(self, key):
+        """
+        returns saved entry for position
+
+        Parameters
+        ----------
+        key : int
+            hash of position
+
+        Returns
+        -------
+        entry : (key, depth, value, flag, best) or None
+        """
+        entry = self._slots[key & self._mask]
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != key:
+            self.misses += 1
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, value, flag, best):
+        """
+        saves search result, entry of other position is replaced only by not shallower search
+
+        Parameters
+        ----------
+        key : int
+            hash of position
+        depth : int
+            depth of search
+        value : int
+        flag : EXACT, LOWER or UPPER
+            value is exact, lower bound or upper bound
+        best : any
+            best turn in position
+
+        Returns
+        -------
+        None
+        """
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is not None and entry[0] != key and entry[1] > depth:
+            self.rejected += 1
+            return
+        self._slots[index] = (key, depth, value, flag, best)
+        self.stores += 1
+
+    def clear(self):
+        """
+        removes all entries, counters are not changed
+        """
+        self._slots = [None] * self.size
+
+    def stats(self):
+        """
+        returns dictionary with counters and number of used slots
+        """
+        return {
+            'size': self.size,
+            'used': self.size - self._slots.count(None),
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'rejected': self.rejected,
+        }
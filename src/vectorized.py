@@ -0,0 +1,169 @@
+from functools import lru_cache
+import numpy as np
+try:
+    from .geometry import DIRECTIONS, geometry
+except ImportError:
+    from geometry import DIRECTIONS, geometry
+
+
+PAD = 2
+OUTSIDE = -1
+
+
+@lru_cache(maxsize=None)
+def diagonal_places(rows, columns):
+    """
+    returns boolean array of places from which diagonal moves are possible
+    """
+    r, c = np.indices((rows, columns))
+    return (r + c) % 2 == 0
+
+
+@lru_cache(maxsize=None)
+def move_table(rows, columns):
+    """
+    returns shared Move objects of Geometry in flat tuple, move of place (r, c)
+    in direction d is at index (r*columns + c)*8 + d, None if there is no such move
+    """
+    table = [None] * (rows * columns * len(DIRECTIONS))
+    lines = geometry(rows, columns)
+    for r in range(rows):
+        for c in range(columns):
+            for d, move in lines.direction_moves[r][c]:
+                table[(r*columns + c)*len(DIRECTIONS) + d] = move
+    return tuple(table)
+
+
+def padded(positions):
+    """
+    returns positions with two places of OUTSIDE around every board,
+    so shifted views never go out of the array
+
+    Parameters
+    ----------
+    positions : array (..., rows, columns)
+
+    Returns
+    -------
+    array (..., rows + 4, columns + 4) of int8
+    """
+    positions = np.asarray(positions, dtype=np.int8)
+    *batch, rows, columns = positions.shape
+    board = np.full((*batch, rows + 2*PAD, columns + 2*PAD), OUTSIDE, dtype=np.int8)
+    board[..., PAD:PAD + rows, PAD:PAD + columns] = positions
+    return board
+
+
+def shifted(board, rows, columns, dr, dc):
+    """
+    returns view of padded positions in which place (r, c) holds place (r + dr, c + dc)
+    """
+    return board[..., PAD + dr:PAD + dr + rows, PAD + dc:PAD + dc + columns]
+
+
+def move_masks(positions, stone):
+    """
+    returns for every direction places of player's stones which can move in this direction
+
+    Parameters
+    ----------
+    positions : array (..., rows, columns)
+    stone : 1 or 2
+
+    Returns
+    -------
+    boolean array (..., rows, columns, 8), last axis in order of DIRECTIONS
+    """
+    board = padded(positions)
+    rows, columns = board.shape[-2] - 2*PAD, board.shape[-1] - 2*PAD
+    stones = shifted(board, rows, columns, 0, 0) == stone
+    empty = board == 0
+    diagonal = diagonal_places(rows, columns)
+    masks = []
+    for dr, dc in DIRECTIONS:
+        mask = stones & shifted(empty, rows, columns, dr, dc)
+        if dr and dc:
+            mask &= diagonal
+        masks.append(mask)
+    return np.stack(masks, axis=-1)
+
+
+def capture_masks(positions, stone, opponent_stone):
+    """
+    returns for every direction places of player's stones which capture by approach
+    and by withdrawal when they move in this direction
+
+    Parameters
+    ----------
+    positions : array (..., rows, columns)
+    stone : 1 or 2
+    opponent_stone : 1 or 2
+
+    Returns
+    -------
+    tuple of two boolean arrays (..., rows, columns, 8): approach and withdrawal
+    """
+    board = padded(positions)
+    rows, columns = board.shape[-2] - 2*PAD, board.shape[-1] - 2*PAD
+    stones = shifted(board, rows, columns, 0, 0) == stone
+    empty = board == 0
+    opponent = board == opponent_stone
+    diagonal = diagonal_places(rows, columns)
+    approach = []
+    withdrawal = []
+    for dr, dc in DIRECTIONS:
+        mask = stones & shifted(empty, rows, columns, dr, dc)
+        if dr and dc:
+            mask &= diagonal
+        approach.append(mask & shifted(opponent, rows, columns, 2*dr, 2*dc))
+        withdrawal.append(mask & shifted(opponent, rows, columns, -dr, -dc))
+    return np.stack(approach, axis=-1), np.stack(withdrawal, axis=-1)
+
+
+def capturing_moves(matrix, stone, opponent_stone):
+    """
+    returns capturing moves of the player in the same order as Board.capturing_moves
+
+    Parameters
+    ----------
+    matrix : array or list of lists (rows, columns)
+    stone : 1 or 2
+    opponent_stone : 1 or 2
+
+    Returns
+    -------
+    list of Move objects shared with Geometry.moves
+    """
+    approach, withdrawal = capture_masks(matrix, stone, opponent_stone)
+    rows, columns = approach.shape[:2]
+    table = move_table(rows, columns)
+    return [table[index] for index in np.flatnonzero(approach | withdrawal).tolist()]
+
+
+def features(positions):
+    """
+    returns features of many positions at once, the same as counted by Board
+    for every position separately
+
+    Parameters
+    ----------
+    positions : array (N, rows, columns)
+        0 - empty place, 1 - white, 2 - black
+
+    Returns
+    -------
+    dict of arrays:
+        'material' (N, 2) - number of white and black stones
+        'mobility' (N, 2) - number of possible_moves of white and black
+        'threats' (N, 2) - number of capturing_moves of white and black
+        'winner' (N,) - is_winner: 1, 2 or 0 if there is no winner
+    """
+    positions = np.asarray(positions, dtype=np.int8)
+    material = np.stack([(positions == stone).sum(axis=(-2, -1)) for stone in (1, 2)], axis=-1)
+    mobility = np.stack([move_masks(positions, stone).sum(axis=(-3, -2, -1)) for stone in (1, 2)], axis=-1)
+    threats = []
+    for stone in (1, 2):
+        approach, withdrawal = capture_masks(positions, stone, 3 - stone)
+        threats.append((approach | withdrawal).sum(axis=(-3, -2, -1)))
+    winner = np.where(material[..., 0] == 0, 2, np.where(material[..., 1] == 0, 1, 0)).astype(np.int8)
+    return {'material': material, 'mobility': mobility, 'threats': np.stack(threats, axis=-1), 'winner': winner}
@@ -0,0 +1,168 @@
+import threading
+import time
+try:
+    from .engine import GameState, decide_step
+except ImportError:
+    from engine import GameState, decide_step
+
+
+class AIWorker():
+    """
+    A class to choose computer's step in background thread, so the window
+    is not blocked. The game polls the worker for the result.
+
+    ...
+
+    Attributes
+    ----------
+    agent : Agent
+        player who chooses the step
+    max_time : float or None
+        time in seconds after which search of the agent is stopped and
+        its best step found so far is taken
+    stop_event : Event
+        set when search has to end
+    result : (move, capture) or None
+    error : Exception or None
+        exception raised while choosing the step
+    cancelled : bool
+        True if result is not wanted anymore
+
+    Methods
+    -------
+    __init__(agent, max_time):
+        creates worker
+    start(state):
+        starts choosing step for copy of the state
+    poll():
+        returns step if it is chosen or None
+    is_running():
+        returns True if step is being chosen
+    stop():
+        ends search early, its best step will be the result
+    cancel():
+        ends search, result is not wanted
+    progress():
+        returns number of positions searched and time of thinking
+    """
+
+    def __init__(self, agent, max_time=None):
+        """
+        Creates worker of agent.
+
+        Parameters
+        ----------
+        agent : Agent
+        max_time : float or None
+            time limit of one step
+        """
+        self.agent = agent
+        self.max_time = max_time
+        self.stop_event = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._thread = None
+        self._started = None
+
+    def _search(self):
+        """
+        returns search of agent or None if agent does not search
+        """
+        return getattr(self.agent, 'search', None)
+
+    def start(self, state):
+        """
+        starts choosing step of the agent in background thread, the thread
+        works on copy of the board, so the game can draw the board meanwhile
+
+        Parameters
+        ----------
+        state : GameState
+
+        Returns
+        -------
+        None
+        """
+        self.stop_event.clear()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        search = self._search()
+        if search is not None:
+            search.stop_event = self.stop_event
+        state = GameState(state.board.copy())
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(state,), daemon=True)
+        self._thread.start()
+
+    def _run(self, state):
+        """
+        chooses the step, it is run in background thread
+        """
+        try:
+            self.result = decide_step(state, self.agent)
+        except Exception as error:
+            self.error = error
+
+    def is_running(self):
+        """
+        returns True if step is being chosen
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll(self):
+        """
+        returns chosen step or None if it is not chosen yet, stops search
+        when time limit is used up
+
+        Returns
+        -------
+        (move, capture) or None
+        """
+        if self._thread is None or self.cancelled:
+            return None
+        if self._thread.is_alive():
+            if self.max_time is not None and time.perf_counter() - self._started > self.max_time:
+                self.stop()
+            return None
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def stop(self):
+        """
+        ends search early, the best step found so far will be the result
+        """
+        self.stop_event.set()
+
+    def cancel(self, wait=False):
+        """
+        ends search, result is not wanted, for example when the game is closed
+
+        Parameters
+        ----------
+        wait : bool
+            if True it waits till background thread ends
+
+        Returns
+        -------
+        None
+        """
+        self.cancelled = True
+        self.stop_event.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def progress(self):
+        """
+        returns number of positions searched by agent and time of thinking
+
+        Returns
+        -------
+        tuple (nodes, seconds)
+        """
+        search = self._search()
+        nodes = search.nodes if search is not None else 0
+        seconds = time.perf_counter() - self._started if self._started is not None else 0.0
+        return nodes, seconds
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from random import Random
+
+
+class ZobristKeys():
+    """
+    A class to represent random keys used for hashing positions of a board of given size.
+
+    ...
+
+    Attributes
+    ----------
+    stones : tuple
+        stones[r][c][stone] - key of stone (1 or 2) on place (r, c), key of 0 is 0
+    black_turn : int
+        key added when black player moves
+    last_position : tuple
+        last_position[r][c] - key of stone which is capturing from (r, c)
+    forbidden : tuple
+        forbidden[r][c] - key of forbidden place (r, c) in capture chain
+
+    Methods
+    -------
+    __init__(rows, columns, seed):
+        creates keys
+    chain(last_position, forbidden_moves):
+        returns key of capture chain
+    """
+
+    def __init__(self, rows, columns, seed=2022):
+        """
+        Constructs random keys, the same seed gives the same keys.
+
+        Parameters
+        ----------
+        rows : int
+        columns : int
+        seed : int
+        """
+        rng = Random(seed * 100 + rows * 10 + columns)
+
+        def key():
+            return rng.getrandbits(64)
+        self.stones = tuple(tuple((0, key(), key()) for c in range(columns)) for r in range(rows))
+        self.black_turn = key()
+        self.last_position = tuple(tuple(key() for c in range(columns)) for r in range(rows))
+        self.forbidden = tuple(tuple(key() for c in range(columns)) for r in range(rows))
+
+    def chain(self, last_position, forbidden_moves):
+        """
+        returns key of capture chain
+
+        Parameters
+        ----------
+        last_position : (r, c) or None
+            place of stone which is capturing
+        forbidden_moves : list
+            places where the stone cannot go
+
+        Returns
+        -------
+        int
+        """
+        key = 0
+        if last_position is not None:
+            key ^= self.last_position[last_position[0]][last_position[1]]
+        for r, c in set(forbidden_moves):
+            if 0 <= r < len(self.forbidden) and 0 <= c < len(self.forbidden[0]):
+                key ^= self.forbidden[r][c]
+        return key
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(rows, columns):
+    """
+    returns keys for board of given size, they are made only once
+
+    Parameters
+    ----------
+    rows : int
+    columns : int
+
+    Returns
+    -------
+    ZobristKeys
+    """
+    return ZobristKeys(rows, columns)
@@ -0,0 +1,92 @@
+import pytest
+from random import Random
+from src.board import Board
+from src.bitboard import BitBoard
+from src.players import HumanPlayer
+
+
+def random_matrix(rng, rows, columns):
+    return [[rng.choice([0, 0, 1, 2]) for c in range(columns)] for r in range(rows)]
+
+
+def test_init_bitboard():
+    board = BitBoard(5, 5)
+    assert [2, 1, 0, 2, 1] in board.matrix
+    assert board.matrix[2][2] == 0
+    assert board.matrix[0][0] == 2
+    assert board.matrix[4][4] == 1
+    assert bin(board.white).count('1') == 12
+    assert bin(board.black).count('1') == 12
+
+
+def test_set_matrix():
+    board = BitBoard(3, 3)
+    board.matrix = [
+        [0, 0, 0],
+        [1, 2, 2],
+        [2, 1, 1]]
+    assert board.white == 0b110001000
+    assert board.black == 0b001110000
+    board.matrix[1][0] = 0
+    assert board.matrix[1][0] == 0
+    assert [0, 2, 2] in board.matrix
+
+
+def test_is_winner():
+    board = BitBoard(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0]]
+    assert board.is_winner() == 1
+    board.matrix[0][0] = 2
+    assert board.is_winner() is None
+
+
+def test_debug_check(monkeypatch):
+    monkeypatch.setattr(BitBoard, 'debug', True)
+    board = BitBoard(5, 5)
+    board.move_stone((2, 1, 2, 2))
+    board.black ^= 1
+    with pytest.raises(AssertionError):
+        board.is_winner()
+
+
+def test_same_moves_as_board():
+    rng = Random(7)
+    for rows, columns in [(3, 3), (5, 5), (5, 9)]:
+        for _ in range(100):
+            matrix = random_matrix(rng, rows, columns)
+            board = Board(rows, columns)
+            board.matrix = [verse[:] for verse in matrix]
+            bitboard = BitBoard(rows, columns)
+            bitboard.matrix = matrix
+            for stone, opponent_stone in [(1, 2), (2, 1)]:
+                assert board.possible_moves(stone) == bitboard.possible_moves(stone)
+                assert board.capturing_moves(stone, opponent_stone) == \
+                    bitboard.capturing_moves(stone, opponent_stone)
+                for move in board.possible_moves(stone):
+                    assert board.captured_stones(opponent_stone, move) == \
+                        bitboard.captured_stones(opponent_stone, move)
+            assert board.empty_places(1, 1) == bitboard.empty_places(1, 1)
+
+
+def test_capturing_move_on_bitboard():
+    board = BitBoard(5, 5)
+    board.matrix = [
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 2, 0],
+        [0, 1, 2, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0]]
+    player = HumanPlayer(2)
+    assert player.capturing_move(board, (1, 3, 2, 3)) == (2, 3, 1, 3)
+    new_board = [[0, 2, 0, 0, 0],
+                 [0, 0, 0, 0, 0],
+                 [0, 1, 2, 2, 0],
+                 [0, 0, 0, 0, 0],
+                 [0, 1, 0, 0, 0]]
+    for row in new_board:
+        assert row in board.matrix
@@ -1,4 +1,6 @@
+import pytest
 from src.board import Board
+from src.engine import GameState, RandomAgent, play_game
 from config import SQUARESIZE
 
 
@@ -12,6 +14,15 @@ def test_init_board():
     assert board.board_position_y == SQUARESIZE//2
 
 
+def test_places_are_converted_once():
+    board = Board(5, 5)
+    places = board.places()
+    assert type(places) is list and type(places[0]) is list
+    assert board.places() is places
+    board.make_move((2, 1, 2, 2), 1)
+    assert board.places() is places
+
+
 def test_is_winner_1():
     board = Board(5, 5)
     board.matrix = [
@@ -109,3 +120,108 @@ def test_empty_places():
     assert (3, 4) in board.empty_places(2, 4)
     assert (2, 3) in board.empty_places(2, 4)
     assert len(board.empty_places(2, 4)) == 3
+
+
+def test_make_unmake_move():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 2, 0, 0, 0],
+        [0, 2, 0, 2, 0],
+        [0, 1, 2, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 2, 0, 1, 0]]
+    start = board.hash
+    record = board.make_move((2, 1, 3, 1), 1)
+    assert record == ((2, 1, 3, 1), ((1, 1), (0, 1)))
+    assert [0, 0, 0, 0, 0] in board.matrix
+    assert board.matrix[3][1] == 1
+    board.unmake_move(record)
+    assert board.hash == start
+    assert [0, 2, 0, 0, 0] in board.matrix
+    assert [0, 1, 2, 0, 0] in board.matrix
+    assert board.matrix[3][1] == 0
+
+
+def test_make_move_paika():
+    board = Board(3, 3)
+    matrix = board.matrix
+    record = board.make_move((2, 1, 1, 1))
+    assert record == ((2, 1, 1, 1), ())
+    assert board.matrix is matrix
+    assert board.matrix[1][1] == 1
+    board.unmake_move(record)
+    assert board.matrix[1][1] == 0
+    assert board.matrix[2][1] == 1
+
+
+def test_counts():
+    board = Board(5, 5)
+    assert board.counts == [1, 12, 12]
+    record = board.make_move((2, 1, 2, 2), 1)
+    assert board.count(1) == 12
+    assert board.count(2) == 11
+    board.unmake_move(record)
+    assert board.count(2) == 12
+    board.remove_stones([(r, c) for r in range(3) for c in range(5) if board.place(r, c) == 2])
+    assert board.is_winner() == 1
+
+
+def test_counts_follow_matrix_writes():
+    assert not Board.debug
+    board = Board(5, 5)
+    for r in range(5):
+        for c in range(5):
+            if board.matrix[r][c] == 2:
+                board.matrix[r][c] = 0
+    assert board.counts == [13, 12, 0]
+    assert board.is_winner() == 1
+    board.matrix[0][0] = 2
+    assert board.count(2) == 1
+    assert board.is_winner() is None
+
+
+def test_debug_check(monkeypatch):
+    monkeypatch.setattr(Board, 'debug', True)
+    state = GameState.new(5, 5)
+    play_game(state, {1: RandomAgent(1), 2: RandomAgent(2)}, 50)
+    board = state.board.copy()
+    places = board.places()
+    places[0][0] = 3 - places[0][0] if places[0][0] else 1
+    with pytest.raises(AssertionError):
+        board.is_winner()
+
+
+def test_matrix_write_goes_through_board():
+    board = Board(5, 5)
+    assert board.capturing_moves(1, 2)
+    assert board.captured_stones(2, (2, 1, 2, 2)) != ([], [])
+    for r in range(5):
+        for c in range(5):
+            if board.matrix[r][c] == 2:
+                board.matrix[r][c] = 0
+    assert board.capturing_moves(1, 2) == []
+    assert board.captured_stones(2, (2, 1, 2, 2)) == ([], [])
+    assert board.hash == board._computed()[0]
+
+
+def test_moves_cache():
+    board = Board(5, 5)
+    moves = board.capturing_moves(1, 2)
+    assert board.capturing_moves(1, 2) is moves
+    captured = board.captured_stones(2, moves[0])
+    assert board.captured_stones(2, moves[0]) is captured
+    stats = board.cache_stats()
+    assert stats['hits'] == 2
+    assert 0 < stats['hit_rate'] < 1
+    version = board.version
+    board.move_stone(moves[0])
+    assert board.version > version
+    assert board.capturing_moves(1, 2) is not moves
+    assert moves[0] not in board.possible_moves(1)
+
+
+def test_moves_cache_disabled(monkeypatch):
+    monkeypatch.setattr(Board, 'caching', False)
+    board = Board(5, 5)
+    assert board.capturing_moves(1, 2) is not board.capturing_moves(1, 2)
+    assert board.cache_stats()['hits'] == 0
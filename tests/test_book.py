@@ -0,0 +1,33 @@
+from src.board import Board
+from src.engine import GameState, play_step, turn_steps
+from src.players import Computer
+from src.book import OpeningBook, build, write, encode_turn, decode_turn, path_of
+from src.config import DATA_DIR
+
+
+def test_encode_turn():
+    steps = (((2, 3, 2, 4), 1), ((2, 4, 1, 3), 0), ((1, 3, 0, 3), None))
+    assert decode_turn(encode_turn(steps, 9), 9) == steps
+
+
+def test_book(tmp_path):
+    book = build(5, 5, turns=3, depth=2)
+    path = str(tmp_path / 'books' / 'openings.book')
+    write(path, 5, 5, book)
+    opened = OpeningBook(path, seed=1)
+    board = Board(5, 5)
+    assert opened.turns(board) == book[board.hash]
+    steps = opened.best_turn(board, 1)
+    assert steps in turn_steps(board.copy(), 1)
+    assert opened.best_turn(board, 2) is None
+    assert opened.turns(Board(5, 9)) == []
+    state = GameState(Board(5, 5).copy())
+    player = Computer(1, 'Hard', book=opened)
+    play_step(state, player)
+    played = tuple((state.turns[-1] if state.turns else state.current_turn).steps)
+    assert any(steps[:len(played)] == played for steps, _ in book[board.hash])
+    opened.close()
+
+
+def test_default_path_in_data_dir():
+    assert path_of(5, 9).startswith(DATA_DIR)
@@ -0,0 +1,39 @@
+import numpy as np
+from src.board import Board
+from src.dataset import Extractor, merge, run
+from src.record import GameRecord
+from src.tournament import run_tournament
+
+
+def test_extractor():
+    extractor = Extractor(3, 3)
+    record = GameRecord.parse('3x3 a3b2A b1c1 b2a3W a2b2Ac1Wc2A b3b2 a1a2 b2c1 c2c3W 0-1')
+    assert extractor.add(record)
+    assert not extractor.add(GameRecord.parse('3x3 a3b2A'))
+    assert not extractor.add(GameRecord.parse('5x5 d4c3A 1-0'))
+    assert extractor.add(record)
+    samples = extractor.samples()
+    assert extractor.positions == 16
+    assert len(samples) == 8
+    assert samples['count'].tolist() == [2] * 8
+    assert samples['label'].tolist() == [-1.0, 1.0] * 4
+    assert samples['position'][0].tolist() == [list(verse) for verse in Board(3, 3).matrix]
+    assert samples['stone'].tolist() == [1, 2] * 4
+
+
+def test_run(tmp_path):
+    paths = []
+    for seed in range(2):
+        path = str(tmp_path / f'games_{seed}.txt')
+        run_tournament(['Random', 'Easy'], ['5x5'], 2, workers=0, seed=seed, record=path)
+        paths.append(path)
+    stats = run(paths, str(tmp_path / 'positions'), 5, 5, workers=0)
+    assert stats['games'] == 8
+    samples = np.load(stats['output'])
+    assert len(samples) == stats['unique'] == len(np.unique(samples['hash']))
+    assert samples['count'].sum() == stats['positions']
+    assert np.all(np.abs(samples['label']) <= 1)
+    shard = np.load(stats['shards'][0])
+    twice = merge([shard, shard])
+    assert len(twice) == len(shard)
+    assert twice['count'].sum() == 2 * shard['count'].sum()
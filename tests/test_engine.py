@@ -0,0 +1,74 @@
+import pytest
+from src.board import Board
+from src.engine import GameState, RandomAgent, play_game, play_step
+from src.players import Computer
+
+
+def chain_state():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [1, 0, 2, 0, 0]]
+    return GameState(board)
+
+
+def test_legal_moves_start():
+    state = GameState.new(5, 5)
+    assert state.stone_turn() == 1
+    assert state.legal_moves() == state.board.capturing_moves(1, 2)
+
+
+def test_play_capture_chain():
+    state = chain_state()
+    assert state.play((4, 0, 4, 1)) is False
+    assert state.board.last_position == (4, 1)
+    assert state.board.forbidden_moves == ((4, 0), (4, 2))
+    assert state.legal_moves() == [(4, 1, 3, 1)]
+    assert state.play((4, 1, 3, 1)) is True
+    assert state.stone_turn() == 2
+    assert state.winner() == 1
+    turn = state.turns[0]
+    assert turn.steps == [((4, 0, 4, 1), 0), ((4, 1, 3, 1), 0)]
+    assert turn.captured_stones == [(4, 2), (2, 1)]
+    assert not turn.is_paika()
+
+
+def test_illegal_move():
+    state = chain_state()
+    with pytest.raises(ValueError):
+        state.play((4, 0, 3, 0))
+
+
+def test_capture_must_be_chosen():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 2, 0, 0, 0],
+        [0, 2, 0, 2, 0],
+        [0, 1, 2, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 2, 0, 1, 0]]
+    state = GameState(board)
+    with pytest.raises(ValueError):
+        state.play((2, 1, 3, 1))
+    state.play((2, 1, 3, 1), 0)
+    assert board.matrix[4][1] == 0
+    assert board.matrix[1][1] == 2
+
+
+def test_random_self_play():
+    for seed in range(5):
+        state = GameState.new(5, 9)
+        winner = play_game(state, {1: RandomAgent(seed), 2: RandomAgent(seed + 1)}, max_turns=500)
+        assert winner == state.winner()
+        assert [turn.stone for turn in state.turns[:2]] == [1, 2]
+
+
+def test_computer_is_agent():
+    state = chain_state()
+    player = Computer(1, 'Hard')
+    assert play_step(state, player) is False
+    assert play_step(state, player) is True
+    assert state.winner() == 1
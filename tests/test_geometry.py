@@ -0,0 +1,28 @@
+from src.geometry import geometry
+
+
+def test_geometry_is_cached():
+    assert geometry(5, 9) is geometry(5, 9)
+    assert geometry(5, 5) is not geometry(5, 9)
+
+
+def test_steps():
+    lines = geometry(3, 3)
+    assert lines.steps[0][0] == ((0, 1), (1, 0), (1, 1))
+    assert lines.steps[0][1] == ((0, 0), (0, 2), (1, 1))
+    assert len(lines.steps[1][1]) == 8
+    assert len(lines.diagonal_moves) == 5
+
+
+def test_rays():
+    lines = geometry(5, 5)
+    approach, withdrawal = lines.rays[(2, 2, 2, 3)]
+    assert approach == ((2, 4),)
+    assert withdrawal == ((2, 1), (2, 0))
+    assert (2, 1, 1, 2) not in lines.rays
+
+
+def test_around():
+    lines = geometry(5, 5)
+    assert lines.around[0][0] == ((0, 1), (1, 0), (1, 1))
+    assert len(lines.around[2][2]) == 8
@@ -0,0 +1,79 @@
+import threading
+import time
+from random import Random
+from src.board import Board
+from src.engine import GameState, play_turn
+from src.mcts import MCTS, random_playout
+from src.players import Computer
+
+
+def test_random_playout_restores_board():
+    board = Board(5, 9).copy()
+    start = board.hash
+    rows = [list(verse) for verse in board.matrix]
+    winner = random_playout(board, 1, Random(3))
+    assert winner in (1, 2, None)
+    assert board.hash == start
+    assert [list(verse) for verse in board.matrix] == rows
+
+
+def test_mcts_finds_winning_turn():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [1, 0, 2, 0, 0]]
+    search = MCTS(playouts=200, seed=1)
+    assert search.best_turn(board, 1) == (((4, 0, 4, 1), 0), ((4, 1, 3, 1), 0))
+
+
+def test_mcts_tree_reuse():
+    board = Board(5, 5).copy()
+    search = MCTS(playouts=100, seed=2)
+    steps = search.best_turn(board, 1)
+    play_turn(board, steps)
+    reply = search.best_turn(board, 2)
+    play_turn(board, reply)
+    visits = search.root.find(board.hash, 2).visits
+    search.best_turn(board, 1)
+    assert search.root.visits == visits + 100
+
+
+def test_mcts_workers():
+    board = Board(3, 3)
+    search = MCTS(playouts=40, seed=4, workers=2)
+    try:
+        statistics = search.statistics(board, 1)
+        assert search.nodes == 40
+        assert sum(visits for visits, wins in statistics.values()) == 40
+        assert search.root.visits == 40
+        executor = search._executor
+        search.statistics(board, 1)
+        assert search._executor is executor
+        assert search.root.visits == 80
+    finally:
+        search.close()
+    assert search._executor is None
+
+
+def test_mcts_workers_stop():
+    board = Board(5, 9)
+    search = MCTS(playouts=None, seed=5, workers=2)
+    search.stop_event = threading.Event()
+    timer = threading.Timer(0.3, search.stop_event.set)
+    timer.start()
+    start = time.perf_counter()
+    try:
+        assert search.best_turn(board, 1) is not None
+    finally:
+        timer.cancel()
+        search.close()
+    assert time.perf_counter() - start < 10
+
+
+def test_mcts_computer():
+    state = GameState.new(5, 5)
+    player = Computer(1, 'MCTS', max_time=None, playouts=50)
+    assert player.choose_move(state, state.legal_moves()) in state.legal_moves()
@@ -0,0 +1,64 @@
+import pickle
+from src.board import Board
+from src.bitboard import BitBoard
+from src.moves import Move, CaptureResult, NO_CAPTURE, Chain
+
+
+def test_move_is_tuple():
+    move = Move(2, 1, 2, 2)
+    assert move == (2, 1, 2, 2)
+    assert hash(move) == hash((2, 1, 2, 2))
+    assert (move.r1, move.c1, move.r2, move.c2) == (2, 1, 2, 2)
+    assert not hasattr(move, '__dict__')
+    assert pickle.loads(pickle.dumps(move)) == move
+
+
+def test_moves_are_shared():
+    for board in (Board(5, 5), BitBoard(5, 5)):
+        board.caching = False
+        moves = board.possible_moves(1)
+        again = board.possible_moves(1)
+        assert all(isinstance(move, Move) for move in moves)
+        assert all(first is second for first, second in zip(moves, again))
+
+
+def test_capture_result():
+    for board in (Board(5, 5), BitBoard(5, 5)):
+        captured = board.captured_stones(2, (2, 1, 2, 2))
+        assert isinstance(captured, CaptureResult)
+        assert captured.approach == 1
+        assert captured.withdrawal == 1
+        assert captured.count(1) == 1
+        assert captured.stones(1) == ((2, 0),)
+        assert captured == ([(2, 3)], [(2, 0)])
+        approach, withdrawal = captured
+        assert withdrawal == [(2, 0)]
+        assert captured[0] == [(2, 3)]
+        assert board.captured_stones(2, (3, 2, 2, 2)) == ([(1, 2), (0, 2)], [])
+    assert NO_CAPTURE == ([], [])
+
+
+def test_chain():
+    chain = Chain(9).step((2, 1, 2, 2))
+    assert chain.position == (2, 2)
+    assert (2, 1) in chain
+    assert (2, 3) in chain
+    assert (1, 2) not in chain
+    assert tuple(chain) == ((2, 1), (2, 3))
+    chain = chain.step((2, 2, 1, 2))
+    assert (2, 1) in chain
+    assert (2, 2) in chain
+    assert (0, 2) in chain
+    assert (2, 3) not in chain
+    assert len(chain) == 3
+
+
+def test_chain_from_places():
+    board = Board(5, 9)
+    board.set_chain((2, 2), [(2, 1), (2, 3)])
+    assert isinstance(board.chain, Chain)
+    assert board.chain.direction == (0, 1)
+    assert board.forbidden_moves == ((2, 1), (2, 3))
+    board.end_turn()
+    assert board.chain.position is None
+    assert (2, 1) not in board.chain
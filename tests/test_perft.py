@@ -0,0 +1,38 @@
+import pytest
+from src.perft import perft, divide, start_board, run
+
+
+REFERENCE = {
+    (3, 3): [4, 7, 13, 40, 64, 104, 256, 488],
+    (5, 5): [5, 12, 69, 601, 3123],
+    (5, 9): [5, 21, 223, 2844],
+}
+
+
+@pytest.mark.parametrize('backend', ['board', 'bitboard'])
+@pytest.mark.parametrize('size', sorted(REFERENCE))
+def test_perft_reference_counts(size, backend):
+    for depth, nodes in enumerate(REFERENCE[size], 1):
+        board = start_board(size[0], size[1], backend)
+        assert perft(board, depth) == nodes
+
+
+def test_perft_restores_board():
+    board = start_board(5, 9)
+    matrix = [list(verse) for verse in board.matrix]
+    start = board.hash
+    perft(board, 3)
+    assert board.hash == start
+    assert [list(verse) for verse in board.matrix] == matrix
+
+
+def test_divide():
+    board = start_board(5, 5)
+    counts = divide(board, 3)
+    assert len(counts) == REFERENCE[(5, 5)][0]
+    assert sum(counts.values()) == REFERENCE[(5, 5)][2]
+
+
+def test_run():
+    results = run(3, 3, 4)
+    assert [result[1] for result in results] == REFERENCE[(3, 3)][:4]
@@ -1,5 +1,8 @@
+import pygame
 from src.players import HumanPlayer, Computer
 from src.board import Board
+from src.engine import GameState
+from config import width, height
 
 
 def test_paika_move():
@@ -404,3 +407,21 @@ def test_best_drawing2():
     for row in new_board:
         assert row in board.matrix
 
+
+def test_click_move(monkeypatch):
+    monkeypatch.setattr("src.board.screen", pygame.Surface((width, height)))
+    state = GameState(Board(3, 3).copy())
+    player = HumanPlayer(1)
+    moves = state.legal_moves()
+    player.start_move(state, moves)
+    assert player.click_move(state, 1, 1) is None
+    assert player.click_move(state, 2, 1) is None
+    assert player.click_move(state, 1, 1) == (2, 1, 1, 1)
+
+
+def test_click_capture():
+    player = HumanPlayer(1)
+    captured_stones = ([(0, 1), (1, 1)], [(4, 1)])
+    assert player.click_capture(captured_stones, 1, 1) == 0
+    assert player.click_capture(captured_stones, 4, 1) == 1
+    assert player.click_capture(captured_stones, 2, 2) is None
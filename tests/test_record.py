@@ -0,0 +1,87 @@
+import io
+import pygame
+from src.board import Board
+from src.engine import GameState, RandomAgent, play_game
+from src.players import Computer
+from src.record import GameRecord, GameWriter, format_turn, parse_turn, read_games, replay
+from config import width, height
+
+
+def test_turn_notation():
+    steps = (((2, 2, 2, 3), 0), ((2, 3, 1, 4), 1))
+    assert format_turn(steps) == 'c3d3Ae2W'
+    assert parse_turn('c3d3Ae2W') == steps
+    assert format_turn((((0, 0, 1, 1), None),)) == 'a1b2'
+    assert parse_turn('a1b2') == (((0, 0, 1, 1), None),)
+
+
+def test_game_line():
+    record = GameRecord.parse('5x9 c3d3A e2e3W 0-1\n')
+    assert (record.rows, record.columns, record.winner, record.finished) == (5, 9, 2, True)
+    assert record.format() == '5x9 c3d3A e2e3W 0-1'
+    unfinished = GameRecord.parse('3x3 a1b2')
+    assert not unfinished.finished
+    assert unfinished.winner is None
+
+
+def test_write_and_replay_games():
+    text = io.StringIO()
+    writer = GameWriter(text)
+    finals = []
+    for seed in range(3):
+        state = GameState(Board(5, 5).copy(), writer)
+        writer.start(5, 5)
+        winner = play_game(state, {1: RandomAgent(seed), 2: RandomAgent(seed + 10)}, max_turns=60)
+        writer.end(winner)
+        finals.append((winner, len(state.turns), [list(verse) for verse in state.board.matrix]))
+    writer.start(5, 5)
+    writer.close()
+    assert writer.games == 3
+    games = read_games(io.StringIO(text.getvalue()))
+    for (winner, turns, matrix), record in zip(finals, games):
+        assert record.winner == winner
+        assert len(record.turns) == turns
+        for steps, board in replay(record):
+            pass
+        assert [list(verse) for verse in board.matrix] == matrix
+    assert not next(games).finished
+
+
+def test_writer_moves_full_file(tmp_path):
+    path = str(tmp_path / 'games.txt')
+    record = GameRecord.parse('3x3 a1b2 b2c3 1-0')
+    writer = GameWriter(path, max_size=30)
+    for _ in range(3):
+        writer.write(record)
+    writer.close()
+    old = [game.format() for game in read_games(path + '.1')]
+    new = [game.format() for game in read_games(path)]
+    assert old == [record.format()] * 2
+    assert new == [record.format()]
+
+
+def test_make_turn_is_recorded(monkeypatch):
+    monkeypatch.setattr("src.board.screen", pygame.Surface((width, height)))
+    monkeypatch.setattr(pygame.time, 'delay', lambda time: None)
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 2, 0],
+        [0, 1, 2, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0]]
+    text = io.StringIO()
+    player = Computer(1, 'Hard')
+    player.recorder = GameWriter(text)
+    player.make_turn(board)
+    steps = parse_turn(text.getvalue().split()[0])
+    replayed = Board(5, 5)
+    replayed.matrix = [
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 2, 0],
+        [0, 1, 2, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0]]
+    for move, capture in steps:
+        replayed.make_move(move, capture)
+    assert replayed.matrix == board.matrix
@@ -0,0 +1,73 @@
+import pygame
+from src.board import Board
+import config
+from src.renderer import Renderer, SpriteCache
+from config import SQUARESIZE, width, height, WHITE, BLACK, RED
+
+
+def surface():
+    return pygame.Surface((width, height))
+
+
+def color_at(renderer, r, c):
+    return tuple(renderer.surface.get_at(renderer.place_rect(r, c).center))[:3]
+
+
+def test_first_draw_is_full():
+    board = Board(5, 5)
+    renderer = Renderer(board, surface())
+    drawn = renderer.draw()
+    assert len(drawn) == 1
+    assert drawn[0].size == (5*SQUARESIZE, 5*SQUARESIZE)
+    assert color_at(renderer, 0, 0) == BLACK
+    assert color_at(renderer, 4, 4) == WHITE
+    assert renderer.flush() == drawn
+    assert renderer.draw() == []
+
+
+def test_only_changed_places_are_drawn():
+    board = Board(5, 5).copy()
+    renderer = Renderer(board, surface())
+    renderer.draw()
+    board.make_move((2, 1, 2, 2), 1)
+    drawn = renderer.draw()
+    assert len(drawn) == 3
+    assert color_at(renderer, 2, 2) == WHITE
+    assert color_at(renderer, 2, 0) != BLACK
+    full = Renderer(board, surface())
+    full.draw()
+    assert pygame.image.tostring(renderer.surface, 'RGB') == pygame.image.tostring(full.surface, 'RGB')
+
+
+def test_highlights():
+    board = Board(3, 3)
+    renderer = Renderer(board, surface())
+    renderer.draw()
+    renderer.set_highlights([(2, 1)], [(0, 1)])
+    assert len(renderer.draw()) == 2
+    assert color_at(renderer, 0, 1) == RED
+    renderer.set_highlights()
+    assert len(renderer.draw()) == 2
+    assert color_at(renderer, 0, 1) == BLACK
+
+
+def test_sprite_cache():
+    cache = SpriteCache()
+    stone = cache.stone(1)
+    assert cache.stone(1) is stone
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert stone.get_flags() & pygame.SRCALPHA
+    assert tuple(stone.get_at((0, 0)))[3] == 0
+    assert tuple(stone.get_at((SQUARESIZE//2, SQUARESIZE//2)))[:3] == WHITE
+
+
+def test_sprite_cache_config_changed(monkeypatch):
+    board = Board(3, 3)
+    renderer = Renderer(board, surface(), SpriteCache())
+    renderer.draw()
+    stone = renderer.sprites.stone(2)
+    monkeypatch.setattr(config, 'BLACK', (10, 20, 30))
+    assert renderer.sprites.stone(2) is not stone
+    assert len(renderer.draw()) == 1
+    assert color_at(renderer, 0, 0) == (10, 20, 30)
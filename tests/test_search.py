@@ -0,0 +1,124 @@
+from src.board import Board
+from src.players import Computer
+from src.engine import turns
+from src.search import AlphaBeta, Evaluation, count_stones
+
+
+def test_turns_paika():
+    board = Board(3, 3)
+    board.matrix = [
+        [0, 2, 0],
+        [0, 0, 0],
+        [0, 0, 1]]
+    all_turns = list(turns(board, 1))
+    assert len(all_turns) == 3
+    for steps, child in all_turns:
+        assert len(steps) == 1
+        assert steps[0][1] is None
+        assert count_stones(child, 1) == 1
+    assert board.matrix[2][2] == 1
+
+
+def test_turns_capture_chain():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [1, 0, 2, 0, 0]]
+    all_turns = list(turns(board, 1))
+    steps, child = all_turns[0]
+    assert len(all_turns) == 1
+    assert steps == (((4, 0, 4, 1), 0), ((4, 1, 3, 1), 0))
+    assert child.is_winner() == 1
+
+
+def test_turns_forbidden_places():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 2, 0, 2],
+        [1, 0, 0, 0, 0]]
+    for steps, child in turns(board, 1):
+        places = [(move[0], move[1]) for move, capture in steps]
+        assert len(places) == len(set(places))
+
+
+def test_evaluation():
+    board = Board(5, 5)
+    assert Evaluation()(board, 1) == -Evaluation()(board, 2)
+    assert Evaluation(mobility=0, threats=0)(board, 1) == 0
+
+
+def test_alpha_beta_captures_more():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [2, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [1, 0, 2, 2, 0]]
+    search = AlphaBeta(depth=2)
+    steps = search.best_turn(board, 1)
+    assert steps == (((4, 0, 4, 1), 0),)
+    assert search.nodes > 0
+
+
+def test_alpha_beta_node_budget():
+    board = Board(5, 9)
+    search = AlphaBeta(depth=4, max_nodes=50)
+    steps = search.best_turn(board, 1)
+    assert steps is not None
+    assert search.nodes <= 51
+
+
+def test_expert_first_move(monkeypatch):
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [1, 0, 2, 0, 0]]
+    monkeypatch.setattr('src.players.pygame.time.delay', lambda t: None)
+    player = Computer(1, 'Expert', depth=2)
+    assert player.first_move(board) == (4, 1, 4, 0)
+    assert player.next_turn(board, (4, 1), [(4, 0), (4, 2)]) == (3, 1, 4, 1)
+    assert board.is_winner() == 1
+
+
+def test_iterative_deepening_statistics():
+    board = Board(5, 9)
+    search = AlphaBeta(depth=3)
+    steps = search.best_turn(board, 1)
+    assert [iteration[0] for iteration in search.iterations] == [1, 2, 3]
+    assert sum(iteration[1] for iteration in search.iterations) == search.nodes
+    assert search.iterations[-1][4] == steps
+    assert search.pv[0] == steps
+    assert search.effective_branching_factor() > 0
+    assert 'depth 3' in search.report()
+
+
+def test_ordering_does_not_change_value():
+    board = Board(5, 9)
+    ordered = AlphaBeta(depth=3)
+    unordered = AlphaBeta(depth=3, ordering=False)
+    ordered.best_turn(board, 1)
+    unordered.best_turn(board, 1)
+    assert ordered.iterations[-1][3] == unordered.iterations[-1][3]
+    assert ordered.nodes <= unordered.nodes
+
+
+def test_order_by_captured_stones():
+    search = AlphaBeta()
+    small = (((0, 0, 0, 1), 0),)
+    big = (((1, 1, 1, 2), 1),)
+    paika = (((2, 2, 2, 3), None),)
+    all_turns = [paika, small, big]
+    search.order(all_turns, {small: 1, big: 3}, 1, 0, None)
+    assert all_turns == [big, small, paika]
+    search.order(all_turns, {small: 1, big: 3}, 1, 0, paika)
+    assert all_turns[0] == paika
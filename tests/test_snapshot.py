@@ -0,0 +1,98 @@
+import pytest
+from src.bitboard import BitBoard
+from src.board import Board
+from src.geometry import DIRECTIONS
+from src.moves import Chain
+from src.snapshot import HEADER, NONE, Snapshot
+
+
+def chain_board(board_class):
+    board = board_class(5, 9).copy()
+    board.make_move((2, 3, 2, 4), 0)
+    board.set_chain((2, 4), Chain(9).step((2, 3, 2, 4)))
+    return board
+
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_round_trip_in_capture_chain(board_class):
+    board = chain_board(board_class)
+    data = Snapshot(board, 2, 3).dumps()
+    assert len(data) == 30
+    for loaded_class in (Board, BitBoard):
+        snapshot = Snapshot.loads(data, loaded_class)
+        loaded = snapshot.board
+        assert isinstance(loaded, loaded_class)
+        assert (snapshot.stone, snapshot.opponent) == (2, 3)
+        assert [list(verse) for verse in loaded.matrix] == [list(verse) for verse in board.matrix]
+        assert loaded.stone_turn == board.stone_turn
+        assert loaded.last_position == (2, 4)
+        assert loaded.forbidden_moves == board.forbidden_moves
+        assert loaded.counts == board.counts
+        assert loaded.hash == board.hash
+
+
+def test_round_trip_after_turn():
+    board = BitBoard(3, 3).copy()
+    board.make_move((1, 1, 0, 1))
+    board.end_turn()
+    loaded = Snapshot.loads(Snapshot(board).dumps(), BitBoard).board
+    assert loaded.stone_turn == 2
+    assert loaded.last_position is None
+    assert loaded.hash == board.hash
+
+
+def test_bitboard_hash_from_masks():
+    board = chain_board(BitBoard)
+    assert board._computed() == Board._computed(board)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'snapshot.bin')
+    board = chain_board(Board)
+    Snapshot(board, 1, 2).save(path)
+    assert not (tmp_path / 'snapshot.bin.tmp').exists()
+    snapshot = Snapshot.load(path, Board)
+    assert snapshot.board.hash == board.hash
+    assert snapshot.opponent == 2
+
+
+def test_missing_or_broken_snapshot(tmp_path):
+    path = tmp_path / 'snapshot.bin'
+    assert Snapshot.load(str(path)) is None
+    path.write_bytes(Snapshot(Board(5, 9)).dumps()[:-1])
+    assert Snapshot.load(str(path)) is None
+    path.write_bytes(b'FANORONA' * 4)
+    assert Snapshot.load(str(path)) is None
+
+
+@pytest.mark.parametrize('field, value', [
+    (1, 4), (2, 11), (3, 0), (3, 50), (4, 45), (4, 100), (5, len(DIRECTIONS)), (5, 20),
+    (6, 7), (7, 4), (7, 9)])
+def test_corrupted_header(tmp_path, field, value):
+    data = bytearray(Snapshot(chain_board(Board), 1, 2).dumps())
+    data[field + 3] = value
+    with pytest.raises(ValueError):
+        Snapshot.loads(bytes(data))
+    path = tmp_path / 'snapshot.bin'
+    path.write_bytes(bytes(data))
+    assert Snapshot.load(str(path), Board) is None
+
+
+def test_direction_without_place():
+    board = Board(5, 9)
+    data = bytearray(Snapshot(board).dumps())
+    assert data[4 + 3] == NONE
+    data[5 + 3] = 0
+    with pytest.raises(ValueError):
+        Snapshot.loads(bytes(data))
+
+
+def test_wrong_stones():
+    board = BitBoard(3, 3)
+    board.set_stones(0b111, 0b100)
+    with pytest.raises(ValueError):
+        Snapshot.loads(Snapshot(board).dumps())
+    data = bytearray(Snapshot(BitBoard(3, 3)).dumps())
+    data[HEADER.size + 1] |= 0x80
+    with pytest.raises(ValueError):
+        Snapshot.loads(bytes(data))
@@ -0,0 +1,51 @@
+import pytest
+from src.board import Board
+from src.engine import GameState, play_step
+from src.players import Computer
+from src.config import DATA_DIR
+from src.tablebase import Indexer, Tablebase, path_of, solve, write
+
+
+@pytest.fixture(scope='module')
+def tablebase(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('tablebase') / 'tablebases' / '3x3.tb')
+    write(path, 3, 3, 4, solve(3, 3, 4))
+    tablebase = Tablebase(path)
+    yield tablebase
+    tablebase.close()
+
+
+def test_index_is_perfect():
+    indexer = Indexer(3, 3, 4)
+    indices = set()
+    for white, black in indexer.materials():
+        for matrix in indexer.positions(white, black):
+            indices.add(indexer.index(matrix, 1))
+            indices.add(indexer.index(matrix, 2))
+    assert indices == set(range(indexer.size))
+    assert indexer.index([[1, 1, 1], [2, 2, 0], [0, 0, 0]], 1) is None
+
+
+def test_probe(tablebase):
+    board = Board(3, 3)
+    board.matrix = [[0, 0, 0], [2, 1, 0], [0, 0, 0]]
+    assert tablebase.probe(board) == (1, 1)
+    board.end_turn()
+    assert tablebase.probe(board) == (-1, 2)
+    board.matrix = [[2, 0, 0], [0, 0, 0], [0, 0, 1]]
+    assert tablebase.probe(board) is not None
+    assert tablebase.probe(Board(5, 5)) is None
+
+
+def test_computer_plays_perfect_turn(tablebase):
+    board = Board(3, 3)
+    board.matrix = [[0, 0, 0], [2, 1, 0], [0, 0, 0]]
+    state = GameState(board)
+    player = Computer(1, 'Hard', tablebase=tablebase)
+    assert player.planned_turn(board) == [((1, 1, 1, 2), 1)]
+    play_step(state, player)
+    assert state.winner() == 1
+
+
+def test_default_path_in_data_dir():
+    assert path_of(5, 9).startswith(DATA_DIR)
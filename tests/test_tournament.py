@@ -0,0 +1,38 @@
+from src.tournament import run_tournament, schedule, play_match, TournamentResult
+from src.record import read_games
+
+
+def test_schedule():
+    matches = schedule(['Easy', 'Hard'], ['3x3', '5x5'], 3)
+    assert len(matches) == 12
+    assert len({match[3] for match in matches}) == 12
+    assert ('3x3', 'Easy', 'Hard') == matches[0][:3]
+
+
+def test_play_match_is_repeatable():
+    game = ('5x5', 'Easy', 'Random', 11, 200, True)
+    assert play_match(game) == play_match(game)
+
+
+def test_table_and_elo():
+    results = [('5x5', 'A', 'B', 1, 10, 12)] * 3 + [('5x5', 'B', 'A', None, 300, 320)]
+    result = TournamentResult(results, 2.0)
+    assert result.table()[('A', 'B')] == [3, 1, 0]
+    assert result.table()[('B', 'A')] == [0, 1, 3]
+    elo = result.elo()
+    assert elo['A'] > 1500 > elo['B']
+    assert result.games_per_second() == 2.0
+
+
+def test_run_tournament():
+    result = run_tournament(['Random', 'Easy'], ['3x3'], 2, workers=2)
+    assert len(result.results) == 4
+    assert 'Elo' in result.report()
+
+
+def test_tournament_record(tmp_path):
+    path = str(tmp_path / 'games.txt')
+    result = run_tournament(['Random', 'Easy'], ['3x3'], 1, workers=0, record=path)
+    games = list(read_games(path))
+    assert len(games) == 2
+    assert [game.winner for game in games] == [winner for _, _, _, winner, _, _ in result.results]
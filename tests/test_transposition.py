@@ -0,0 +1,31 @@
+from src.transposition import TranspositionTable, EXACT, LOWER
+
+
+def test_size_is_power_of_two():
+    assert TranspositionTable(1000).size == 1024
+    assert TranspositionTable(1024).size == 1024
+
+
+def test_probe_and_store():
+    table = TranspositionTable(16)
+    assert table.probe(5) is None
+    table.store(5, 2, 10, EXACT, 'turn')
+    assert table.probe(5) == (5, 2, 10, EXACT, 'turn')
+    assert table.probe(21) is None
+    stats = table.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['collisions'] == 1
+    assert stats['used'] == 1
+
+
+def test_depth_preferred_replacement():
+    table = TranspositionTable(16)
+    table.store(5, 3, 10, EXACT, None)
+    table.store(21, 1, 20, LOWER, None)
+    assert table.probe(5)[2] == 10
+    assert table.rejected == 1
+    table.store(21, 4, 30, LOWER, None)
+    assert table.probe(21)[2] == 30
+    table.store(21, 1, 40, EXACT, None)
+    assert table.probe(21)[2] == 40
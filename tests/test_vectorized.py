@@ -0,0 +1,71 @@
+from random import Random
+import numpy as np
+from src.board import Board
+from src.perft import perft
+from src.search import Evaluation, count_stones
+from src.vectorized import capturing_moves, capture_masks, move_masks, features
+
+
+def random_board(rng, rows, columns):
+    board = Board(rows, columns)
+    board.matrix = np.array([[rng.choice((0, 0, 1, 2)) for _ in range(columns)]
+                             for _ in range(rows)], dtype=np.int8)
+    return board
+
+
+def test_same_capturing_moves():
+    rng = Random(0)
+    for rows, columns in ((3, 3), (5, 5), (5, 9)):
+        for _ in range(300):
+            board = random_board(rng, rows, columns)
+            for stone in (1, 2):
+                expected = board.capturing_moves(stone, 3 - stone)
+                moves = capturing_moves(board.matrix, stone, 3 - stone)
+                assert moves == expected
+                assert all(move is shared for move, shared in zip(moves, expected))
+
+
+def test_move_masks():
+    rng = Random(1)
+    board = random_board(rng, 5, 9)
+    masks = move_masks(board.matrix, 1)
+    assert masks.shape == (5, 9, 8)
+    assert int(masks.sum()) == len(board.possible_moves(1))
+
+
+def test_capture_masks_batch():
+    rng = Random(2)
+    boards = [random_board(rng, 5, 5) for _ in range(10)]
+    approach, withdrawal = capture_masks(np.stack([board.matrix for board in boards]), 2, 1)
+    assert approach.shape == (10, 5, 5, 8)
+    for index, board in enumerate(boards):
+        assert int((approach[index] | withdrawal[index]).sum()) == len(board.capturing_moves(2, 1))
+
+
+def test_vectorized_board(monkeypatch):
+    monkeypatch.setattr(Board, 'vectorized', True)
+    board = Board(5, 5).copy()
+    assert [perft(board, depth) for depth in range(1, 4)] == [5, 12, 69]
+
+
+def test_features():
+    rng = Random(3)
+    boards = [random_board(rng, 5, 9) for _ in range(50)]
+    matrix = np.asarray(boards[0].matrix)
+    boards[0].matrix = np.where(matrix == 2, 0, matrix).astype(np.int8)
+    counted = features(np.stack([board.matrix for board in boards]))
+    for index, board in enumerate(boards):
+        assert counted['material'][index].tolist() == [count_stones(board, 1), count_stones(board, 2)]
+        assert counted['mobility'][index].tolist() == [len(board.possible_moves(1)), len(board.possible_moves(2))]
+        assert counted['threats'][index].tolist() == [len(board.capturing_moves(1, 2)),
+                                                      len(board.capturing_moves(2, 1))]
+        assert counted['winner'][index] == (board.is_winner() or 0)
+    assert counted['winner'][0] == 1
+
+
+def test_evaluation_batch():
+    rng = Random(4)
+    boards = [random_board(rng, 5, 5) for _ in range(50)]
+    evaluation = Evaluation()
+    values = evaluation.batch(np.stack([board.matrix for board in boards]), 2)
+    assert values.tolist() == [evaluation(board, 2) for board in boards]
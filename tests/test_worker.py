@@ -0,0 +1,45 @@
+import time
+from src.engine import GameState, RandomAgent
+from src.players import Computer
+from src.worker import AIWorker
+
+
+def wait(worker):
+    while worker.is_running():
+        time.sleep(0.01)
+    return worker.poll()
+
+
+def test_worker_result():
+    state = GameState.new(5, 9)
+    worker = AIWorker(RandomAgent(1))
+    worker.start(state)
+    move, capture = wait(worker)
+    assert move in state.legal_moves()
+    assert worker.progress()[0] == 0
+
+
+def test_worker_time_limit():
+    state = GameState.new(5, 9)
+    player = Computer(1, 'Expert', depth=20, max_nodes=None, max_time=None)
+    worker = AIWorker(player, max_time=0.2)
+    worker.start(state)
+    start = time.perf_counter()
+    decision = None
+    while decision is None:
+        decision = worker.poll()
+        time.sleep(0.01)
+    assert time.perf_counter() - start < 5
+    assert decision[0] in state.legal_moves()
+    assert worker.progress()[0] > 0
+
+
+def test_worker_cancel():
+    state = GameState.new(5, 9)
+    player = Computer(1, 'Expert', depth=20, max_nodes=None, max_time=None)
+    worker = AIWorker(player)
+    worker.start(state)
+    time.sleep(0.05)
+    worker.cancel(wait=True)
+    assert not worker.is_running()
+    assert worker.poll() is None
@@ -0,0 +1,57 @@
+from random import Random
+from src.board import Board
+from src.bitboard import BitBoard
+from src.players import HumanPlayer
+
+
+def fresh_hash(board):
+    copy = Board(board.rows, board.columns)
+    copy.stone_turn = board.stone_turn
+    copy.last_position = board.last_position
+    copy.forbidden_moves = board.forbidden_moves
+    copy.matrix = [list(verse) for verse in board.places()]
+    return copy.hash
+
+
+def test_hash_is_incremental():
+    rng = Random(3)
+    for board in [Board(5, 9), BitBoard(5, 9)]:
+        for _ in range(40):
+            stone = board.stone_turn
+            opponent_stone = 1 if stone == 2 else 2
+            moves = board.capturing_moves(stone, opponent_stone) or board.possible_moves(stone)
+            if not moves or board.is_winner():
+                break
+            move = rng.choice(moves)
+            approach, withdrawal = board.captured_stones(opponent_stone, move)
+            board.move_stone(move)
+            board.remove_stones(approach or withdrawal)
+            board.set_chain((move[2], move[3]), [(move[0], move[1])])
+            assert board.hash == fresh_hash(board)
+            board.end_turn()
+            assert board.hash == fresh_hash(board)
+
+
+def test_hash_depends_on_turn_and_chain():
+    board = Board(5, 5)
+    start = board.hash
+    board.end_turn()
+    assert board.hash != start
+    board.set_chain((2, 2), [(2, 1), (2, 3)])
+    chain = board.hash
+    board.set_chain((2, 2), [(2, 1)])
+    assert board.hash != chain
+    board.end_turn()
+    assert board.hash == start
+
+
+def test_hash_after_player_move():
+    board = Board(5, 5)
+    board.matrix = [
+        [0, 2, 0, 0, 0],
+        [0, 0, 0, 2, 0],
+        [0, 1, 2, 0, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0]]
+    HumanPlayer(2).capturing_move(board, (1, 3, 2, 3))
+    assert board.hash == fresh_hash(board)